@@ -0,0 +1,275 @@
+"""
+Offline benchmark suite against the in-process fake API.
+
+Measures CLI startup, end-to-end time of common commands, rows/s of paged
+search results, YAML/JSON render throughput and export MB/s, without network
+access or an API key, and writes the numbers as JSON so that runs on
+different commits can be compared:
+
+    python benchmarks/offline.py --output before.json
+    git checkout other-branch
+    python benchmarks/offline.py --output after.json --compare before.json
+
+Command timings run the real CLI in-process (typer's CliRunner) with the
+SDK's HTTP transports replaced by services.fake_api; --latency adds a fixed
+server delay to every response.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any, Optional
+
+import typer
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from dateno_cmd import sdk_factory  # noqa: E402
+from dateno_cmd.services.fake_api import FakeAPI, FakeAPIConfig  # noqa: E402
+from dateno_cmd.utils.serialization import render_output  # noqa: E402
+
+
+app = typer.Typer(add_completion=False)
+
+# (name, argv) of the commands timed end to end.
+COMMANDS: list[tuple[str, list[str]]] = [
+    ("service_health", ["service", "health", "--format", "json"]),
+    ("search_query_results", ["search", "query", "bench", "--limit", "50"]),
+    (
+        "search_query_raw_json",
+        ["search", "query", "bench", "--limit", "50", "--mode", "raw", "--format", "json"],
+    ),
+    ("search_get", ["search", "get", "ds-0000042", "--format", "json"]),
+    ("catalogs_list", ["catalogs", "list", "--limit", "50", "--format", "json"]),
+    ("stats_ts", ["stats", "ts", "ns0", "--format", "json"]),
+]
+
+
+def _summary(samples: list[float]) -> dict[str, Any]:
+    ordered = sorted(samples)
+    return {
+        "runs": len(ordered),
+        "median_s": round(statistics.median(ordered), 6),
+        "min_s": round(ordered[0], 6),
+        "max_s": round(ordered[-1], 6),
+    }
+
+
+def _time(fn: Callable[[], Any], repeat: int) -> list[float]:
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    return samples
+
+
+def bench_startup(repeat: int) -> dict[str, Any]:
+    """Wall time of fresh interpreter runs of the CLI."""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(p for p in (str(ROOT), env.get("PYTHONPATH")) if p)
+    env.setdefault("DATENO_APIKEY", "bench")
+    results = {}
+    for name, args in (("version", ["--version"]), ("config_show", ["config", "show"])):
+        cmd = [sys.executable, "-m", "dateno_cmd.cli", *args]
+
+        def _run() -> None:
+            subprocess.run(cmd, env=env, cwd=str(ROOT), capture_output=True, check=True)
+
+        results[name] = _summary(_time(_run, repeat))
+    return results
+
+
+class _CLI:
+    """Runs CLI commands in-process against a fake API."""
+
+    def __init__(self, fake: FakeAPI, workdir: Path) -> None:
+        from typer.testing import CliRunner
+
+        from dateno_cmd.cli import app as cli_app
+
+        self.fake = fake
+        self.app = cli_app
+        self.runner = CliRunner()
+        self.env = {
+            "DATENO_APIKEY": "bench",
+            "DATENO_SERVER_URL": "https://fake.dateno.invalid",
+            "DATENO_CACHE": "false",
+            "DATENO_RETRIES": "0",
+            "XDG_CACHE_HOME": str(workdir / "cache"),
+        }
+
+    def __call__(self, argv: list[str]) -> None:
+        with sdk_factory.use_transports(self.fake.transport(), self.fake.async_transport()):
+            result = self.runner.invoke(self.app, argv, env=self.env)
+        if result.exit_code != 0:
+            detail = result.output.strip().splitlines()[-1:] or [repr(result.exception)]
+            raise RuntimeError(f"exit code {result.exit_code}: {detail[0]}")
+
+
+def _guarded(fn: Callable[[], dict[str, Any]]) -> dict[str, Any]:
+    try:
+        return fn()
+    except Exception as e:
+        return {"error": f"{type(e).__name__}: {e}"}
+
+
+def bench_commands(cli: _CLI, repeat: int) -> dict[str, Any]:
+    results = {}
+    for name, argv in COMMANDS:
+        results[name] = _guarded(lambda: _summary(_time(lambda: cli(argv), repeat)))
+    return results
+
+
+def bench_results_rows(cli: _CLI, workdir: Path, rows: int) -> dict[str, Any]:
+    """Rows/s of `search query --all` in results mode, written as CSV."""
+    target = workdir / "rows.csv"
+
+    def _run() -> dict[str, Any]:
+        argv = ["search", "query", "bench", "--all", "--limit", "100", "--max-results", str(rows)]
+        seconds = _time(lambda: cli([*argv, "--output", str(target)]), 1)[0]
+        return {"rows": rows, "seconds": round(seconds, 6), "rows_per_s": round(rows / seconds, 1)}
+
+    return _guarded(_run)
+
+
+def bench_render(fake: FakeAPI, docs: int, repeat: int) -> dict[str, Any]:
+    """Throughput of rendering `docs` documents as YAML and JSON."""
+    hits = [{"_id": str(n), "_source": fake.document(n)} for n in range(docs)]
+    payload = {"hits": {"hits": hits}}
+    results = {}
+    for fmt in ("yaml", "json"):
+        size = len(render_output(payload, fmt).encode("utf-8"))
+        samples = _time(lambda: render_output(payload, fmt), repeat)
+        median = statistics.median(samples)
+        results[fmt] = {
+            "docs": docs,
+            "bytes": size,
+            "median_s": round(median, 6),
+            "mb_per_s": round(size / median / 1e6, 2),
+        }
+    return results
+
+
+def bench_export(cli: _CLI, workdir: Path, repeat: int) -> dict[str, Any]:
+    """MB/s of `stats export` for one series of the configured export size."""
+    target = workdir / "export.csv"
+    argv = ["stats", "export", "ns0", "TS_00000", "--format", "csv", "-o", str(target)]
+    argv.append("--no-progress")
+
+    def _once() -> None:
+        target.unlink(missing_ok=True)
+        cli(argv)
+
+    def _run() -> dict[str, Any]:
+        median = statistics.median(_time(_once, repeat))
+        size = target.stat().st_size
+        return {
+            "bytes": size,
+            "median_s": round(median, 6),
+            "mb_per_s": round(size / median / 1e6, 2),
+        }
+
+    return _guarded(_run)
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=str(ROOT), capture_output=True, text=True
+        )
+    except OSError:
+        return None
+    return out.stdout.strip() or None
+
+
+def _flatten(data: Any, prefix: str = "") -> dict[str, float]:
+    flat: dict[str, float] = {}
+    if isinstance(data, dict):
+        for key, value in data.items():
+            flat.update(_flatten(value, f"{prefix}.{key}" if prefix else key))
+    elif isinstance(data, (int, float)) and not isinstance(data, bool):
+        flat[prefix] = float(data)
+    return flat
+
+
+def compare(current: dict[str, Any], baseline: dict[str, Any]) -> list[str]:
+    """Lines with the relative change of every timing/throughput metric."""
+    now = _flatten(current["benchmarks"])
+    before = _flatten(baseline["benchmarks"])
+    lines = []
+    for key in sorted(now.keys() & before.keys()):
+        if not key.endswith(("median_s", "per_s")) or not before[key]:
+            continue
+        change = (now[key] - before[key]) / before[key] * 100
+        # Lower is better for times, higher for throughput.
+        worse = change > 0 if key.endswith("_s") and not key.endswith("per_s") else change < 0
+        flag = "  <-- regression" if worse and abs(change) >= 10 else ""
+        lines.append(f"{key:<48} {before[key]:>12.4f} -> {now[key]:>12.4f}  {change:+6.1f}%{flag}")
+    return lines
+
+
+@app.command()
+def main(
+    output: Optional[str] = None,
+    compare_with: Optional[str] = typer.Option(None, "--compare", help="Baseline results JSON."),
+    repeat: int = 5,
+    rows: int = 5_000,
+    render_docs: int = 2_000,
+    export_mb: float = 16.0,
+    latency: float = 0.0,
+    skip_startup: bool = False,
+):
+    """Run the offline benchmarks and print (or write) the results as JSON."""
+    config = FakeAPIConfig(
+        latency=latency,
+        total_hits=max(rows, 1_000),
+        export_bytes=int(export_mb * 1e6),
+    )
+    fake = FakeAPI(config)
+    with tempfile.TemporaryDirectory(prefix="dateno-bench-") as tmp:
+        workdir = Path(tmp)
+        cli = _CLI(fake, workdir)
+        benchmarks: dict[str, Any] = {}
+        if not skip_startup:
+            benchmarks["startup"] = bench_startup(repeat)
+        benchmarks["commands"] = bench_commands(cli, repeat)
+        benchmarks["results_rows"] = bench_results_rows(cli, workdir, rows)
+        benchmarks["render"] = bench_render(fake, render_docs, repeat)
+        benchmarks["export"] = bench_export(cli, workdir, repeat)
+
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "fake_api": vars(config),
+            "repeat": repeat,
+        },
+        "benchmarks": benchmarks,
+    }
+    text = json.dumps(report, indent=2)
+    if output:
+        Path(output).write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+    if compare_with:
+        baseline = json.loads(Path(compare_with).read_text(encoding="utf-8"))
+        typer.echo(f"Compared with {baseline['meta'].get('commit') or compare_with}:", err=True)
+        for line in compare(report, baseline):
+            typer.echo(line, err=True)
+
+
+if __name__ == "__main__":
+    app()
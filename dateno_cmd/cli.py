@@ -2,24 +2,82 @@
 Dateno CLI application.
 
 Commands:
-- dateno search ...   (get, query, dsl, similar, facets, facet)
+- dateno search ...   (get, query, harvest, dsl, similar, facets, facet)
 - dateno raw ...     (get)
 - dateno catalogs ... (get, list)
 - dateno service ... (health)
-- dateno stats ...   (ns, ns-get, tables, table, indicators, indicator, ts, ts-get, export-formats, export)
+- dateno stats ...   (ns, ns-get, tables, table, indicators, indicator, ts, ts-get, export-formats, export, export-all, sync)
 - dateno config ...  (init, show)
+- dateno cache ...   (stats, prune, clear)
+- dateno mirror ...  (build, info)
+- dateno queue ...   (status, results, retry)
+- dateno perf ...    (report, prune)
+- dateno serve       (local daemon; use `dateno --via-daemon ...` to forward)
+- dateno worker      (run units enqueued with --enqueue)
+- dateno bench       (replay a workload, report throughput and latency)
 """
 
 from __future__ import annotations
 
+import importlib
+import sys
+import time
+
+import click
 import typer
+from typer.core import TyperGroup
 
 from dateno_cmd import __version__
 
-from dateno_cmd.commands import catalogs, config, raw, search, service, stats
 
+_STARTED = time.monotonic()
+
+# Command groups are imported only when invoked, so that e.g. `--version`
+# or `config show` do not pay for httpx, the SDK, tabulate, etc.
+LAZY_COMMAND_GROUPS: dict[str, str] = {
+    "search": "dateno_cmd.commands.search",
+    "raw": "dateno_cmd.commands.raw",
+    "catalogs": "dateno_cmd.commands.catalogs",
+    "service": "dateno_cmd.commands.service",
+    "stats": "dateno_cmd.commands.stats",
+    "config": "dateno_cmd.commands.config",
+    "cache": "dateno_cmd.commands.cache",
+    "mirror": "dateno_cmd.commands.mirror",
+    "queue": "dateno_cmd.commands.queue",
+    "perf": "dateno_cmd.commands.perf",
+}
+
+# Single top-level commands, loaded the same way.
+LAZY_COMMANDS: dict[str, str] = {
+    "serve": "dateno_cmd.commands.serve",
+    "worker": "dateno_cmd.commands.worker",
+    "bench": "dateno_cmd.commands.bench",
+}
+
+
+class LazyTyperGroup(TyperGroup):
+    """Root group resolving LAZY_COMMAND_GROUPS on first use."""
+
+    def list_commands(self, ctx: click.Context) -> list[str]:
+        names = list(super().list_commands(ctx))
+        lazy = list(LAZY_COMMAND_GROUPS) + list(LAZY_COMMANDS)
+        return names + [n for n in lazy if n not in names]
 
-app = typer.Typer(no_args_is_help=True)
+    def get_command(self, ctx: click.Context, cmd_name: str) -> click.Command | None:
+        if cmd_name not in self.commands and cmd_name in LAZY_COMMAND_GROUPS:
+            module = importlib.import_module(LAZY_COMMAND_GROUPS[cmd_name])
+            group = typer.main.get_group(module.app)
+            group.name = cmd_name
+            self.commands[cmd_name] = group
+        elif cmd_name not in self.commands and cmd_name in LAZY_COMMANDS:
+            module = importlib.import_module(LAZY_COMMANDS[cmd_name])
+            command = typer.main.get_command(module.app)
+            command.name = cmd_name
+            self.commands[cmd_name] = command
+        return super().get_command(ctx, cmd_name)
+
+
+app = typer.Typer(no_args_is_help=True, cls=LazyTyperGroup)
 
 
 def _version_callback(value: bool) -> None:
@@ -57,6 +115,57 @@ def _main(
         "--retries",
         help="Override retry count for this command only.",
     ),
+    rps: float | None = typer.Option(
+        None,
+        "--rps",
+        help="Limit API requests per second (adapts down on 429/Retry-After).",
+    ),
+    max_concurrency: int | None = typer.Option(
+        None,
+        "--max-concurrency",
+        help="Limit API requests in flight at once.",
+    ),
+    no_cache: bool = typer.Option(
+        False,
+        "--no-cache",
+        help="Bypass the local response cache for this command.",
+    ),
+    refresh: bool = typer.Option(
+        False,
+        "--refresh",
+        help="Ignore cached responses and store fresh ones.",
+    ),
+    profile: bool = typer.Option(
+        False,
+        "--profile",
+        help="Print per-phase timings (settings, SDK, HTTP, validation, rendering, writing) to stderr.",
+    ),
+    profile_output: str | None = typer.Option(
+        None,
+        "--profile-output",
+        help="Write the timing profile as JSON to this file (implies --profile, without the stderr report).",
+    ),
+    record: str | None = typer.Option(
+        None,
+        "--record",
+        help="Record API responses with their timings into this cassette directory.",
+    ),
+    replay: str | None = typer.Option(
+        None,
+        "--replay",
+        help="Answer API requests from this cassette directory instead of the network.",
+    ),
+    replay_latency: bool = typer.Option(
+        False,
+        "--replay-latency",
+        help="With --replay, delay each response by its recorded time.",
+    ),
+    via_daemon: bool = typer.Option(
+        False,
+        "--via-daemon",
+        envvar="DATENO_VIA_DAEMON",
+        help="Forward this command to a running `dateno serve` daemon (falls back to local execution).",
+    ),
     version: bool = typer.Option(
         False,
         "--version",
@@ -65,18 +174,71 @@ def _main(
         is_eager=True,
     ),
 ) -> None:
+    if via_daemon and ctx.invoked_subcommand not in (None, "serve"):
+        _forward_to_daemon()
+
+    if record and replay:
+        raise typer.BadParameter("Use either --record or --replay, not both")
+    if replay_latency and not replay:
+        raise typer.BadParameter("--replay-latency requires --replay")
+
+    if profile or profile_output:
+        _start_profile(ctx, profile_output)
+
     ctx.ensure_object(dict)
     ctx.obj["debug"] = debug
     ctx.obj["apikey"] = apikey
     ctx.obj["server_url"] = server_url
     ctx.obj["timeout_ms"] = timeout_ms
     ctx.obj["retries"] = retries
-app.add_typer(search.app, name="search")
-app.add_typer(raw.app, name="raw")
-app.add_typer(catalogs.app, name="catalogs")
-app.add_typer(service.app, name="service")
-app.add_typer(stats.app, name="stats")
-app.add_typer(config.app, name="config")
+    ctx.obj["rps"] = rps
+    ctx.obj["max_concurrency"] = max_concurrency
+    ctx.obj["no_cache"] = no_cache
+    ctx.obj["refresh"] = refresh
+    ctx.obj["record_dir"] = record
+    ctx.obj["replay_dir"] = replay
+    ctx.obj["replay_latency"] = replay_latency
+
+
+def _start_profile(ctx: typer.Context, output: str | None) -> None:
+    from dateno_cmd.services.http_events import add_listener, remove_listener
+    from dateno_cmd.utils import profiling
+
+    prof = profiling.start(started=_STARTED)
+    prof.add_time("startup", time.monotonic() - _STARTED)
+
+    # The http phase itself is timed by the clients' hooks (body included).
+    def _on_response(event) -> None:
+        prof.count("http_requests")
+        if event.status_code >= 400:
+            prof.count("http_errors")
+        if event.bytes is not None:
+            prof.count("http_bytes", event.bytes)
+
+    add_listener(_on_response)
+
+    def _report() -> None:
+        remove_listener(_on_response)
+        if profiling.stop() is None:
+            return
+        report = prof.report(command=sys.argv[1:])
+        if output:
+            profiling.write_report(report, output)
+        else:
+            typer.echo(profiling.format_report(report), err=True)
+
+    ctx.call_on_close(_report)
+
+
+def _forward_to_daemon() -> None:
+    from dateno_cmd.services import daemon
+
+    if daemon.in_daemon():
+        return
+    argv = [a for a in sys.argv[1:] if a != "--via-daemon"]
+    code = daemon.forward(argv)
+    if code is not None:
+        raise typer.Exit(code)
 
 
 def main() -> None:
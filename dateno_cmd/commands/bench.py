@@ -0,0 +1,105 @@
+"""API load generator command."""
+
+from __future__ import annotations
+
+from contextlib import ExitStack
+
+import typer
+
+from dateno_cmd.services.context import build_context
+from dateno_cmd.utils.bench import (
+    format_histogram,
+    parse_workload,
+    run_workload,
+    sdk_caller,
+    summarize,
+)
+from dateno_cmd.utils.command import run_event_loop
+from dateno_cmd.utils.errors import UserInputError, classify_error
+from dateno_cmd.utils.io import read_ids, write_or_print
+from dateno_cmd.utils.serialization import render_output
+
+
+app = typer.Typer(no_args_is_help=True)
+
+
+@app.command("bench")
+def bench(
+    ctx: typer.Context,
+    workload: str,
+    concurrency: int = 8,
+    rps: float | None = None,
+    requests: int | None = None,
+    duration: float | None = None,
+    warmup: int = 0,
+    fake: bool = False,
+    fake_latency: float = 0.0,
+    format: str | None = None,
+    output: str | None = None,
+    debug: bool = False,
+):
+    """
+    Replay a workload against the API and report throughput and latency.
+
+    WORKLOAD is a JSON Lines file ('-' for stdin) of operations such as
+    {"op": "search", "q": "climate"}, {"op": "get", "id": ...} or
+    {"op": "ts", "ns": ..., "ts": ...}; plain lines are search queries. It is
+    replayed once, or repeated for --requests N requests or --duration
+    seconds, keeping --concurrency requests in flight or starting them at
+    --rps per second (open loop, at most --concurrency in flight).
+    --warmup N requests run first and are not counted.
+
+    Requests go through the same client stack as every command (global
+    --rps/--max-concurrency limits apply) with the response cache off.
+    --fake replays against the built-in stand-in API, with --fake-latency
+    seconds added to each response.
+    """
+    if concurrency <= 0:
+        raise typer.BadParameter("--concurrency must be positive")
+    if rps is not None and rps <= 0:
+        raise typer.BadParameter("--rps must be positive")
+    if requests is not None and requests <= 0:
+        raise typer.BadParameter("--requests must be positive")
+    if duration is not None and duration <= 0:
+        raise typer.BadParameter("--duration must be positive")
+    if warmup < 0:
+        raise typer.BadParameter("--warmup must not be negative")
+    try:
+        items = parse_workload(read_ids(workload))
+    except UserInputError as e:
+        raise typer.BadParameter(str(e), param_hint="WORKLOAD") from e
+
+    with ExitStack() as stack:
+        if fake:
+            from dateno_cmd import sdk_factory
+            from dateno_cmd.services.fake_api import FakeAPI, FakeAPIConfig
+
+            api = FakeAPI(FakeAPIConfig(latency=fake_latency))
+            stack.enter_context(sdk_factory.use_transports(api.transport(), api.async_transport()))
+            ctx.ensure_object(dict)
+            ctx.obj["apikey"] = "fake"
+        command_ctx = build_context(format, debug, cache=False)
+        call = sdk_caller(command_ctx.sdk)
+
+        async def _run():
+            # One event loop, so warm connections carry over.
+            if warmup:
+                await run_workload(items, call, concurrency, requests=warmup)
+            return await run_workload(
+                items, call, concurrency, rps=rps, requests=requests, duration=duration
+            )
+
+        typer.echo(f"Running {len(items)} operations from {workload}", err=True)
+        result = run_event_loop(_run())
+
+    summary = summarize(result)
+    typer.echo(format_histogram(summary["histogram"]), err=True)
+    typer.echo(
+        f"{summary['requests']} requests in {summary['seconds']}s "
+        f"({summary['throughput_rps']}/s), {summary['errors']} errors",
+        err=True,
+    )
+    write_or_print(render_output(summary, command_ctx.out_format), output)
+    if summary["ok"] == 0:
+        failed = next(s.error for s in result.samples if s.error is not None)
+        raise typer.Exit(code=classify_error(failed).code)
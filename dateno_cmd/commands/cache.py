@@ -0,0 +1,42 @@
+"""Local response cache commands."""
+
+from __future__ import annotations
+
+import typer
+
+from dateno_cmd.services.context import load_settings_with_overrides
+from dateno_cmd.services.http_cache import ResponseCache
+from dateno_cmd.utils.io import write_or_print
+from dateno_cmd.utils.serialization import render_output
+
+
+app = typer.Typer(no_args_is_help=True)
+
+
+def _open_cache() -> ResponseCache:
+    settings = load_settings_with_overrides()
+    return ResponseCache(settings.cache_path, max_bytes=settings.cache_max_bytes)
+
+
+@app.command("stats")
+def cache_stats(
+    format: str = typer.Option("yaml", "--format", help="yaml|json"),
+    output: str | None = None,
+):
+    """Show cache location, entry count and size."""
+    cache = _open_cache()
+    write_or_print(render_output(cache.stats(), format), output)
+
+
+@app.command("prune")
+def cache_prune():
+    """Remove expired entries and enforce the size budget."""
+    removed = _open_cache().prune()
+    typer.echo(f"Removed {removed} entries")
+
+
+@app.command("clear")
+def cache_clear():
+    """Remove all cached responses."""
+    removed = _open_cache().clear()
+    typer.echo(f"Removed {removed} entries")
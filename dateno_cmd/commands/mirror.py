@@ -0,0 +1,123 @@
+"""Offline search index commands."""
+
+from __future__ import annotations
+
+import json
+import sys
+from collections.abc import Iterator
+from itertools import islice
+from pathlib import Path
+from typing import Any
+
+import typer
+
+from dateno_cmd.services.context import build_context, load_settings_with_overrides
+from dateno_cmd.services.search_mirror import SearchMirror
+from dateno_cmd.utils.command import call_sdk
+from dateno_cmd.utils.errors import UserInputError
+from dateno_cmd.utils.io import write_or_print
+from dateno_cmd.utils.paging import iter_offset_pages
+from dateno_cmd.utils.serialization import render_output, to_plain
+
+
+app = typer.Typer(no_args_is_help=True)
+
+BUILD_BATCH_SIZE = 500
+
+
+def _iter_jsonl(source: str) -> Iterator[Any]:
+    """Stream JSON values from a JSON Lines file, or stdin when source is '-'."""
+    if source != "-" and not Path(source).expanduser().exists():
+        raise UserInputError(f"Input file not found: {source}")
+    f = sys.stdin if source == "-" else open(Path(source).expanduser(), encoding="utf-8")
+    try:
+        for n, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as e:
+                raise UserInputError(f"{source}:{n}: invalid JSON ({e.msg})") from e
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+
+def _store(mirror: SearchMirror, items: Iterator[Any]) -> int:
+    stored = 0
+    while True:
+        batch = list(islice(items, BUILD_BATCH_SIZE))
+        if not batch:
+            return stored
+        stored += mirror.add(batch)
+
+
+@app.command("build")
+def mirror_build(
+    query: str | None = typer.Argument(None, help="Harvest hits of this query from the API"),
+    filters: str = "",
+    input: str | None = None,
+    limit: int = 100,
+    max_results: int | None = None,
+    debug: bool = False,
+):
+    """
+    Add search hits to the offline index used by `search query --local`.
+
+    Hits come from the API (QUERY, paged by --limit up to --max-results) or
+    from --input, a JSON Lines file of hits or documents ('-' for stdin) such
+    as the output of `search query --mode raw --all`.
+    Existing documents with the same id are replaced.
+    """
+    if (query is None) == (input is None):
+        raise typer.BadParameter("Provide either QUERY or --input")
+    if limit <= 0:
+        raise typer.BadParameter("--limit must be positive")
+
+    if input is not None:
+        settings = load_settings_with_overrides()
+        mirror = SearchMirror(settings.search_mirror_path)
+        try:
+            stored = _store(mirror, _iter_jsonl(input))
+        except UserInputError as e:
+            raise typer.BadParameter(str(e), param_hint="--input") from e
+    else:
+        ctx = build_context(None, debug)
+        mirror = SearchMirror(ctx.settings.search_mirror_path)
+        sdk_filters = [f.strip() for f in filters.split(";") if f.strip()]
+        pages = iter_offset_pages(
+            lambda off, lim: to_plain(
+                call_sdk(
+                    ctx,
+                    lambda: ctx.sdk.search_api.search_datasets(
+                        q=query,
+                        filters=sdk_filters or None,
+                        limit=lim,
+                        offset=off,
+                        facets=False,
+                    ),
+                )
+            ),
+            page_size=limit,
+            max_results=max_results,
+        )
+        stored = call_sdk(ctx, lambda: _store(mirror, (hit for page in pages for hit in page)))
+
+    total = mirror.count()
+    mirror.close()
+    typer.echo(f"Indexed {stored} documents ({total} total)", err=True)
+    print(f"Mirror: {mirror.path}")
+
+
+@app.command("info")
+def mirror_info(
+    format: str | None = None,
+    output: str | None = None,
+):
+    """Show the offline index location and size."""
+    settings = load_settings_with_overrides()
+    mirror = SearchMirror(settings.search_mirror_path)
+    info = {"path": str(mirror.path), "documents": mirror.count()}
+    mirror.close()
+    out_format = (format or settings.output_format or "yaml").strip().lower()
+    write_or_print(render_output(info, out_format), output)
@@ -0,0 +1,77 @@
+"""Request latency history commands."""
+
+from __future__ import annotations
+
+import time
+
+import typer
+
+from dateno_cmd.services.context import load_settings_with_overrides
+from dateno_cmd.services.latency_history import LatencyHistory, parse_duration, summarize
+from dateno_cmd.utils.io import write_or_print
+from dateno_cmd.utils.serialization import render_output
+
+
+app = typer.Typer(no_args_is_help=True)
+
+
+def _duration(value: str, option: str) -> float:
+    try:
+        seconds = parse_duration(value)
+    except ValueError as e:
+        raise typer.BadParameter(str(e), param_hint=option) from e
+    if seconds <= 0:
+        raise typer.BadParameter("must be positive", param_hint=option)
+    return seconds
+
+
+@app.command("report")
+def perf_report(
+    since: str = "7d",
+    window: str | None = None,
+    endpoint: str | None = None,
+    format: str | None = None,
+    output: str | None = None,
+):
+    """
+    Latency percentiles and error rates per endpoint from the recorded history.
+
+    Covers the last --since (e.g. 6h, 7d); --window (e.g. 1h, 1d) adds a row
+    per endpoint and time window (UTC), and --endpoint keeps endpoints
+    containing the given text. Prints a table unless --format yaml|json is
+    given. Recording is enabled with DATENO_LATENCY_HISTORY=true.
+    """
+    since_seconds = _duration(since, "--since")
+    window_seconds = _duration(window, "--window") if window else None
+    settings = load_settings_with_overrides()
+    history = LatencyHistory(settings.latency_history_path)
+    try:
+        records = history.records(since=time.time() - since_seconds, endpoint=endpoint)
+    finally:
+        history.close()
+    rows = summarize(records, window=window_seconds)
+
+    out_format = (format or "table").strip().lower()
+    if out_format != "table":
+        write_or_print(render_output(rows, out_format), output)
+        return
+    if not rows:
+        hint = "" if settings.latency_history else " (enable with DATENO_LATENCY_HISTORY=true)"
+        typer.echo(f"No requests recorded in the last {since}{hint}", err=True)
+        return
+    from tabulate import tabulate
+
+    write_or_print(tabulate(rows, headers="keys") + "\n", output)
+
+
+@app.command("prune")
+def perf_prune(older_than: str = "30d"):
+    """Remove records older than --older-than (e.g. 30d)."""
+    seconds = _duration(older_than, "--older-than")
+    settings = load_settings_with_overrides()
+    history = LatencyHistory(settings.latency_history_path)
+    try:
+        removed = history.prune(seconds)
+    finally:
+        history.close()
+    typer.echo(f"Removed {removed} records")
@@ -0,0 +1,93 @@
+"""Work queue inspection commands."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+import typer
+
+from dateno_cmd.services.context import load_settings_with_overrides
+from dateno_cmd.services.work_queue import WorkQueue
+from dateno_cmd.services.worker import KIND_SEARCH_PAGE
+from dateno_cmd.utils.io import stream_jsonl, write_or_print
+from dateno_cmd.utils.search import hit_id
+from dateno_cmd.utils.serialization import render_output
+
+
+app = typer.Typer(no_args_is_help=True)
+
+
+def _open(queue: str) -> WorkQueue:
+    if not Path(queue).expanduser().exists():
+        raise typer.BadParameter(f"Queue not found: {queue}", param_hint="QUEUE")
+    return WorkQueue(queue)
+
+
+@app.command("status")
+def queue_status(
+    queue: str,
+    format: str | None = None,
+    output: str | None = None,
+):
+    """Show units per status and the errors of failed units."""
+    work_queue = _open(queue)
+    try:
+        info: dict[str, Any] = {"path": str(work_queue.path), "units": work_queue.counts()}
+        failures = work_queue.failures()
+    finally:
+        work_queue.close()
+    if failures:
+        info["failed"] = [
+            {"id": unit_id, "kind": kind, "payload": payload, "error": error}
+            for unit_id, kind, payload, error in failures
+        ]
+    settings = load_settings_with_overrides()
+    out_format = (format or settings.output_format or "yaml").strip().lower()
+    write_or_print(render_output(info, out_format), output)
+
+
+@app.command("results")
+def queue_results(
+    queue: str,
+    output: str | None = None,
+    kind: str | None = None,
+):
+    """
+    Write the results of finished units as JSON Lines.
+
+    Search pages are flattened into hits and de-duplicated by id.
+    """
+    work_queue = _open(queue)
+
+    def _records() -> Iterator[Any]:
+        seen: set[str] = set()
+        for unit_kind, result in work_queue.results(kind):
+            if unit_kind != KIND_SEARCH_PAGE:
+                yield result
+                continue
+            for hit in result:
+                entry_id = hit_id(hit)
+                if entry_id is not None:
+                    if entry_id in seen:
+                        continue
+                    seen.add(entry_id)
+                yield hit
+
+    try:
+        count = stream_jsonl(_records(), output)
+    finally:
+        work_queue.close()
+    typer.echo(f"Wrote {count} records", err=True)
+
+
+@app.command("retry")
+def queue_retry(queue: str):
+    """Requeue failed units with a fresh attempt budget."""
+    work_queue = _open(queue)
+    try:
+        count = work_queue.retry_failed()
+    finally:
+        work_queue.close()
+    typer.echo(f"Requeued {count} units", err=True)
@@ -2,10 +2,13 @@
 
 from __future__ import annotations
 
+from typing import Optional
+
 import typer
 
 from dateno_cmd.services.context import build_context
-from dateno_cmd.utils.command import run_and_render
+from dateno_cmd.utils.bulk import DEFAULT_CONCURRENCY
+from dateno_cmd.utils.command import run_and_render, run_bulk_get
 
 
 app = typer.Typer(no_args_is_help=True)
@@ -13,13 +16,38 @@ app = typer.Typer(no_args_is_help=True)
 
 @app.command("get")
 def raw_get(
-    entry_id: str,
+    entry_id: Optional[str] = typer.Argument(None),
     format: str | None = None,
     output: str | None = None,
+    ids_file: str | None = None,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    ordered: bool = False,
+    failed: str | None = None,
+    adaptive: bool = False,
     debug: bool = False,
 ):
-    """Get a single raw entry by id (SDK-backed)."""
+    """
+    Get a single raw entry by id (SDK-backed).
+
+    With --ids-file FILE (or '-' for stdin) fetches many entries concurrently
+    and writes JSON Lines; failed ids go to --failed FILE. --adaptive tunes
+    the number of requests in flight (up to --concurrency) to the server's
+    latency and errors.
+    """
     ctx = build_context(format, debug)
+    if ids_file or not entry_id:
+        run_bulk_get(
+            ctx,
+            ctx.sdk.raw_data_access.get_raw_entry_by_id,
+            entry_id,
+            ids_file,
+            output,
+            concurrency,
+            ordered,
+            failed,
+            adaptive=adaptive,
+        )
+        return
     run_and_render(
         ctx,
         lambda: ctx.sdk.raw_data_access.get_raw_entry_by_id(entry_id=entry_id),
@@ -2,32 +2,106 @@
 
 from __future__ import annotations
 
-from typing import Any
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from typing import Optional
 
 import typer
-from flatdict import FlatDict
 from tabulate import tabulate
 
-from dateno_cmd.services.context import build_context
-from dateno_cmd.utils.command import run_and_render, run_and_render_with_mode
-from dateno_cmd.utils.io import load_json_arg, write_csv, write_or_print
-from dateno_cmd.utils.search import extract_doc_from_item, extract_hits_list
+from dateno_cmd.services.context import CommandContext, build_context, build_local_context
+from dateno_cmd.services.http_events import listening
+from dateno_cmd.services.search_mirror import SearchMirror
+from dateno_cmd.services.work_queue import WorkQueue
+from dateno_cmd.services.worker import KIND_SEARCH_GET, KIND_SEARCH_PAGE, search_page_payloads
+from dateno_cmd.utils import profiling
+from dateno_cmd.utils.aimd import AIMDController
+from dateno_cmd.utils.aio import DEFAULT_CONCURRENCY, resolve_async
+from dateno_cmd.utils.command import (
+    call_sdk,
+    run_and_render,
+    run_and_render_with_mode,
+    run_bulk_get,
+    run_many_and_render,
+)
+from dateno_cmd.utils.harvest import (
+    DEFAULT_HARVEST_WORKERS,
+    DEFAULT_RESULT_WINDOW,
+    DEFAULT_SPLIT_KEYS,
+    Partition,
+    facet_values,
+    harvest_pages,
+    plan_partitions,
+)
+from dateno_cmd.utils.io import (
+    data_suffix,
+    load_json_arg,
+    read_ids,
+    stream_csv,
+    stream_jsonl,
+    write_csv,
+    write_or_print,
+)
+from dateno_cmd.utils.paging import iter_offset_pages, iter_search_after_pages
+from dateno_cmd.utils.projection import Projection, iter_hit_rows, parse_headers
+from dateno_cmd.utils.search import (
+    extract_hits_list,
+    extract_total,
+    source_include_kwargs,
+    source_includes,
+    with_source_includes,
+)
 from dateno_cmd.utils.sdk import call_sdk_flexible
-from dateno_cmd.utils.serialization import render_output
+from dateno_cmd.utils.serialization import render_output, to_plain
 
 
 app = typer.Typer(no_args_is_help=True)
 
+DEFAULT_DSL_PAGE_SIZE = 100
+
 
 @app.command("get")
 def search_get(
-    entry_id: str,
+    entry_id: Optional[str] = typer.Argument(None),
     format: str | None = None,
     output: str | None = None,
+    ids_file: str | None = None,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    ordered: bool = False,
+    failed: str | None = None,
+    adaptive: bool = False,
+    enqueue: str | None = None,
     debug: bool = False,
 ):
-    """Get a single search entry by id (SDK-backed)."""
+    """
+    Get a single search entry by id (SDK-backed).
+
+    With --ids-file FILE (or '-' for stdin) fetches many entries concurrently
+    and writes JSON Lines; failed ids go to --failed FILE. --adaptive tunes
+    the number of requests in flight (up to --concurrency) to the server's
+    latency and errors. With --enqueue QUEUE the ids are written to a work
+    queue for `dateno worker` instead.
+    """
+    if enqueue:
+        if not ids_file or entry_id:
+            raise typer.BadParameter("--enqueue requires --ids-file without ENTRY_ID")
+        _enqueue(enqueue, KIND_SEARCH_GET, ({"entry_id": eid} for eid in read_ids(ids_file)))
+        return
     ctx = build_context(format, debug)
+    if ids_file or not entry_id:
+        run_bulk_get(
+            ctx,
+            ctx.sdk.search_api.get_dataset_by_entry_id,
+            entry_id,
+            ids_file,
+            output,
+            concurrency,
+            ordered,
+            failed,
+            adaptive=adaptive,
+        )
+        return
     run_and_render(
         ctx,
         lambda: ctx.sdk.search_api.get_dataset_by_entry_id(entry_id=entry_id),
@@ -51,6 +125,11 @@ def search_query(
         help="Request facets/aggregations from API.",
     ),
     sort_by: str | None = None,
+    all: bool = False,
+    max_results: int | None = None,
+    passthrough: bool = False,
+    source_filter: bool = True,
+    local: bool = False,
     debug: bool = False,
 ):
     """
@@ -58,44 +137,88 @@ def search_query(
 
     Modes:
       - results: tabular output (default)
-      - raw: full response as yaml/json
+      - raw: full response as yaml/json (with --passthrough --format json
+        the HTTP body is written as received, without model parsing)
       - facets: only aggregations/facets part (yaml/json)
       - totals: only total hits number
+
+    Paging:
+      --all fetches every page (--limit is the page size), --max-results N
+      stops after N hits. The next page is fetched in the background while
+      the current one is written; results are streamed as CSV (JSONL if the
+      output ends with .jsonl or --format jsonl), raw mode streams hits as JSONL.
+
+    In results mode only the --headers fields are requested from the API
+    when the SDK supports source filtering (disable with --no-source-filter).
+
+    --local answers from the offline index built by `dateno mirror build`
+    (filters as field=value; results are ranked by text relevance).
     """
-    ctx = build_context(format, debug)
     sdk_filters = [f.strip() for f in (filters.split(";") if filters else []) if f.strip()]
+    if local:
+        if passthrough:
+            raise typer.BadParameter("--passthrough cannot be combined with --local")
+        if sort_by:
+            raise typer.BadParameter("--sort-by is not supported with --local")
+        ctx = build_local_context(format, debug)
+        mirror = SearchMirror(ctx.settings.search_mirror_path)
+
+        def _search(off: int, lim: int, with_facets: bool) -> object:
+            return mirror.search(
+                query, filters=sdk_filters, limit=lim, offset=off, facets=with_facets
+            )
+
+    else:
+        ctx = build_context(format, debug)
+        includes = _source_includes_for(mode, headers, source_filter)
+        projection_kwargs = (
+            source_include_kwargs(ctx.sdk.search_api.search_datasets, includes)
+            if includes
+            else {}
+        )
+
+        def _search(off: int, lim: int, with_facets: bool) -> object:
+            return ctx.sdk.search_api.search_datasets(
+                q=query,
+                filters=sdk_filters or None,
+                limit=lim,
+                offset=off,
+                facets=with_facets,
+                sort_by=sort_by,
+                **projection_kwargs,
+            )
+
+    if all or max_results is not None:
+        if mode not in ("results", "raw"):
+            raise typer.BadParameter("--all supports only --mode results|raw")
+        if passthrough:
+            raise typer.BadParameter("--passthrough cannot be combined with --all")
+        if limit <= 0:
+            raise typer.BadParameter("--limit must be a positive page size with --all")
+        if max_results is not None and max_results < 0:
+            raise typer.BadParameter("--max-results must not be negative")
+        pages = iter_offset_pages(
+            lambda off, lim: to_plain(call_sdk(ctx, lambda: _search(off, lim, False))),
+            offset=offset,
+            page_size=limit,
+            max_results=max_results,
+            prefetch=not local,
+        )
+        _stream_pages(ctx, pages, mode, headers, output)
+        return
 
     data_dict = run_and_render_with_mode(
         ctx,
-        lambda: ctx.sdk.search_api.search_datasets(
-            q=query,
-            filters=sdk_filters or None,
-            limit=limit,
-            offset=offset,
-            facets=facets,
-            sort_by=sort_by,
-        ),
+        lambda: _search(offset, limit, facets),
         mode,
         output,
+        passthrough=passthrough,
     )
     if data_dict is None:
         return
 
     if mode == "totals":
-        total = ""
-        hits = data_dict.get("hits")
-        if isinstance(hits, dict):
-            total_obj = hits.get("total")
-            if isinstance(total_obj, dict):
-                total = total_obj.get("value", "")
-            else:
-                total = hits.get("total", "") or data_dict.get("total", "") or data_dict.get(
-                    "estimated_total", ""
-                )
-        else:
-            total = data_dict.get("total", "") or data_dict.get("estimated_total", "") or data_dict.get(
-                "total_hits", ""
-            )
+        total = extract_total(data_dict)
         write_or_print(str(total if total is not None else ""), output)
         return
 
@@ -105,21 +228,211 @@ def search_query(
         write_or_print(rendered, output)
         return
 
-    header_list = [h.strip() for h in headers.split(",") if h.strip()]
-    items = extract_hits_list(data_dict)
+    _render_results(data_dict, headers, output)
+
+
+@app.command("harvest")
+def search_harvest(
+    query: str,
+    filters: str = "",
+    split_by: str = ",".join(DEFAULT_SPLIT_KEYS),
+    window: int = DEFAULT_RESULT_WINDOW,
+    limit: int = 100,
+    workers: int = DEFAULT_HARVEST_WORKERS,
+    adaptive: bool = False,
+    mode: str = "results",
+    headers: str = "id,dataset.title,source.name,source.uid",
+    format: str | None = None,
+    output: str | None = None,
+    plan: bool = False,
+    enqueue: str | None = None,
+    debug: bool = False,
+):
+    """
+    Extract every hit of a query, beyond the offset paging limit.
+
+    The query is split by the --split-by facets (in order) into filter
+    partitions of at most --window hits each; partitions are paged
+    concurrently (--workers, --limit hits per page) and hits are
+    de-duplicated by id; --adaptive tunes how many partitions are paged at
+    once (up to --workers). Output is streamed like `search query --all`.
+    With --plan only the partitions are printed; with --enqueue QUEUE their
+    pages are written to a work queue for `dateno worker` (collect the hits
+    with `dateno queue results QUEUE`).
+    """
+    keys = [k.strip() for k in split_by.split(",") if k.strip()]
+    if mode not in ("results", "raw"):
+        raise typer.BadParameter("--mode must be results or raw")
+    if window <= 0:
+        raise typer.BadParameter("--window must be positive")
+    if limit <= 0 or limit > window:
+        raise typer.BadParameter("--limit must be a positive page size no larger than --window")
+    if workers <= 0:
+        raise typer.BadParameter("--workers must be positive")
+    sdk_filters = [f.strip() for f in filters.split(";") if f.strip()]
+    ctx = build_context(format, debug)
+    api = ctx.sdk.search_api
 
-    rows: list[list[Any]] = []
-    for item in items:
-        if not isinstance(item, dict):
+    def _probe(part_filters: tuple[str, ...]) -> object:
+        return to_plain(
+            api.search_datasets(
+                q=query, filters=list(part_filters) or None, limit=1, offset=0, facets=True
+            )
+        )
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        harvest_plan = call_sdk(
+            ctx,
+            lambda: plan_partitions(
+                _probe,
+                lambda key: facet_values(to_plain(api.get_search_facet_values(key=key))),
+                base_filters=sdk_filters,
+                split_keys=keys,
+                window=window,
+                executor=executor,
+            ),
+        )
+    typer.echo(
+        f"Planned {len(harvest_plan.partitions)} partitions for"
+        f" {harvest_plan.total if harvest_plan.total is not None else 'unknown'} hits"
+        f" ({harvest_plan.probes} probe requests)",
+        err=True,
+    )
+    for part in harvest_plan.truncated:
+        if part.remainder:
+            typer.echo(
+                f"Warning: {part.total} hits of partition {';'.join(part.filters) or '(all)'}"
+                f" have no value among its split buckets; only those within its first"
+                f" {window} hits are reachable",
+                err=True,
+            )
             continue
-        doc = extract_doc_from_item(item)
-        flat = FlatDict(doc, delimiter=".")
-        rows.append([flat.get(h, "") for h in header_list])
+        typer.echo(
+            f"Warning: partition {';'.join(part.filters) or '(all)'} has {part.total} hits;"
+            f" only the first {window} are reachable",
+            err=True,
+        )
+    if plan:
+        rows = [
+            {
+                "filters": ";".join(p.filters),
+                "total": p.total,
+                "truncated": p.truncated,
+                "remainder": p.remainder,
+            }
+            for p in harvest_plan.partitions
+        ]
+        write_or_print(render_output(rows, ctx.out_format), output)
+        return
+    if enqueue:
+        _enqueue(
+            enqueue,
+            KIND_SEARCH_PAGE,
+            (
+                payload
+                for part in harvest_plan.partitions
+                for payload in search_page_payloads(
+                    query,
+                    part.filters,
+                    # A remainder's hits may be anywhere in its window.
+                    window if part.remainder else min(part.total, window),
+                    limit,
+                )
+            ),
+        )
+        return
 
+    def _fetch(part: Partition) -> Iterator[list[dict]]:
+        return iter_offset_pages(
+            lambda off, lim: to_plain(
+                api.search_datasets(
+                    q=query, filters=list(part.filters) or None, limit=lim, offset=off, facets=False
+                )
+            ),
+            page_size=limit,
+            max_results=window,
+            prefetch=False,
+        )
+
+    counted = {"hits": 0}
+
+    def _counting(pages: Iterator[list[dict]]) -> Iterator[list[dict]]:
+        for page in pages:
+            counted["hits"] += len(page)
+            yield page
+
+    controller = AIMDController(workers) if adaptive else None
+    pages = harvest_pages(_fetch, harvest_plan.partitions, workers=workers, controller=controller)
+    with listening(controller.observe_response) if controller else nullcontext():
+        call_sdk(ctx, lambda: _stream_pages(ctx, _counting(pages), mode, headers, output))
+    typer.echo(f"Harvested {counted['hits']} unique hits", err=True)
+    if controller is not None:
+        typer.echo(controller.summary(), err=True)
+
+
+def _enqueue(queue: str, kind: str, payloads: Iterator[dict]) -> None:
+    work_queue = WorkQueue(queue)
+    try:
+        count = work_queue.put(kind, payloads)
+    finally:
+        work_queue.close()
+    typer.echo(f"Enqueued {count} units", err=True)
+    print(f"Queue: {work_queue.path}")
+
+
+def _wants_jsonl(ctx: CommandContext, output: str | None) -> bool:
+    return ctx.out_format == "jsonl" or bool(output and data_suffix(output) == ".jsonl")
+
+
+def _projection(headers: str) -> Projection:
+    try:
+        return Projection(parse_headers(headers))
+    except ValueError as e:
+        raise typer.BadParameter(str(e)) from e
+
+
+def _source_includes_for(mode: str, headers: str, source_filter: bool) -> list[str]:
+    if mode != "results" or not source_filter:
+        return []
+    return source_includes(parse_headers(headers))
+
+
+def _render_results(data_dict: dict, headers: str, output: str | None) -> None:
+    """
+    Render one response page as a table (stdout) or CSV (file).
+    """
+    projection = _projection(headers)
+    rows = list(iter_hit_rows(projection, extract_hits_list(data_dict)))
     if output:
-        write_csv(header_list, rows, output)
+        write_csv(projection.headers, rows, output)
+        return
+    with profiling.phase("render"):
+        table = tabulate(rows, headers=projection.headers)
+    profiling.count("rows", len(rows))
+    with profiling.phase("write"):
+        print(table)
+
+
+def _stream_pages(
+    ctx: CommandContext,
+    pages: Iterator[list[dict]],
+    mode: str,
+    headers: str,
+    output: str | None,
+) -> None:
+    """
+    Stream hit pages to CSV/JSONL without collecting all rows in memory.
+    """
+    if mode == "raw":
+        stream_jsonl((hit for page in pages for hit in page), output)
+        return
+
+    projection = _projection(headers)
+    rows = (row for page in pages for row in iter_hit_rows(projection, page))
+    if _wants_jsonl(ctx, output):
+        stream_jsonl((dict(zip(projection.headers, row)) for row in rows), output)
     else:
-        print(tabulate(rows, headers=header_list))
+        stream_csv(projection.headers, rows, output)
 
 
 @app.command("dsl")
@@ -129,35 +442,78 @@ def search_dsl(
     headers: str = "id,dataset.title,source.name,source.uid",
     format: str | None = None,
     output: str | None = None,
+    all: bool = False,
+    max_results: int | None = None,
+    tiebreaker: str | None = None,
+    passthrough: bool = False,
+    source_filter: bool = True,
     debug: bool = False,
 ):
     """
     POST /search/0.2/query_dsl -> sdk.search_api.search_datasets_dsl
 
+    With --all/--max-results the body is paged with search_after: `size`
+    from the body is the page size (default 100) and hits are streamed as
+    they arrive. The sort must be total, so either the body has a `pit`
+    clause (its id is carried between pages and `_shard_doc` breaks ties)
+    or --tiebreaker names a unique field that is appended to the sort.
+
+    In results mode `_source` includes are derived from --headers unless the
+    body sets `_source` itself (disable with --no-source-filter).
+
     Examples:
       dateno search dsl --body @query.json --mode raw
       dateno search dsl --body '{"query":{"match_all":{}}}' --mode results
+      dateno search dsl --body @query.json --mode results --all --tiebreaker id -o hits.csv
     """
     ctx = build_context(format, debug)
     payload = load_json_arg(body)
+    if isinstance(payload, dict):
+        payload = with_source_includes(payload, _source_includes_for(mode, headers, source_filter))
+
+    if all or max_results is not None:
+        if mode not in ("results", "raw"):
+            raise typer.BadParameter("--all supports only --mode results|raw")
+        if passthrough:
+            raise typer.BadParameter("--passthrough cannot be combined with --all")
+        if not isinstance(payload, dict):
+            raise typer.BadParameter("--all requires a JSON object body")
+        size = payload.get("size") or DEFAULT_DSL_PAGE_SIZE
+        if isinstance(size, bool) or not isinstance(size, int) or size <= 0:
+            raise typer.BadParameter(f"Body 'size' must be a positive integer, got {size!r}")
+        if max_results is not None and max_results < 0:
+            raise typer.BadParameter("--max-results must not be negative")
+        try:
+            pages = iter_search_after_pages(
+                lambda req: to_plain(
+                    call_sdk(
+                        ctx,
+                        lambda: call_sdk_flexible(ctx.sdk.search_api.search_datasets_dsl, body=req),
+                    )
+                ),
+                payload,
+                page_size=size,
+                max_results=max_results,
+                tiebreaker=tiebreaker,
+            )
+        except ValueError as e:
+            raise typer.BadParameter(str(e)) from e
+        call_sdk(ctx, lambda: _stream_pages(ctx, pages, mode, headers, output))
+        return
 
     data_dict = run_and_render_with_mode(
         ctx,
         lambda: call_sdk_flexible(ctx.sdk.search_api.search_datasets_dsl, body=payload),
         mode,
         output,
+        passthrough=passthrough,
     )
     if data_dict is None:
         return
 
     if mode == "totals":
-        total = ""
-        hits = data_dict.get("hits")
-        if isinstance(hits, dict):
-            total_obj = hits.get("total")
-            if isinstance(total_obj, dict):
-                total = total_obj.get("value", "")
-        write_or_print(str(total), output)
+        total = extract_total(data_dict)
+        write_or_print(str(total if total is not None else ""), output)
         return
 
     if mode == "facets":
@@ -166,21 +522,7 @@ def search_dsl(
         write_or_print(rendered, output)
         return
 
-    header_list = [h.strip() for h in headers.split(",") if h.strip()]
-    hit_list = extract_hits_list(data_dict)
-
-    rows: list[list[Any]] = []
-    for hit in hit_list:
-        if not isinstance(hit, dict):
-            continue
-        src = hit.get("_source", hit)
-        flat = FlatDict(src, delimiter=".")
-        rows.append([flat.get(h, "") for h in header_list])
-
-    if output:
-        write_csv(header_list, rows, output)
-    else:
-        print(tabulate(rows, headers=header_list))
+    _render_results(data_dict, headers, output)
 
 
 @app.command("similar")
@@ -196,6 +538,8 @@ def search_similar(
     headers: str = "id,dataset.title,source.name,source.uid",
     format: str | None = None,
     output: str | None = None,
+    passthrough: bool = False,
+    source_filter: bool = True,
     debug: bool = False,
 ):
     """
@@ -203,6 +547,10 @@ def search_similar(
     """
     ctx = build_context(format, debug)
     fields_list = [f.strip() for f in fields.split(",") if f.strip()] or None
+    includes = _source_includes_for(mode, headers, source_filter)
+    projection_kwargs = (
+        source_include_kwargs(ctx.sdk.search_api.get_similar_datasets, includes) if includes else {}
+    )
 
     data_dict = run_and_render_with_mode(
         ctx,
@@ -210,28 +558,16 @@ def search_similar(
             entry_id=entry_id,
             limit=limit,
             fields=fields_list,
+            **projection_kwargs,
         ),
         mode,
         output,
+        passthrough=passthrough,
     )
     if data_dict is None:
         return
 
-    header_list = [h.strip() for h in headers.split(",") if h.strip()]
-    hit_list = extract_hits_list(data_dict)
-
-    rows: list[list[Any]] = []
-    for hit in hit_list:
-        if not isinstance(hit, dict):
-            continue
-        src = hit.get("_source", hit)
-        flat = FlatDict(src, delimiter=".")
-        rows.append([flat.get(h, "") for h in header_list])
-
-    if output:
-        write_csv(header_list, rows, output)
-    else:
-        print(tabulate(rows, headers=header_list))
+    _render_results(data_dict, headers, output)
 
 
 @app.command("facets")
@@ -250,22 +586,38 @@ def search_facets_list(
 
 @app.command("facet")
 def search_facet_values(
-    key: str = typer.Option(
-        "source.catalog_type",
+    key: list[str] = typer.Option(
+        ["source.catalog_type"],
         "--key",
-        help="Facet key from dateno search facets",
+        help="Facet key from dateno search facets (repeat to fetch several concurrently)",
     ),
+    concurrency: int = DEFAULT_CONCURRENCY,
     format: str | None = None,
     output: str | None = None,
     debug: bool = False,
 ):
     """
-    Get values for a single facet (SDK: get_search_facet_values).
+    Get values for a facet (SDK: get_search_facet_values).
     GET /search/0.2/get_facet
+
+    With several --key options the requests run concurrently and the output
+    maps each key to its values.
     """
+    keys = [key] if isinstance(key, str) else list(dict.fromkeys(key))
+    if concurrency <= 0:
+        raise typer.BadParameter("--concurrency must be positive")
     ctx = build_context(format, debug)
-    run_and_render(
+    if len(keys) == 1:
+        run_and_render(
+            ctx,
+            lambda: ctx.sdk.search_api.get_search_facet_values(key=keys[0]),
+            output,
+        )
+        return
+    fetch = resolve_async(ctx.sdk.search_api.get_search_facet_values)
+    run_many_and_render(
         ctx,
-        lambda: ctx.sdk.search_api.get_search_facet_values(key=key),
+        {k: (lambda k=k: fetch(key=k)) for k in keys},
         output,
+        concurrency=concurrency,
     )
@@ -0,0 +1,35 @@
+"""Local daemon command."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import typer
+
+from dateno_cmd.services import daemon
+
+
+app = typer.Typer(no_args_is_help=False)
+
+
+@app.command("serve")
+def serve(
+    socket: str | None = typer.Option(
+        None,
+        "--socket",
+        help="Unix socket path (default: $DATENO_DAEMON_SOCKET or $XDG_RUNTIME_DIR/dateno_cmd.sock).",
+    ),
+):
+    """
+    Run a long-lived daemon that keeps the SDK, connection pool and cache warm.
+
+    Forward commands to it with `dateno --via-daemon ...` or DATENO_VIA_DAEMON=1.
+    """
+    path = Path(socket).expanduser() if socket else daemon.default_socket_path()
+    try:
+        typer.echo(f"Listening on {path}", err=True)
+        daemon.serve(path)
+    except RuntimeError as e:
+        raise typer.BadParameter(str(e), param_hint="--socket") from e
+    except KeyboardInterrupt:
+        pass
@@ -2,26 +2,83 @@
 
 from __future__ import annotations
 
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
 from pathlib import Path
+from typing import Any
 
 import typer
 
-from dateno_cmd.services.context import build_context
+from dateno_cmd.services.context import CommandContext, build_context, build_local_context
+from dateno_cmd.services.http_events import listening
+from dateno_cmd.services.manifest import MANIFEST_FILENAME, ExportManifest
+from dateno_cmd.services.stats_mirror import (
+    KIND_INDICATOR,
+    KIND_NAMESPACE,
+    KIND_TABLE,
+    KIND_TIMESERIES,
+    StatsMirror,
+    sync_mirror,
+)
+from dateno_cmd.services.work_queue import WorkQueue
+from dateno_cmd.services.worker import KIND_STATS_EXPORT
+from dateno_cmd.utils.aimd import AIMDController
 from dateno_cmd.utils.command import call_sdk, run_and_render
+from dateno_cmd.utils.download import DEFAULT_SEGMENTS, fetch_to_file, parse_checksum
+from dateno_cmd.utils.errors import EXIT_INTERRUPTED, UserInputError
+from dateno_cmd.utils.export_all import (
+    DEFAULT_EXPORT_WORKERS,
+    DEFAULT_LIST_PAGE_SIZE,
+    export_all,
+    iter_series_ids,
+    series_filename,
+)
+from dateno_cmd.utils.paging import fetch_offset_pages_concurrently
+from dateno_cmd.utils.serialization import to_plain
 
 
 app = typer.Typer(no_args_is_help=True)
 
 
+def _render_local(
+    format: str | None,
+    debug: bool,
+    output: str | None,
+    query: Callable[[StatsMirror], Any],
+) -> None:
+    """
+    Answer a read command from the local mirror (`--local`). Single records
+    are the ones stored from the listings by `dateno stats sync`.
+    """
+    ctx = build_local_context(format, debug)
+
+    def _lookup() -> Any:
+        mirror = StatsMirror(ctx.settings.stats_mirror_path)
+        try:
+            result = query(mirror)
+        finally:
+            mirror.close()
+        if result is None:
+            raise UserInputError("Not found in the local mirror; run `dateno stats sync` first")
+        return result
+
+    run_and_render(ctx, _lookup, output)
+
+
 @app.command("ns")
 def stats_list_namespaces(
     start: int = 0,
     limit: int = 100,
     format: str | None = None,
     output: str | None = None,
+    local: bool = False,
     debug: bool = False,
 ):
     """List namespaces / databases (SDK: list_namespaces)."""
+    if local:
+        _render_local(format, debug, output, lambda m: m.list(KIND_NAMESPACE, start=start, limit=limit))
+        return
     ctx = build_context(format, debug)
     run_and_render(
         ctx,
@@ -35,9 +92,13 @@ def stats_get_namespace(
     ns_id: str,
     format: str | None = None,
     output: str | None = None,
+    local: bool = False,
     debug: bool = False,
 ):
     """Get namespace metadata (SDK: get_namespace)."""
+    if local:
+        _render_local(format, debug, output, lambda m: m.get(KIND_NAMESPACE, ns_id))
+        return
     ctx = build_context(format, debug)
     run_and_render(
         ctx,
@@ -53,9 +114,13 @@ def stats_list_tables(
     limit: int = 100,
     format: str | None = None,
     output: str | None = None,
+    local: bool = False,
     debug: bool = False,
 ):
     """List tables in a namespace (SDK: list_namespace_tables)."""
+    if local:
+        _render_local(format, debug, output, lambda m: m.list(KIND_TABLE, ns_id=ns_id, start=start, limit=limit))
+        return
     ctx = build_context(format, debug)
     run_and_render(
         ctx,
@@ -72,9 +137,13 @@ def stats_get_table(
     table_id: str,
     format: str | None = None,
     output: str | None = None,
+    local: bool = False,
     debug: bool = False,
 ):
     """Get table metadata (SDK: get_namespace_table)."""
+    if local:
+        _render_local(format, debug, output, lambda m: m.get(KIND_TABLE, table_id, ns_id=ns_id))
+        return
     ctx = build_context(format, debug)
     run_and_render(
         ctx,
@@ -92,9 +161,13 @@ def stats_list_indicators(
     limit: int = 100,
     format: str | None = None,
     output: str | None = None,
+    local: bool = False,
     debug: bool = False,
 ):
     """List indicators (SDK: list_indicators)."""
+    if local:
+        _render_local(format, debug, output, lambda m: m.list(KIND_INDICATOR, ns_id=ns_id, start=start, limit=limit))
+        return
     ctx = build_context(format, debug)
     run_and_render(
         ctx,
@@ -111,9 +184,13 @@ def stats_get_indicator(
     ind_id: str,
     format: str | None = None,
     output: str | None = None,
+    local: bool = False,
     debug: bool = False,
 ):
     """Get indicator metadata (SDK: get_namespace_indicator)."""
+    if local:
+        _render_local(format, debug, output, lambda m: m.get(KIND_INDICATOR, ind_id, ns_id=ns_id))
+        return
     ctx = build_context(format, debug)
     run_and_render(
         ctx,
@@ -131,9 +208,13 @@ def stats_list_timeseries(
     limit: int = 100,
     format: str | None = None,
     output: str | None = None,
+    local: bool = False,
     debug: bool = False,
 ):
     """List timeseries (SDK: list_timeseries)."""
+    if local:
+        _render_local(format, debug, output, lambda m: m.list(KIND_TIMESERIES, ns_id=ns_id, start=start, limit=limit))
+        return
     ctx = build_context(format, debug)
     run_and_render(
         ctx,
@@ -150,9 +231,13 @@ def stats_get_timeseries(
     ts_id: str,
     format: str | None = None,
     output: str | None = None,
+    local: bool = False,
     debug: bool = False,
 ):
     """Get timeseries metadata (SDK: get_timeseries)."""
+    if local:
+        _render_local(format, debug, output, lambda m: m.get(KIND_TIMESERIES, ts_id, ns_id=ns_id))
+        return
     ctx = build_context(format, debug)
     run_and_render(
         ctx,
@@ -178,25 +263,207 @@ def stats_export_timeseries(
     ts_id: str,
     fileext: str = typer.Option(..., "--format", help="e.g. csv, xlsx, json"),
     output: str = typer.Option(..., "--output", "-o", help="Output file path"),
+    resume: bool = True,
+    checksum: str | None = None,
+    progress: bool = True,
+    segments: int = DEFAULT_SEGMENTS,
     debug: bool = False,
 ):
     """
     Export timeseries data to file (SDK: export_timeseries_file).
+
+    The body is streamed to OUTPUT.part and moved into place when complete;
+    an interrupted export resumes from the part file via an HTTP Range
+    request. --checksum ALGO:HEX verifies the finished file. Large files
+    from servers that accept byte ranges are fetched as --segments parallel
+    ranges (1 disables this).
     """
     ctx = build_context(None, debug)
-    resp = call_sdk(
+    if segments <= 0:
+        raise typer.BadParameter("--segments must be positive")
+    try:
+        expected = parse_checksum(checksum)
+    except UserInputError as e:
+        raise typer.BadParameter(str(e), param_hint="--checksum") from e
+
+    result = call_sdk(
         ctx,
-        lambda: ctx.sdk.statistics_api.export_timeseries_file(
-            ns_id=ns_id,
-            ts_id=ts_id,
-            fileext=fileext,
+        lambda: fetch_to_file(
+            ctx.sdk.statistics_api.export_timeseries_file,
+            {"ns_id": ns_id, "ts_id": ts_id, "fileext": fileext},
+            output,
+            resume=resume,
+            checksum=expected,
+            progress=progress,
+            segments=segments,
         ),
     )
-    r = getattr(resp, "result", resp)
-    if hasattr(r, "read"):
-        r.read()
-    content = getattr(r, "content", b"")
-    if not isinstance(content, bytes):
-        content = b""
-    Path(output).write_bytes(content)
+    if result.resumed_from:
+        typer.echo(f"Resumed at byte {result.resumed_from}", err=True)
     print(f"Exported to {output}")
+
+
+@app.command("export-all")
+def stats_export_namespace(
+    ns_id: str,
+    fileext: str = typer.Option(..., "--format", help="e.g. csv, xlsx, json"),
+    dir: str = typer.Option(..., "--dir", help="Output directory"),
+    workers: int = DEFAULT_EXPORT_WORKERS,
+    page_size: int = DEFAULT_LIST_PAGE_SIZE,
+    manifest: str | None = None,
+    adaptive: bool = False,
+    enqueue: str | None = None,
+    debug: bool = False,
+):
+    """
+    Export every timeseries of a namespace into --dir, --workers at a time.
+
+    Outcomes are kept in DIR/manifest.sqlite (or --manifest); a rerun only
+    fetches series that are missing or failed. --adaptive tunes the number
+    of concurrent downloads (up to --workers) to the server's latency and
+    errors. With --enqueue QUEUE one unit
+    per series is written to a work queue for `dateno worker` instead
+    (--dir must then be reachable by the workers).
+    """
+    if workers <= 0:
+        raise typer.BadParameter("--workers must be positive")
+    if page_size <= 0:
+        raise typer.BadParameter("--page-size must be positive")
+    ctx = build_context(None, debug)
+    api = ctx.sdk.statistics_api
+    directory = Path(dir).expanduser()
+    store = ExportManifest(Path(manifest) if manifest else directory / MANIFEST_FILENAME)
+
+    def _list_page(start: int, limit: int) -> object:
+        data = to_plain(api.list_timeseries(ns_id=ns_id, start=start, limit=limit))
+        return {"items": data} if isinstance(data, list) else data
+
+    if enqueue:
+        _enqueue_exports(ctx, enqueue, ns_id, fileext, directory, _list_page, page_size)
+        return
+
+    def _export_one(ts_id: str, target: Path):
+        return fetch_to_file(
+            api.export_timeseries_file,
+            {"ns_id": ns_id, "ts_id": ts_id, "fileext": fileext},
+            target,
+            progress=False,
+        )
+
+    controller = AIMDController(workers) if adaptive else None
+    try:
+        with listening(controller.observe_response) if controller else nullcontext():
+            result = call_sdk(
+                ctx,
+                lambda: export_all(
+                    iter_series_ids(_list_page, page_size=page_size),
+                    _export_one,
+                    directory,
+                    fileext,
+                    store,
+                    workers=workers,
+                    controller=controller,
+                ),
+            )
+    except KeyboardInterrupt:
+        typer.echo("Interrupted; rerun to continue", err=True)
+        raise typer.Exit(code=EXIT_INTERRUPTED)
+    finally:
+        store.close()
+
+    typer.echo(
+        f"Completed {result.completed}, failed {result.failed}, skipped {result.skipped}",
+        err=True,
+    )
+    if controller is not None:
+        typer.echo(controller.summary(), err=True)
+    print(f"Manifest: {store.path}")
+    if result.exit_code:
+        raise typer.Exit(code=result.exit_code)
+
+
+def _enqueue_exports(
+    ctx: CommandContext,
+    queue: str,
+    ns_id: str,
+    fileext: str,
+    directory: Path,
+    list_page: Callable[[int, int], object],
+    page_size: int,
+) -> None:
+    directory = directory.resolve()
+    payloads = (
+        {"ns_id": ns_id, "ts_id": ts_id, "fileext": fileext, "path": str(target)}
+        for ts_id in iter_series_ids(list_page, page_size=page_size)
+        for target in [directory / series_filename(ts_id, fileext)]
+        if not target.exists()
+    )
+    work_queue = WorkQueue(queue)
+    try:
+        count = call_sdk(ctx, lambda: work_queue.put(KIND_STATS_EXPORT, payloads))
+    finally:
+        work_queue.close()
+    typer.echo(f"Enqueued {count} units", err=True)
+    print(f"Queue: {work_queue.path}")
+
+
+@app.command("sync")
+def stats_sync(
+    namespaces: list[str] | None = typer.Argument(None, help="Namespaces to crawl (default: all)"),
+    full: bool = False,
+    workers: int = DEFAULT_EXPORT_WORKERS,
+    page_size: int = DEFAULT_LIST_PAGE_SIZE,
+    debug: bool = False,
+):
+    """
+    Mirror namespaces, tables, indicators and timeseries into a local SQLite
+    index for `--local` lookups.
+
+    Namespaces whose listing record is unchanged since their last crawl are
+    skipped unless --full is given. Pages are fetched --workers at a time.
+    """
+    if workers <= 0:
+        raise typer.BadParameter("--workers must be positive")
+    if page_size <= 0:
+        raise typer.BadParameter("--page-size must be positive")
+    # The mirror is the cache here; do not fill the response cache with pages.
+    ctx = build_context(None, debug, cache=False)
+    api = ctx.sdk.statistics_api
+    listers = {
+        KIND_NAMESPACE: lambda ns, start, limit: api.list_namespaces(start=start, limit=limit),
+        KIND_TABLE: lambda ns, start, limit: api.list_namespace_tables(ns_id=ns, start=start, limit=limit),
+        KIND_INDICATOR: lambda ns, start, limit: api.list_indicators(ns_id=ns, start=start, limit=limit),
+        KIND_TIMESERIES: lambda ns, start, limit: api.list_timeseries(ns_id=ns, start=start, limit=limit),
+    }
+    mirror = StatsMirror(ctx.settings.stats_mirror_path)
+
+    with ThreadPoolExecutor(max_workers=workers) as pages:
+
+        def _list_all(kind: str, ns_id: str) -> list[Any]:
+            def _page(start: int, limit: int) -> object:
+                data = to_plain(listers[kind](ns_id, start, limit))
+                return {"items": data} if isinstance(data, list) else data
+
+            return fetch_offset_pages_concurrently(_page, page_size, pages)
+
+        try:
+            stats = call_sdk(
+                ctx,
+                lambda: sync_mirror(
+                    mirror,
+                    _list_all,
+                    namespaces=list(namespaces or []),
+                    full=full,
+                    workers=workers,
+                    on_progress=lambda ns_id: typer.echo(f"Synced {ns_id}", err=True),
+                ),
+            )
+        finally:
+            mirror.close()
+
+    typer.echo(
+        f"Namespaces {stats.namespaces}: crawled {len(stats.crawled)},"
+        f" unchanged {len(stats.unchanged)}; rows written {stats.written}, removed {stats.deleted}",
+        err=True,
+    )
+    print(f"Mirror: {mirror.path}")
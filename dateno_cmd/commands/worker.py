@@ -0,0 +1,81 @@
+"""Work queue consumer command."""
+
+from __future__ import annotations
+
+import typer
+
+from dateno_cmd.services.context import build_context
+from dateno_cmd.services.work_queue import DEFAULT_LEASE_SECONDS, WorkQueue, worker_id
+from dateno_cmd.services.worker import (
+    DEFAULT_POLL_SECONDS,
+    DEFAULT_WORKER_THREADS,
+    HANDLERS,
+    run_worker,
+)
+from dateno_cmd.utils.errors import EXIT_INTERRUPTED
+
+
+app = typer.Typer(no_args_is_help=False)
+
+
+@app.command("worker")
+def worker(
+    queue: str = typer.Option(..., "--queue", help="Queue database written with --enqueue"),
+    threads: int = DEFAULT_WORKER_THREADS,
+    lease: float = DEFAULT_LEASE_SECONDS,
+    wait: bool = False,
+    poll: float = DEFAULT_POLL_SECONDS,
+    max_units: int | None = None,
+    debug: bool = False,
+):
+    """
+    Run work units from a shared queue until it is drained.
+
+    Start one worker per core, on any machine that sees the queue file.
+    Units are leased for --lease seconds and renewed while running; units of
+    a worker that died are picked up once their lease expires. With --wait
+    the worker keeps polling for new units until interrupted.
+    """
+    if threads <= 0:
+        raise typer.BadParameter("--threads must be positive")
+    if lease <= 0:
+        raise typer.BadParameter("--lease must be positive")
+    if max_units is not None and max_units <= 0:
+        raise typer.BadParameter("--max-units must be positive")
+    # Results go to the queue; do not also fill the response cache.
+    ctx = build_context(None, debug, cache=False)
+    work_queue = WorkQueue(queue)
+    owner = worker_id()
+
+    def _handle(unit):
+        handler = HANDLERS.get(unit.kind)
+        if handler is None:
+            raise ValueError(f"Unknown work unit kind: {unit.kind}")
+        return handler(ctx.sdk, unit.payload)
+
+    typer.echo(f"Worker {owner} on {work_queue.path}", err=True)
+    try:
+        stats = run_worker(
+            work_queue,
+            _handle,
+            owner,
+            threads=threads,
+            lease_seconds=lease,
+            wait_for_work=wait,
+            poll_seconds=poll,
+            max_units=max_units,
+        )
+    except KeyboardInterrupt:
+        typer.echo("Interrupted; leased units return to the queue when their lease expires", err=True)
+        raise typer.Exit(code=EXIT_INTERRUPTED)
+    finally:
+        work_queue.close()
+
+    for line in stats.errors:
+        typer.echo(line, err=True)
+    typer.echo(
+        f"Completed {stats.completed}, failed {stats.failed}, lost lease {stats.lost}",
+        err=True,
+    )
+    if stats.exit_code:
+        raise typer.Exit(code=stats.exit_code)
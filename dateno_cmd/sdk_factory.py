@@ -7,25 +7,44 @@ Responsible for:
 - Centralizing authentication and transport configuration
 
 This module MUST NOT perform any I/O or CLI parsing.
+
+httpx, the SDK and the transport wrappers are imported when a client is
+actually built, so that importing this module stays cheap for commands
+that never talk to the API.
 """
 
 from __future__ import annotations
 
-from typing import Optional
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, Optional
 import inspect
 import logging
-
-import httpx
-
-from dateno.sdk import SDK
-from dateno.utils import RetryConfig
+import time
 
 from dateno_cmd import __version__ as dateno_cmd_version
 from dateno_cmd.settings import Settings
 from dateno_cmd.utils.errors import UserInputError
 
+if TYPE_CHECKING:
+    import httpx
+
+    from dateno.sdk import SDK
+    from dateno.utils import RetryConfig
+
+    from dateno_cmd.services.cassette import Cassette
+    from dateno_cmd.services.http_cache import ResponseCache
+    from dateno_cmd.services.rate_limit import RateLimiter
+
 
 _sdk_instance: Optional[SDK] = None
+_sdk_key: Optional[tuple] = None
+# HTTP clients of _sdk_instance, closed when it is replaced.
+_sdk_clients: Optional[tuple[httpx.Client, httpx.AsyncClient]] = None
+_closing: set = set()
+
+# Innermost (network) transports; None uses httpx's HTTP transports.
+_base_transports: Optional[tuple[httpx.BaseTransport, httpx.AsyncBaseTransport]] = None
 
 
 def _build_retry_config(retries: int) -> Optional[RetryConfig]:
@@ -38,6 +57,8 @@ def _build_retry_config(retries: int) -> Optional[RetryConfig]:
     if not retries or retries <= 0:
         return None
 
+    from dateno.utils import RetryConfig
+
     sig = inspect.signature(RetryConfig)
     params = sig.parameters
 
@@ -74,6 +95,86 @@ def _sanitize_url(url: httpx.URL) -> str:
     return str(url.copy_with(params=params))
 
 
+# Request extensions holding the monotonic send time and the number of times
+# the request was sent (set by _stamp_request; SDK retries re-send the same
+# request object).
+_STARTED_EXTENSION = "dateno_cmd.started"
+_ATTEMPT_EXTENSION = "dateno_cmd.attempt"
+
+
+def _stamp_request(request: httpx.Request) -> None:
+    request.extensions[_STARTED_EXTENSION] = time.monotonic()
+    request.extensions[_ATTEMPT_EXTENSION] = request.extensions.get(_ATTEMPT_EXTENSION, 0) + 1
+
+
+def _response_elapsed(response: httpx.Response) -> Optional[float]:
+    """
+    Seconds until the response headers arrived. Response hooks run before
+    the body is read, when httpx's own `response.elapsed` is not set yet.
+    """
+    started = response.request.extensions.get(_STARTED_EXTENSION)
+    if started is not None:
+        return time.monotonic() - started
+    try:
+        return response.elapsed.total_seconds()
+    except RuntimeError:
+        return None
+
+
+def _response_bytes(response: httpx.Response) -> Optional[int]:
+    try:
+        return int(response.headers["content-length"])
+    except (KeyError, ValueError):
+        return None
+
+
+def _response_source(response: httpx.Response) -> str:
+    if response.headers.get("x-dateno-cache") == "hit":
+        return "cache"
+    if response.headers.get("x-dateno-replay") == "hit":
+        return "replay"
+    return "network"
+
+
+def _publish_response(response: httpx.Response) -> None:
+    from dateno_cmd.services.http_events import ResponseEvent, has_listeners, publish
+
+    if not has_listeners():
+        return
+    publish(
+        ResponseEvent(
+            method=response.request.method,
+            url=_sanitize_url(response.request.url),
+            status_code=response.status_code,
+            elapsed=_response_elapsed(response),
+            bytes=_response_bytes(response),
+            retries=max(0, response.request.extensions.get(_ATTEMPT_EXTENSION, 1) - 1),
+            source=_response_source(response),
+        )
+    )
+
+
+def _profile_response(response: httpx.Response) -> None:
+    """Add the request's time until its body was read to the `http` phase."""
+    from dateno_cmd.utils import profiling
+
+    profile = profiling.active()
+    started = response.request.extensions.get(_STARTED_EXTENSION)
+    if profile is None or started is None:
+        return
+
+    def _done(_complete: bool = True) -> None:
+        profile.add_time("http", time.monotonic() - started)
+
+    if response.is_stream_consumed:
+        # Built from in-memory content (cache hits, replays).
+        _done()
+        return
+    from dateno_cmd.services.body_stream import ObservedStream
+
+    response.stream = ObservedStream(response.stream, on_close=_done)
+
+
 def _log_request(request: httpx.Request) -> None:
     _http_logger.debug(
         "http_request method=%s url=%s",
@@ -83,20 +184,90 @@ def _log_request(request: httpx.Request) -> None:
 
 
 def _log_response(response: httpx.Response) -> None:
-    elapsed_ms = None
-    if response.elapsed is not None:
-        elapsed_ms = int(response.elapsed.total_seconds() * 1000)
+    elapsed = _response_elapsed(response)
+    elapsed_ms = int(elapsed * 1000) if elapsed is not None else None
     _http_logger.debug(
-        "http_response status=%s method=%s url=%s elapsed_ms=%s",
+        "http_response status=%s method=%s url=%s elapsed_ms=%s bytes=%s",
         response.status_code,
         response.request.method,
         _sanitize_url(response.request.url),
         elapsed_ms if elapsed_ms is not None else "n/a",
+        response.headers.get("content-length", "n/a"),
     )
 
 
+def _event_hooks(debug: bool) -> dict[str, list[Callable[[Any], None]]]:
+    request_hooks: list[Callable[[Any], None]] = [_stamp_request]
+    response_hooks: list[Callable[[Any], None]] = [_publish_response, _profile_response]
+    if debug:
+        request_hooks.append(_log_request)
+        response_hooks.append(_log_response)
+    return {"request": request_hooks, "response": response_hooks}
+
+
+def _async_hooks(hooks: dict[str, list[Callable[[Any], None]]]) -> dict[str, list[Callable]]:
+    """AsyncClient awaits its event hooks, so wrap the sync ones."""
+
+    def _wrap(hook: Callable[[Any], None]) -> Callable:
+        async def _hook(arg: Any) -> None:
+            hook(arg)
+
+        return _hook
+
+    return {name: [_wrap(h) for h in fns] for name, fns in hooks.items()}
+
+
+def build_response_cache(settings: Settings) -> Optional[ResponseCache]:
+    """
+    Build the on-disk response cache from settings (None when disabled).
+    The database file is opened lazily on the first cacheable request.
+    """
+    if not settings.cache_enabled:
+        return None
+    if settings.record_dir or settings.replay_dir:
+        # A cassette must see (and answer) every request the command makes.
+        return None
+
+    from dateno_cmd.services.http_cache import ResponseCache
+
+    return ResponseCache(settings.cache_path, max_bytes=settings.cache_max_bytes)
+
+
+def build_rate_limiter(settings: Settings) -> RateLimiter:
+    """
+    The process-wide limiter for the configured --rps/--max-concurrency.
+    Installed even without limits, so 429/Retry-After still pause requests.
+    """
+    from dateno_cmd.services.rate_limit import get_rate_limiter
+
+    return get_rate_limiter(settings.rps, settings.max_concurrency)
+
+
+def build_cassette(settings: Settings) -> Optional[Cassette]:
+    """The --record/--replay cassette from settings (None when not used)."""
+    path = settings.replay_dir or settings.record_dir
+    if not path:
+        return None
+
+    from dateno_cmd.services.cassette import Cassette
+
+    cassette = Cassette(path)
+    if settings.replay_dir and not cassette.exists():
+        raise UserInputError(f"No recorded cassette in {settings.replay_dir}")
+    return cassette
+
+
 def _build_http_clients(
-    apikey: str, timeout_ms: int, debug: bool, client_source: Optional[str]
+    apikey: str,
+    timeout_ms: int,
+    debug: bool,
+    client_source: Optional[str],
+    cache: Optional[ResponseCache] = None,
+    refresh: bool = False,
+    limiter: Optional[RateLimiter] = None,
+    cassette: Optional[Cassette] = None,
+    replay: bool = False,
+    replay_latency: bool = False,
 ) -> tuple[httpx.Client, httpx.AsyncClient]:
     """
     Build preconfigured HTTPX clients for the SDK.
@@ -108,10 +279,32 @@ def _build_http_clients(
     The generated SDK currently injects the key via query param (api_key_query).
     Some endpoints may require the Authorization header, so we proactively set it here.
 
+    A RateLimiter paces network requests of both clients (cache hits are not
+    paced). A cassette records every network response or, with `replay`,
+    stands in for the network (optionally with the recorded latency).
+    When a ResponseCache is given, both clients get a caching transport wrapper;
+    `refresh` skips cache lookups but still stores fresh responses. The
+    passthrough wrapper lets `--passthrough` commands take raw response bytes.
+
     :param apikey: API key string
     :param timeout_ms: Timeout in milliseconds
     :return: (sync_client, async_client)
     """
+    import httpx
+
+    from dateno_cmd.services.cassette import (
+        AsyncRecordingTransport,
+        AsyncReplayTransport,
+        RecordingTransport,
+        ReplayTransport,
+    )
+    from dateno_cmd.services.http_cache import AsyncCachingTransport, CachingTransport
+    from dateno_cmd.services.passthrough import (
+        AsyncPassthroughTransport,
+        PassthroughTransport,
+    )
+    from dateno_cmd.services.rate_limit import AsyncRateLimitTransport, RateLimitTransport
+
     timeout_s = max(1.0, float(timeout_ms or 30000) / 1000.0)
 
     source_value = (client_source or "").strip()
@@ -123,25 +316,123 @@ def _build_http_clients(
         "Dateno-Client": source_value,
     }
 
-    event_hooks = None
-    if debug:
-        event_hooks = {"request": [_log_request], "response": [_log_response]}
+    event_hooks = _event_hooks(debug)
+
+    transport: httpx.BaseTransport
+    async_transport: httpx.AsyncBaseTransport
+    if cassette is not None and replay:
+        transport = ReplayTransport(cassette, latency=replay_latency)
+        async_transport = AsyncReplayTransport(cassette, latency=replay_latency)
+    elif _base_transports is not None:
+        transport, async_transport = _base_transports
+    else:
+        transport = httpx.HTTPTransport()
+        async_transport = httpx.AsyncHTTPTransport()
+    if cassette is not None and not replay:
+        transport = RecordingTransport(transport, cassette)
+        async_transport = AsyncRecordingTransport(async_transport, cassette)
+    if limiter is not None:
+        transport = RateLimitTransport(transport, limiter)
+        async_transport = AsyncRateLimitTransport(async_transport, limiter)
+    if cache is not None:
+        transport = CachingTransport(transport, cache, refresh=refresh)
+        async_transport = AsyncCachingTransport(async_transport, cache, refresh=refresh)
+    # Outermost, so cached responses can be passed through as well.
+    transport = PassthroughTransport(transport)
+    async_transport = AsyncPassthroughTransport(async_transport)
 
     client = httpx.Client(
         follow_redirects=True,
         headers=headers,
         timeout=timeout_s,
         event_hooks=event_hooks,
+        transport=transport,
     )
     async_client = httpx.AsyncClient(
         follow_redirects=True,
         headers=headers,
         timeout=timeout_s,
-        event_hooks=event_hooks,
+        event_hooks=_async_hooks(event_hooks),
+        transport=async_transport,
     )
     return client, async_client
 
 
+@contextmanager
+def use_transports(
+    transport: httpx.BaseTransport,
+    async_transport: httpx.AsyncBaseTransport,
+) -> Iterator[None]:
+    """
+    Send the SDK's requests through the given transports instead of the
+    network (e.g. services.fake_api) while the block runs. The rate limiter,
+    cache and passthrough wrappers still apply.
+    """
+    global _base_transports
+
+    previous = _base_transports
+    _base_transports = (transport, async_transport)
+    _discard_sdk()
+    try:
+        yield
+    finally:
+        _base_transports = previous
+        _discard_sdk()
+
+
+def _close_clients(client: httpx.Client, async_client: httpx.AsyncClient) -> None:
+    """Release the connection pools of a replaced SDK's clients (best effort)."""
+    import asyncio
+
+    try:
+        client.close()
+    except Exception:
+        _http_logger.debug("http_client_close failed", exc_info=True)
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+    if loop is not None:
+        task = loop.create_task(async_client.aclose())
+        _closing.add(task)
+        task.add_done_callback(_closing.discard)
+        return
+    try:
+        asyncio.run(async_client.aclose())
+    except Exception:
+        # Connections opened on an event loop that has since been closed.
+        _http_logger.debug("http_client_close failed", exc_info=True)
+
+
+def _discard_sdk() -> None:
+    global _sdk_instance, _sdk_key, _sdk_clients
+
+    clients = _sdk_clients
+    _sdk_instance, _sdk_key, _sdk_clients = None, None, None
+    if clients is not None:
+        _close_clients(*clients)
+
+
+def _settings_key(settings: Settings) -> tuple:
+    return (
+        settings.apikey,
+        settings.server_url,
+        settings.timeout_ms,
+        settings.retries,
+        bool(settings.debug),
+        settings.client_source,
+        settings.cache_enabled,
+        settings.cache_path,
+        settings.cache_max_bytes,
+        bool(settings.cache_refresh),
+        settings.rps,
+        settings.max_concurrency,
+        settings.record_dir,
+        settings.replay_dir,
+        bool(settings.replay_latency),
+    )
+
+
 def get_sdk(settings: Settings) -> SDK:
     """
     Create (or return cached) SDK instance configured from CLI settings.
@@ -151,15 +442,23 @@ def get_sdk(settings: Settings) -> SDK:
     - losing connection pools
     - inconsistent retry / timeout behavior
 
+    A long-lived process (`dateno serve`) sees different settings per
+    invocation, so the instance is rebuilt when the effective settings change
+    and the previous instance's HTTP clients are closed.
+
     :param settings: Loaded CLI settings
     :return: Configured SDK instance
     """
-    global _sdk_instance
+    global _sdk_instance, _sdk_key, _sdk_clients
 
-    if _sdk_instance is not None:
+    key = _settings_key(settings)
+    if _sdk_instance is not None and _sdk_key == key:
         return _sdk_instance
+    _discard_sdk()
 
-    if not settings.apikey:
+    # Replayed responses need no key; the recorded URLs have it masked.
+    apikey = settings.apikey or ("replay" if settings.replay_dir else None)
+    if not apikey:
         raise UserInputError(
             "API key is not configured. "
             "Please provide it via .dateno_cmd.yaml (apikey: ...) or DATENO_APIKEY env var."
@@ -168,18 +467,28 @@ def get_sdk(settings: Settings) -> SDK:
     retry_config = _build_retry_config(settings.retries or 0)
 
     client, async_client = _build_http_clients(
-        apikey=settings.apikey,
+        apikey=apikey,
         timeout_ms=settings.timeout_ms or 30000,
         debug=bool(settings.debug),
         client_source=settings.client_source,
+        cache=build_response_cache(settings),
+        refresh=bool(settings.cache_refresh),
+        limiter=build_rate_limiter(settings),
+        cassette=build_cassette(settings),
+        replay=bool(settings.replay_dir),
+        replay_latency=bool(settings.replay_latency),
     )
 
+    from dateno.sdk import SDK
+
     _sdk_instance = SDK(
-        api_key_query=settings.apikey,  # used by SDK to inject ?apikey=
+        api_key_query=apikey,  # used by SDK to inject ?apikey=
         server_url=settings.server_url,
         client=client,
         async_client=async_client,
         timeout_ms=settings.timeout_ms,
         retry_config=retry_config,
     )
+    _sdk_key = key
+    _sdk_clients = (client, async_client)
     return _sdk_instance
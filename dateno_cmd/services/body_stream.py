@@ -0,0 +1,64 @@
+"""
+Response body stream wrapper for observing a body as the SDK reads it.
+
+Response hooks and transports see a response before its body is read; to
+time the download or copy the bytes elsewhere without buffering the body,
+they replace `response.stream` with an ObservedStream.
+"""
+
+from __future__ import annotations
+
+from collections.abc import AsyncIterator, Callable, Iterator
+from typing import Any, Optional
+
+import httpx
+
+
+class ObservedStream(httpx.SyncByteStream, httpx.AsyncByteStream):
+    """
+    Pass a sync or async body stream through, calling `on_chunk` with every
+    chunk and `on_close` once when the stream is closed (after the body was
+    read, or when the response was abandoned; `complete` tells which).
+    """
+
+    def __init__(
+        self,
+        stream: Any,
+        on_chunk: Optional[Callable[[bytes], None]] = None,
+        on_close: Optional[Callable[[bool], None]] = None,
+    ) -> None:
+        self._stream = stream
+        self._on_chunk = on_chunk
+        self._on_close = on_close
+        self._complete = False
+
+    def __iter__(self) -> Iterator[bytes]:
+        for chunk in self._stream:
+            if self._on_chunk is not None:
+                self._on_chunk(chunk)
+            yield chunk
+        self._complete = True
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._stream:
+            if self._on_chunk is not None:
+                self._on_chunk(chunk)
+            yield chunk
+        self._complete = True
+
+    def _closed(self) -> None:
+        on_close, self._on_close = self._on_close, None
+        if on_close is not None:
+            on_close(self._complete)
+
+    def close(self) -> None:
+        try:
+            self._stream.close()
+        finally:
+            self._closed()
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            self._closed()
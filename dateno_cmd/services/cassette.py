@@ -0,0 +1,285 @@
+"""
+HTTP cassettes: record API traffic once, replay it offline (`--record DIR`,
+`--replay DIR`).
+
+A cassette directory holds `interactions.jsonl`, one line per recorded
+response (method, sanitized URL, status, headers, timings and the digest of
+the body), and `bodies/<sha256>` with the response bodies, stored once per
+distinct content. Requests are matched on method, sanitized URL (the API key
+is masked, so any key replays), Range header and request body; repeated
+requests are answered in recorded order, the last answer repeating.
+
+Replay answers immediately by default, or after the recorded time with
+`latency=True`, so a command can be profiled or benchmarked against the same
+responses and the same server timings on every run.
+
+Recording does not buffer responses: bodies stream through to the command
+while being copied to a temporary file in `bodies/`, and the interaction is
+written once the body has been read (a body left unread is not recorded).
+Streamed bodies are stored as sent, with their Content-Encoding.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Optional
+
+import httpx
+
+from dateno_cmd.sdk_factory import _sanitize_url
+from dateno_cmd.services.body_stream import ObservedStream
+
+
+INTERACTIONS_FILE = "interactions.jsonl"
+BODIES_DIR = "bodies"
+
+# Not replayable as stored; Content-Encoding is dropped too for bodies that
+# were already decoded in memory.
+_SKIP_HEADERS = {
+    "content-length",
+    "transfer-encoding",
+    "connection",
+    "set-cookie",
+}
+
+
+def _replayable_headers(response: httpx.Response, decoded: bool) -> list[tuple[str, str]]:
+    skip = _SKIP_HEADERS | {"content-encoding"} if decoded else _SKIP_HEADERS
+    return [(k, v) for k, v in response.headers.multi_items() if k.lower() not in skip]
+
+
+def interaction_key(request: httpx.Request) -> str:
+    h = hashlib.sha256()
+    h.update(request.method.upper().encode("utf-8"))
+    h.update(b"\n")
+    h.update(_sanitize_url(request.url).encode("utf-8"))
+    h.update(b"\n")
+    h.update(request.headers.get("range", "").encode("utf-8"))
+    h.update(b"\n")
+    h.update(request.content or b"")
+    return h.hexdigest()
+
+
+@dataclass(frozen=True)
+class Interaction:
+    key: str
+    method: str
+    url: str
+    status_code: int
+    headers: list[tuple[str, str]]
+    body: str
+    # Seconds until the response headers, and until the body was read.
+    elapsed: float
+    total: float
+
+
+class _BodyWriter:
+    """Streams one body to a temporary file, hashing it on the way."""
+
+    def __init__(self, bodies: Path) -> None:
+        self._bodies = bodies
+        self._hash = hashlib.sha256()
+        bodies.mkdir(parents=True, exist_ok=True)
+        fd, self._tmp = tempfile.mkstemp(prefix=".", suffix=".part", dir=str(bodies))
+        self._file = os.fdopen(fd, "wb")
+
+    def write(self, chunk: bytes) -> None:
+        self._hash.update(chunk)
+        self._file.write(chunk)
+
+    def commit(self) -> str:
+        """Store the body under its digest and return the digest."""
+        self._file.close()
+        digest = self._hash.hexdigest()
+        # Bodies are content-addressed; an existing copy is identical.
+        os.replace(self._tmp, self._bodies / digest)
+        return digest
+
+    def discard(self) -> None:
+        self._file.close()
+        Path(self._tmp).unlink(missing_ok=True)
+
+
+class Cassette:
+    """A cassette directory; safe to share between threads."""
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path).expanduser()
+        self._lock = threading.Lock()
+        self._recorded: Optional[dict[str, list[Interaction]]] = None
+        self._played: dict[str, int] = {}
+
+    # Recording
+
+    def body_writer(self) -> _BodyWriter:
+        return _BodyWriter(self.path / BODIES_DIR)
+
+    def record(
+        self,
+        request: httpx.Request,
+        response: httpx.Response,
+        body: str,
+        elapsed: float,
+        total: float,
+        decoded: bool = False,
+    ) -> None:
+        """Append an interaction whose body is stored under digest `body`."""
+        entry = {
+            "key": interaction_key(request),
+            "method": request.method,
+            "url": _sanitize_url(request.url),
+            "status_code": response.status_code,
+            "headers": _replayable_headers(response, decoded),
+            "body": body,
+            "elapsed": round(elapsed, 6),
+            "total": round(total, 6),
+        }
+        with self._lock:
+            self.path.mkdir(parents=True, exist_ok=True)
+            with (self.path / INTERACTIONS_FILE).open("a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+    def recording(
+        self, request: httpx.Request, response: httpx.Response, started: float
+    ) -> httpx.Response:
+        """
+        Arrange for `response` to be recorded as its body is read; `started`
+        is when the request was sent.
+        """
+        elapsed = time.monotonic() - started
+        writer = self.body_writer()
+        if response.is_stream_consumed:
+            # Built from in-memory content, already decoded.
+            writer.write(response.content)
+            self.record(request, response, writer.commit(), elapsed, elapsed, decoded=True)
+            return response
+
+        def _closed(complete: bool) -> None:
+            if not complete:
+                writer.discard()
+                return
+            total = time.monotonic() - started
+            self.record(request, response, writer.commit(), elapsed, total)
+
+        response.stream = ObservedStream(response.stream, on_chunk=writer.write, on_close=_closed)
+        return response
+
+    # Replay
+
+    def exists(self) -> bool:
+        return (self.path / INTERACTIONS_FILE).is_file()
+
+    def _load(self) -> dict[str, list[Interaction]]:
+        if self._recorded is None:
+            recorded: dict[str, list[Interaction]] = {}
+            index = self.path / INTERACTIONS_FILE
+            if not index.exists():
+                raise FileNotFoundError(f"No cassette at {self.path}")
+            with index.open("r", encoding="utf-8") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    data: dict[str, Any] = json.loads(line)
+                    data["headers"] = [tuple(h) for h in data["headers"]]
+                    interaction = Interaction(**data)
+                    recorded.setdefault(interaction.key, []).append(interaction)
+            self._recorded = recorded
+        return self._recorded
+
+    def next_interaction(self, request: httpx.Request) -> Optional[Interaction]:
+        key = interaction_key(request)
+        with self._lock:
+            answers = self._load().get(key)
+            if not answers:
+                return None
+            played = self._played.get(key, 0)
+            self._played[key] = played + 1
+        return answers[min(played, len(answers) - 1)]
+
+    def response(self, interaction: Interaction, request: httpx.Request) -> httpx.Response:
+        content = (self.path / BODIES_DIR / interaction.body).read_bytes()
+        return httpx.Response(
+            interaction.status_code,
+            headers=interaction.headers + [("x-dateno-replay", "hit")],
+            content=content,
+            request=request,
+        )
+
+    def missing(self, request: httpx.Request) -> httpx.ConnectError:
+        return httpx.ConnectError(
+            f"No recorded response for {request.method} {_sanitize_url(request.url)} "
+            f"in cassette {self.path}",
+            request=request,
+        )
+
+
+class RecordingTransport(httpx.BaseTransport):
+    """Sync transport that stores every response of `inner` in a cassette as it is read."""
+
+    def __init__(self, inner: httpx.BaseTransport, cassette: Cassette) -> None:
+        self._inner = inner
+        self._cassette = cassette
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        t0 = time.monotonic()
+        response = self._inner.handle_request(request)
+        return self._cassette.recording(request, response, t0)
+
+    def close(self) -> None:
+        self._inner.close()
+
+
+class AsyncRecordingTransport(httpx.AsyncBaseTransport):
+    """Async counterpart of RecordingTransport."""
+
+    def __init__(self, inner: httpx.AsyncBaseTransport, cassette: Cassette) -> None:
+        self._inner = inner
+        self._cassette = cassette
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        t0 = time.monotonic()
+        response = await self._inner.handle_async_request(request)
+        return self._cassette.recording(request, response, t0)
+
+    async def aclose(self) -> None:
+        await self._inner.aclose()
+
+
+class ReplayTransport(httpx.BaseTransport):
+    """Sync transport answering from a cassette instead of the network."""
+
+    def __init__(self, cassette: Cassette, latency: bool = False) -> None:
+        self._cassette = cassette
+        self._latency = latency
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        interaction = self._cassette.next_interaction(request)
+        if interaction is None:
+            raise self._cassette.missing(request)
+        if self._latency and interaction.total > 0:
+            time.sleep(interaction.total)
+        return self._cassette.response(interaction, request)
+
+
+class AsyncReplayTransport(httpx.AsyncBaseTransport):
+    """Async counterpart of ReplayTransport."""
+
+    def __init__(self, cassette: Cassette, latency: bool = False) -> None:
+        self._cassette = cassette
+        self._latency = latency
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        interaction = self._cassette.next_interaction(request)
+        if interaction is None:
+            raise self._cassette.missing(request)
+        if self._latency and interaction.total > 0:
+            await asyncio.sleep(interaction.total)
+        return self._cassette.response(interaction, request)
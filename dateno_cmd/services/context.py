@@ -10,6 +10,7 @@ import click
 
 from dateno_cmd.settings import Settings, get_settings
 from dateno_cmd.sdk_factory import get_sdk
+from dateno_cmd.utils.profiling import phase
 
 
 @dataclass
@@ -35,8 +36,22 @@ def _apply_overrides(settings: Settings, overrides: dict[str, Any]) -> None:
         settings.timeout_ms = overrides["timeout_ms"]
     if overrides.get("retries") is not None:
         settings.retries = overrides["retries"]
+    if overrides.get("rps") is not None:
+        settings.rps = overrides["rps"]
+    if overrides.get("max_concurrency") is not None:
+        settings.max_concurrency = overrides["max_concurrency"]
     if overrides.get("debug") is not None:
         settings.debug = bool(overrides["debug"])
+    if overrides.get("no_cache"):
+        settings.cache_enabled = False
+    if overrides.get("refresh"):
+        settings.cache_refresh = True
+    if overrides.get("record_dir") is not None:
+        settings.record_dir = overrides["record_dir"]
+    if overrides.get("replay_dir") is not None:
+        settings.replay_dir = overrides["replay_dir"]
+    if overrides.get("replay_latency"):
+        settings.replay_latency = True
 
 
 def configure_logging(cli_debug: bool, settings_debug: bool) -> None:
@@ -51,17 +66,43 @@ def configure_logging(cli_debug: bool, settings_debug: bool) -> None:
 
 
 def load_settings_with_overrides() -> Settings:
-    settings = get_settings().load_user_yaml_if_needed()
-    overrides = _get_cli_overrides()
-    _apply_overrides(settings, overrides)
+    with phase("settings"):
+        settings = get_settings().load_user_yaml_if_needed()
+        overrides = _get_cli_overrides()
+        _apply_overrides(settings, overrides)
     return settings
 
 
-def build_context(format_override: str | None, debug: bool) -> CommandContext:
+def build_context(
+    format_override: str | None,
+    debug: bool,
+    cache: bool = True,
+) -> CommandContext:
+    """
+    Load settings and the SDK for a command. `cache=False` bypasses the
+    response cache for commands that crawl and keep their own copy.
+    """
     settings = load_settings_with_overrides()
     if debug:
         settings.debug = True
+    if not cache:
+        settings.cache_enabled = False
     configure_logging(settings.debug, settings.debug)
     out_format = (format_override or settings.output_format or "yaml").strip().lower()
-    sdk = get_sdk(settings)
+    with phase("sdk_init"):
+        sdk = get_sdk(settings)
+    if getattr(settings, "latency_history", False):
+        from dateno_cmd.services.latency_history import install_recorder
+
+        install_recorder(settings.latency_history_path)
     return CommandContext(settings=settings, sdk=sdk, out_format=out_format)
+
+
+def build_local_context(format_override: str | None, debug: bool) -> CommandContext:
+    """Context for commands answered from local data; no API key or SDK needed."""
+    settings = load_settings_with_overrides()
+    if debug:
+        settings.debug = True
+    configure_logging(settings.debug, settings.debug)
+    out_format = (format_override or settings.output_format or "yaml").strip().lower()
+    return CommandContext(settings=settings, sdk=None, out_format=out_format)
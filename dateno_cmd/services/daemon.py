@@ -0,0 +1,253 @@
+"""
+Local daemon mode for the Dateno CLI.
+
+`dateno serve` keeps one process alive with warm settings, SDK instance,
+HTTP connection pools and response cache. Clients started with
+`--via-daemon` (or DATENO_VIA_DAEMON=1) forward their argv, working
+directory and DATENO_* environment over a Unix domain socket; stdout/stderr
+are streamed back and the client exits with the command's exit code.
+
+Wire format:
+  client -> server: one JSON line {"argv": [...], "cwd": ..., "env": {...}, "stdin": ...}
+  server -> client: frames of 1 byte channel + 4 byte big-endian length + payload;
+                    channel b"o" stdout, b"e" stderr, b"x" exit code (payload empty,
+                    length field holds the code).
+"""
+
+from __future__ import annotations
+
+import contextlib
+import io
+import json
+import logging
+import os
+import socket
+import socketserver
+import struct
+import sys
+import traceback
+from pathlib import Path
+from typing import Any, BinaryIO, Optional
+
+
+SOCKET_ENV = "DATENO_DAEMON_SOCKET"
+VIA_DAEMON_ENV = "DATENO_VIA_DAEMON"
+FORWARDED_ENV_PREFIX = "DATENO_"
+
+_FRAME_HEADER = struct.Struct(">cI")
+
+_daemon_logger = logging.getLogger("dateno_cmd.daemon")
+
+# Set inside the daemon process so forwarded invocations never re-forward.
+_in_daemon = False
+
+
+def default_socket_path() -> Path:
+    env_path = os.environ.get(SOCKET_ENV)
+    if env_path:
+        return Path(env_path).expanduser()
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return Path(runtime_dir) / "dateno_cmd.sock"
+    return Path.home() / ".cache" / "dateno_cmd" / "daemon.sock"
+
+
+def in_daemon() -> bool:
+    return _in_daemon
+
+
+class _FrameWriter(io.RawIOBase):
+    """Raw stream writing each chunk as one frame on the client socket."""
+
+    def __init__(self, sock: socket.socket, channel: bytes) -> None:
+        self._sock = sock
+        self._channel = channel
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: Any) -> int:
+        payload = bytes(data)
+        if payload:
+            self._sock.sendall(_FRAME_HEADER.pack(self._channel, len(payload)) + payload)
+        return len(payload)
+
+
+def _text_stream(sock: socket.socket, channel: bytes) -> io.TextIOWrapper:
+    buffered = io.BufferedWriter(_FrameWriter(sock, channel))
+    return io.TextIOWrapper(buffered, encoding="utf-8", newline="", write_through=True)
+
+
+@contextlib.contextmanager
+def _patched_environ(env: dict[str, str]):
+    saved = {k: v for k, v in os.environ.items() if k.startswith(FORWARDED_ENV_PREFIX)}
+    for key in saved:
+        os.environ.pop(key, None)
+    os.environ.update(env)
+    try:
+        yield
+    finally:
+        for key in [k for k in os.environ if k.startswith(FORWARDED_ENV_PREFIX)]:
+            os.environ.pop(key, None)
+        os.environ.update(saved)
+
+
+def run_cli(argv: list[str]) -> int:
+    """Run one CLI invocation in-process and return its exit code."""
+    import click
+    import typer
+
+    from dateno_cmd.cli import app
+
+    command = typer.main.get_command(app)
+    try:
+        command.main(args=argv, prog_name="dateno", standalone_mode=False)
+    except click.exceptions.Exit as e:
+        return e.exit_code
+    except click.ClickException as e:
+        e.show()
+        return e.exit_code
+    except click.exceptions.Abort:
+        click.echo("Aborted!", err=True)
+        return 1
+    except Exception:
+        traceback.print_exc()
+        return 1
+    return 0
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        line = self.rfile.readline()
+        if not line:
+            return
+        request = json.loads(line)
+        argv = [str(a) for a in request.get("argv", [])]
+        env = {
+            str(k): str(v)
+            for k, v in (request.get("env") or {}).items()
+            if str(k).startswith(FORWARDED_ENV_PREFIX) and k != VIA_DAEMON_ENV
+        }
+        stdout = _text_stream(self.connection, b"o")
+        stderr = _text_stream(self.connection, b"e")
+        stdin = io.TextIOWrapper(io.BytesIO((request.get("stdin") or "").encode("utf-8")), encoding="utf-8")
+        cwd = os.getcwd()
+        _daemon_logger.debug("daemon_request argv=%s", argv)
+        try:
+            os.chdir(request.get("cwd") or cwd)
+            with _patched_environ(env), contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+                saved_stdin, sys.stdin = sys.stdin, stdin
+                try:
+                    code = run_cli(argv)
+                finally:
+                    sys.stdin = saved_stdin
+                    stdout.flush()
+                    stderr.flush()
+        finally:
+            os.chdir(cwd)
+        self.connection.sendall(_FRAME_HEADER.pack(b"x", code & 0xFFFFFFFF))
+
+
+def create_server(socket_path: Optional[Path] = None) -> socketserver.UnixStreamServer:
+    """Bind the daemon socket (owner-only), replacing a stale socket file."""
+    path = Path(socket_path) if socket_path else default_socket_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.exists():
+        if ping(path):
+            raise RuntimeError(f"Daemon already running on {path}")
+        path.unlink()
+
+    old_umask = os.umask(0o177)
+    try:
+        return socketserver.UnixStreamServer(str(path), _RequestHandler)
+    finally:
+        os.umask(old_umask)
+
+
+def serve(socket_path: Optional[Path] = None) -> None:
+    """
+    Serve CLI invocations on a Unix socket until interrupted.
+
+    Requests are handled one at a time: stdout/stderr, cwd and environment
+    are process-wide, and the shared SDK/connection pool is what is reused.
+    """
+    global _in_daemon
+
+    server = create_server(socket_path)
+    _in_daemon = True
+    try:
+        with server:
+            server.serve_forever()
+    finally:
+        _in_daemon = False
+        Path(server.server_address).unlink(missing_ok=True)
+
+
+def ping(socket_path: Optional[Path] = None) -> bool:
+    path = Path(socket_path) if socket_path else default_socket_path()
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(str(path))
+        return True
+    except OSError:
+        return False
+
+
+def _read_exact(sock: socket.socket, n: int) -> bytes:
+    chunks = []
+    while n:
+        chunk = sock.recv(n)
+        if not chunk:
+            raise ConnectionError("Daemon closed the connection")
+        chunks.append(chunk)
+        n -= len(chunk)
+    return b"".join(chunks)
+
+
+def forward(
+    argv: list[str],
+    socket_path: Optional[Path] = None,
+    stdout: Optional[BinaryIO] = None,
+    stderr: Optional[BinaryIO] = None,
+) -> Optional[int]:
+    """
+    Forward an invocation to a running daemon and stream its output.
+
+    Returns the exit code, or None if no daemon is listening (the caller then
+    runs the command locally).
+    """
+    path = Path(socket_path) if socket_path else default_socket_path()
+    out = stdout or sys.stdout.buffer
+    err = stderr or sys.stderr.buffer
+
+    stdin_data = None
+    if "-" in argv and not sys.stdin.isatty():
+        stdin_data = sys.stdin.read()
+
+    request = {
+        "argv": argv,
+        "cwd": os.getcwd(),
+        "env": {
+            k: v
+            for k, v in os.environ.items()
+            if k.startswith(FORWARDED_ENV_PREFIX) and k != VIA_DAEMON_ENV
+        },
+        "stdin": stdin_data,
+    }
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        try:
+            sock.connect(str(path))
+        except OSError:
+            _daemon_logger.debug("daemon_unavailable socket=%s", path)
+            return None
+        sock.sendall(json.dumps(request).encode("utf-8") + b"\n")
+        while True:
+            channel, length = _FRAME_HEADER.unpack(_read_exact(sock, _FRAME_HEADER.size))
+            if channel == b"x":
+                return int(length)
+            target = out if channel == b"o" else err
+            target.write(_read_exact(sock, length))
+            target.flush()
+    finally:
+        sock.close()
@@ -0,0 +1,257 @@
+"""
+In-process stand-in for the Dateno API, for offline tests and benchmarks.
+
+FakeAPI serves deterministic synthetic data for the search, catalogs, raw
+and statsdb routes through httpx MockTransports, with configurable latency,
+payload size and error injection. Routes are matched on the end of the URL
+path, so any API version prefix or server URL works:
+
+    fake = FakeAPI(FakeAPIConfig(latency=0.02, error_rate=0.01))
+    with sdk_factory.use_transports(fake.transport(), fake.async_transport()):
+        ...  # commands now talk to the fake API
+
+Responses use the shapes the CLI reads (`hits.total.value`/`hits.hits` for
+searches, `items`/`total` for listings); they are not a full API model.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import re
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any, Optional
+
+import httpx
+
+
+@dataclass
+class FakeAPIConfig:
+    # Seconds added to every response, plus up to `jitter` more.
+    latency: float = 0.0
+    jitter: float = 0.0
+    # Total hits of any search, and padding added to each document.
+    total_hits: int = 1_000
+    doc_bytes: int = 512
+    # Size of listings (catalogs, namespaces, tables, series) and exports.
+    listing_size: int = 100
+    export_bytes: int = 64 * 1024
+    # Fraction of requests answered with `error_status` (and Retry-After: 0).
+    error_rate: float = 0.0
+    error_status: int = 503
+    seed: int = 0
+
+
+_COUNTRIES = ("France", "Germany", "Kenya", "Brazil", "Japan", "Canada")
+_CATALOG_TYPES = ("Open data portal", "Geoportal", "Scientific data repository")
+
+
+def _int_param(request: httpx.Request, names: tuple[str, ...], default: int) -> int:
+    for name in names:
+        value = request.url.params.get(name)
+        if value not in (None, ""):
+            try:
+                return max(0, int(value))
+            except ValueError:
+                break
+    return default
+
+
+class FakeAPI:
+    """Synthetic API responder; counts served requests per route."""
+
+    def __init__(self, config: Optional[FakeAPIConfig] = None) -> None:
+        self.config = config or FakeAPIConfig()
+        self.requests: Counter[str] = Counter()
+        self._rng = random.Random(self.config.seed)
+        self._lock = threading.Lock()
+        # (route name, path suffix pattern, responder); first match wins.
+        routes: list[tuple[str, str, Callable[..., httpx.Response]]] = [
+            ("health", r"/health(z|check)?$", self._health),
+            ("search_query", r"/search/[^/]+/(query|query_dsl)$", self._search),
+            ("search_similar", r"/search/[^/]+/similar$", self._search),
+            ("search_facets", r"/list_facets$", self._facets),
+            ("search_facet", r"/get_facet$", self._facet_values),
+            ("search_entry", r"/search/[^/]+/entry/(?P<id>[^/]+)$", self._entry),
+            ("raw_entry", r"/raw/(?:[^/]+/)*entry/(?P<id>[^/]+)$", self._raw_entry),
+            ("catalogs", r"/catalogs?$", self._catalogs),
+            ("catalog", r"/catalogs?/(?P<id>[^/]+)$", self._catalog),
+            ("stats_export", r"/ns/(?P<ns>[^/]+)/ts/(?P<id>[^/]+)/export(/[^/]+)?$", self._export),
+            ("stats_export_formats", r"/export_formats$", self._export_formats),
+            ("stats_listing", r"/ns/(?P<ns>[^/]+)/(?P<kind>tables|indicators|ts)$", self._listing),
+            (
+                "stats_object",
+                r"/ns/(?P<ns>[^/]+)/(?P<kind>tables|indicators|ts)/(?P<id>[^/]+)$",
+                self._object,
+            ),
+            ("stats_namespaces", r"/ns$", self._namespaces),
+            ("stats_namespace", r"/ns/(?P<ns>[^/]+)$", self._namespace),
+        ]
+        self._routes = [(name, re.compile(pattern), fn) for name, pattern, fn in routes]
+
+    # Transports
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        """Answer a request without the configured latency."""
+        path = request.url.path.rstrip("/")
+        for name, pattern, responder in self._routes:
+            match = pattern.search(path)
+            if match is None:
+                continue
+            with self._lock:
+                self.requests[name] += 1
+                failed = self.config.error_rate > 0 and self._rng.random() < self.config.error_rate
+            if failed:
+                return httpx.Response(
+                    self.config.error_status,
+                    json={"detail": "injected error"},
+                    headers={"Retry-After": "0"},
+                )
+            return responder(request, **match.groupdict())
+        with self._lock:
+            self.requests["not_found"] += 1
+        return httpx.Response(404, json={"detail": f"No fake route for {path}"})
+
+    def delay(self) -> float:
+        if not self.config.jitter:
+            return self.config.latency
+        with self._lock:
+            return self.config.latency + self._rng.uniform(0, self.config.jitter)
+
+    def transport(self) -> httpx.MockTransport:
+        def _handler(request: httpx.Request) -> httpx.Response:
+            seconds = self.delay()
+            if seconds > 0:
+                time.sleep(seconds)
+            return self.handle(request)
+
+        return httpx.MockTransport(_handler)
+
+    def async_transport(self) -> httpx.MockTransport:
+        async def _handler(request: httpx.Request) -> httpx.Response:
+            seconds = self.delay()
+            if seconds > 0:
+                await asyncio.sleep(seconds)
+            return self.handle(request)
+
+        return httpx.MockTransport(_handler)
+
+    # Synthetic data
+
+    def document(self, n: int) -> dict[str, Any]:
+        pad = "x" * self.config.doc_bytes
+        return {
+            "id": f"ds-{n:07d}",
+            "dataset": {"title": f"Dataset {n}", "description": f"Synthetic dataset {n}. {pad}"},
+            "source": {
+                "uid": f"cdi{n % 97:08d}",
+                "name": f"Portal {n % 97}",
+                "catalog_type": _CATALOG_TYPES[n % len(_CATALOG_TYPES)],
+                "countries": [{"name": _COUNTRIES[n % len(_COUNTRIES)]}],
+            },
+        }
+
+    def _hit(self, n: int) -> dict[str, Any]:
+        return {"_id": f"ds-{n:07d}", "_source": self.document(n)}
+
+    def _page(self, request: httpx.Request, total: int) -> tuple[int, int]:
+        offset = _int_param(request, ("offset", "start", "from"), 0)
+        limit = _int_param(request, ("limit", "size"), 10)
+        return offset, max(0, min(limit, total - offset))
+
+    # Routes
+
+    def _health(self, request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={"status": "ok"})
+
+    def _search(self, request: httpx.Request) -> httpx.Response:
+        total = self.config.total_hits
+        offset, count = self._page(request, total)
+        hits = [self._hit(n) for n in range(offset, offset + count)]
+        share = total // len(_CATALOG_TYPES)
+        aggregations = {
+            "source.catalog_type": {
+                "buckets": [{"key": t, "doc_count": share} for t in _CATALOG_TYPES]
+            }
+        }
+        return httpx.Response(
+            200,
+            json={
+                "hits": {"total": {"value": total, "relation": "eq"}, "hits": hits},
+                "aggregations": aggregations,
+            },
+        )
+
+    def _facets(self, request: httpx.Request) -> httpx.Response:
+        return httpx.Response(
+            200,
+            json=[{"key": "source.catalog_type"}, {"key": "source.countries.name"}],
+        )
+
+    def _facet_values(self, request: httpx.Request) -> httpx.Response:
+        values = _COUNTRIES if "countr" in request.url.params.get("key", "") else _CATALOG_TYPES
+        return httpx.Response(200, json=[{"key": v, "doc_count": 1} for v in values])
+
+    def _entry(self, request: httpx.Request, id: str) -> httpx.Response:
+        digits = re.sub(r"\D", "", id)
+        return httpx.Response(200, json={"_id": id, "_source": self.document(int(digits or 0))})
+
+    def _raw_entry(self, request: httpx.Request, id: str) -> httpx.Response:
+        return httpx.Response(200, json={"id": id, "raw": {"pad": "x" * self.config.doc_bytes}})
+
+    def _catalogs(self, request: httpx.Request) -> httpx.Response:
+        total = self.config.listing_size
+        offset, count = self._page(request, total)
+        numbers = range(offset, offset + count)
+        items = [{"id": f"cdi{n:08d}", "name": f"Portal {n}"} for n in numbers]
+        return httpx.Response(200, json={"total": total, "items": items})
+
+    def _catalog(self, request: httpx.Request, id: str) -> httpx.Response:
+        return httpx.Response(200, json={"id": id, "name": f"Portal {id}"})
+
+    def _namespaces(self, request: httpx.Request) -> httpx.Response:
+        total = self.config.listing_size
+        offset, count = self._page(request, total)
+        numbers = range(offset, offset + count)
+        items = [{"ns_id": f"ns{n}", "name": f"Namespace {n}"} for n in numbers]
+        return httpx.Response(200, json={"total": total, "items": items})
+
+    def _namespace(self, request: httpx.Request, ns: str) -> httpx.Response:
+        return httpx.Response(200, json={"ns_id": ns, "name": f"Namespace {ns}"})
+
+    def _listing(self, request: httpx.Request, ns: str, kind: str) -> httpx.Response:
+        total = self.config.listing_size
+        offset, count = self._page(request, total)
+        key = {"tables": "table_id", "indicators": "ind_id", "ts": "ts_id"}[kind]
+        numbers = range(offset, offset + count)
+        items = [{key: f"{kind.upper()}_{n:05d}", "ns_id": ns} for n in numbers]
+        return httpx.Response(200, json={"total": total, "items": items})
+
+    def _object(self, request: httpx.Request, ns: str, kind: str, id: str) -> httpx.Response:
+        return httpx.Response(200, json={"id": id, "ns_id": ns, "kind": kind})
+
+    def _export_formats(self, request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json=["csv", "json"])
+
+    def export_body(self, ts_id: str) -> bytes:
+        line = f"{ts_id},2020-01-01,123.45\n".encode()
+        body = b"series,date,value\n" + line * (self.config.export_bytes // len(line) + 1)
+        return body[: max(self.config.export_bytes, 1)]
+
+    def _export(self, request: httpx.Request, ns: str, id: str) -> httpx.Response:
+        body = self.export_body(id)
+        headers = {"Content-Type": "text/csv", "Accept-Ranges": "bytes"}
+        match = re.fullmatch(r"bytes=(\d+)-(\d*)", request.headers.get("Range", ""))
+        if match:
+            start = int(match.group(1))
+            end = int(match.group(2)) if match.group(2) else len(body) - 1
+            if start >= len(body):
+                return httpx.Response(416, headers={"Content-Range": f"bytes */{len(body)}"})
+            end = min(end, len(body) - 1)
+            headers["Content-Range"] = f"bytes {start}-{end}/{len(body)}"
+            return httpx.Response(206, content=body[start : end + 1], headers=headers)
+        return httpx.Response(200, content=body, headers=headers)
@@ -0,0 +1,352 @@
+"""
+Persistent HTTP response cache for the Dateno CLI.
+
+Responses of slow-changing metadata endpoints (facets, catalogs, statsdb
+namespaces/tables/indicators/timeseries) are stored in a local SQLite file
+and served from there until their TTL expires. The cache is installed as an
+httpx transport wrapper, so the SDK is unaware of it.
+
+Entries are keyed on method + sanitized URL (API key masked) + request body
++ a digest of the API key (query parameter or Authorization header), so keys
+with different entitlements never share responses.
+The store has a byte budget; when it is exceeded, least recently used entries
+are evicted.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+import httpx
+
+
+DEFAULT_CACHE_MAX_BYTES = 100 * 1024 * 1024
+
+# First matching path pattern wins; a TTL of 0 disables caching.
+DEFAULT_CACHE_TTLS: list[tuple[str, int]] = [
+    (r"/export", 0),
+    (r"/list_facets$", 24 * 3600),
+    (r"/get_facet$", 3600),
+    (r"/catalogs?(/|$)", 3600),
+    (r"/statsdb/", 3600),
+]
+
+_SKIP_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection"}
+
+_cache_logger = logging.getLogger("dateno_cmd.http")
+
+
+def default_cache_path() -> Path:
+    base = os.environ.get("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+    return Path(base) / "dateno_cmd" / "http_cache.sqlite"
+
+
+def _sanitized_url(url: httpx.URL) -> str:
+    params = [
+        (k, "***" if k.lower() == "apikey" else v) for k, v in url.params.multi_items()
+    ]
+    return str(url.copy_with(params=params))
+
+
+def _credential_digest(request: httpx.Request) -> bytes:
+    apikeys = [v for k, v in request.url.params.multi_items() if k.lower() == "apikey"]
+    credential = "\n".join([*apikeys, request.headers.get("authorization", "")])
+    return hashlib.sha256(credential.encode("utf-8")).digest()
+
+
+def cache_key(request: httpx.Request) -> str:
+    h = hashlib.sha256()
+    h.update(request.method.upper().encode("utf-8"))
+    h.update(b"\n")
+    h.update(_sanitized_url(request.url).encode("utf-8"))
+    h.update(b"\n")
+    h.update(_credential_digest(request))
+    h.update(b"\n")
+    h.update(request.content or b"")
+    return h.hexdigest()
+
+
+def ttl_for(request: httpx.Request, rules: list[tuple[str, int]]) -> int:
+    if request.method.upper() not in ("GET", "POST"):
+        return 0
+    path = request.url.path
+    for pattern, ttl in rules:
+        if re.search(pattern, path):
+            return ttl
+    return 0
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    status_code: int
+    headers: list[tuple[str, str]]
+    content: bytes
+
+
+class ResponseCache:
+    """
+    SQLite-backed response store with TTL and size-bounded LRU eviction.
+
+    The database is opened lazily on first use and shared between threads.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str | Path] = None,
+        max_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+    ) -> None:
+        self.path = Path(path).expanduser() if path else default_cache_path()
+        self.max_bytes = max_bytes
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT PRIMARY KEY,"
+                " url TEXT NOT NULL,"
+                " status INTEGER NOT NULL,"
+                " headers TEXT NOT NULL,"
+                " body BLOB NOT NULL,"
+                " size INTEGER NOT NULL,"
+                " created_at REAL NOT NULL,"
+                " expires_at REAL NOT NULL,"
+                " accessed_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS responses_lru ON responses (accessed_at)")
+            self._conn = conn
+        return self._conn
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        now = time.time()
+        with self._lock:
+            db = self._db()
+            row = db.execute(
+                "SELECT status, headers, body FROM responses WHERE key = ? AND expires_at > ?",
+                (key, now),
+            ).fetchone()
+            if row is None:
+                return None
+            db.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            db.commit()
+        headers = [tuple(h) for h in json.loads(row[1])]
+        return CachedResponse(status_code=row[0], headers=headers, content=bytes(row[2]))
+
+    def put(self, key: str, url: str, response: CachedResponse, ttl: int) -> None:
+        size = len(response.content)
+        if ttl <= 0 or size > self.max_bytes:
+            return
+        now = time.time()
+        with self._lock:
+            db = self._db()
+            db.execute(
+                "INSERT OR REPLACE INTO responses"
+                " (key, url, status, headers, body, size, created_at, expires_at, accessed_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    url,
+                    response.status_code,
+                    json.dumps(response.headers),
+                    sqlite3.Binary(response.content),
+                    size,
+                    now,
+                    now + ttl,
+                    now,
+                ),
+            )
+            self._evict(db)
+            db.commit()
+
+    def _evict(self, db: sqlite3.Connection) -> int:
+        total = db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        removed = 0
+        if total <= self.max_bytes:
+            return removed
+        for key, size in db.execute(
+            "SELECT key, size FROM responses ORDER BY accessed_at ASC"
+        ).fetchall():
+            if total <= self.max_bytes:
+                break
+            db.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+            removed += 1
+        return removed
+
+    def stats(self) -> dict[str, object]:
+        now = time.time()
+        with self._lock:
+            db = self._db()
+            entries, size, expired = db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0),"
+                " COALESCE(SUM(CASE WHEN expires_at <= ? THEN 1 ELSE 0 END), 0)"
+                " FROM responses",
+                (now,),
+            ).fetchone()
+        return {
+            "path": str(self.path),
+            "entries": entries,
+            "expired": expired,
+            "size_bytes": size,
+            "max_bytes": self.max_bytes,
+        }
+
+    def prune(self) -> int:
+        """Remove expired entries and enforce the byte budget."""
+        with self._lock:
+            db = self._db()
+            removed = db.execute(
+                "DELETE FROM responses WHERE expires_at <= ?", (time.time(),)
+            ).rowcount
+            removed += self._evict(db)
+            db.commit()
+        return removed
+
+    def clear(self) -> int:
+        with self._lock:
+            db = self._db()
+            removed = db.execute("DELETE FROM responses").rowcount
+            db.commit()
+            db.execute("VACUUM")
+        return removed
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+def _to_httpx(cached: CachedResponse, request: httpx.Request) -> httpx.Response:
+    return httpx.Response(
+        cached.status_code,
+        headers=cached.headers + [("x-dateno-cache", "hit")],
+        content=cached.content,
+        request=request,
+    )
+
+
+def _from_httpx(response: httpx.Response) -> CachedResponse:
+    headers = [
+        (k, v) for k, v in response.headers.multi_items() if k.lower() not in _SKIP_HEADERS
+    ]
+    return CachedResponse(
+        status_code=response.status_code, headers=headers, content=response.content
+    )
+
+
+class _CachePolicy:
+    def __init__(
+        self,
+        cache: ResponseCache,
+        refresh: bool,
+        rules: Optional[list[tuple[str, int]]],
+    ) -> None:
+        self.cache = cache
+        self.refresh = refresh
+        self.rules = rules if rules is not None else DEFAULT_CACHE_TTLS
+
+    def lookup(self, request: httpx.Request) -> tuple[int, str, Optional[httpx.Response]]:
+        ttl = ttl_for(request, self.rules)
+        if ttl <= 0:
+            return 0, "", None
+        key = cache_key(request)
+        if not self.refresh:
+            cached = self.cache.get(key)
+            if cached is not None:
+                _cache_logger.debug("http_cache hit url=%s", _sanitized_url(request.url))
+                return ttl, key, _to_httpx(cached, request)
+        _cache_logger.debug("http_cache miss url=%s", _sanitized_url(request.url))
+        return ttl, key, None
+
+    def store(self, request: httpx.Request, response: httpx.Response, ttl: int, key: str) -> None:
+        if response.status_code == 200:
+            self.cache.put(key, _sanitized_url(request.url), _from_httpx(response), ttl)
+
+
+class CachingTransport(httpx.BaseTransport):
+    """Sync httpx transport that serves cacheable requests from ResponseCache."""
+
+    def __init__(
+        self,
+        inner: httpx.BaseTransport,
+        cache: ResponseCache,
+        refresh: bool = False,
+        rules: Optional[list[tuple[str, int]]] = None,
+    ) -> None:
+        self._inner = inner
+        self._policy = _CachePolicy(cache, refresh, rules)
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        ttl, key, hit = self._policy.lookup(request)
+        if hit is not None:
+            return hit
+        response = self._inner.handle_request(request)
+        if ttl <= 0:
+            return response
+        try:
+            response.read()
+        finally:
+            response.close()
+        self._policy.store(request, response, ttl, key)
+        return httpx.Response(
+            response.status_code,
+            headers=_from_httpx(response).headers,
+            content=response.content,
+            request=request,
+            extensions=response.extensions,
+        )
+
+    def close(self) -> None:
+        self._inner.close()
+
+
+class AsyncCachingTransport(httpx.AsyncBaseTransport):
+    """Async counterpart of CachingTransport."""
+
+    def __init__(
+        self,
+        inner: httpx.AsyncBaseTransport,
+        cache: ResponseCache,
+        refresh: bool = False,
+        rules: Optional[list[tuple[str, int]]] = None,
+    ) -> None:
+        self._inner = inner
+        self._policy = _CachePolicy(cache, refresh, rules)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        ttl, key, hit = self._policy.lookup(request)
+        if hit is not None:
+            return hit
+        response = await self._inner.handle_async_request(request)
+        if ttl <= 0:
+            return response
+        try:
+            await response.aread()
+        finally:
+            await response.aclose()
+        self._policy.store(request, response, ttl, key)
+        return httpx.Response(
+            response.status_code,
+            headers=_from_httpx(response).headers,
+            content=response.content,
+            request=request,
+            extensions=response.extensions,
+        )
+
+    async def aclose(self) -> None:
+        await self._inner.aclose()
@@ -0,0 +1,68 @@
+"""
+Per-response events from the SDK's HTTP clients.
+
+The clients' event hooks (see sdk_factory) publish one ResponseEvent per
+response received from the network or the cache. Listeners such as the
+adaptive concurrency controller subscribe for the duration of a command;
+with no listeners publishing costs one list check.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass(frozen=True)
+class ResponseEvent:
+    method: str
+    url: str
+    status_code: int
+    # Seconds from sending the request to receiving the response headers.
+    elapsed: Optional[float]
+    bytes: Optional[int]
+    # Earlier attempts of the same request (SDK retries re-send it).
+    retries: int = 0
+    # "network", or "cache"/"replay" for answers from the response cache or
+    # a cassette, which say nothing about API latency.
+    source: str = "network"
+
+
+Listener = Callable[[ResponseEvent], None]
+
+_listeners: list[Listener] = []
+_lock = threading.Lock()
+
+
+def add_listener(listener: Listener) -> None:
+    with _lock:
+        _listeners.append(listener)
+
+
+def remove_listener(listener: Listener) -> None:
+    with _lock:
+        if listener in _listeners:
+            _listeners.remove(listener)
+
+
+def has_listeners() -> bool:
+    return bool(_listeners)
+
+
+@contextmanager
+def listening(listener: Listener) -> Iterator[None]:
+    add_listener(listener)
+    try:
+        yield
+    finally:
+        remove_listener(listener)
+
+
+def publish(event: ResponseEvent) -> None:
+    with _lock:
+        listeners = list(_listeners)
+    for listener in listeners:
+        listener(event)
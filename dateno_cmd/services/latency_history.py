@@ -0,0 +1,279 @@
+"""
+Opt-in history of API request latencies (`DATENO_LATENCY_HISTORY=true`).
+
+While enabled, every response the SDK's HTTP clients receive from the
+network (see http_events; response cache hits and cassette replays are
+skipped) is appended to a small SQLite store: time, method, endpoint
+template, status, elapsed milliseconds, body bytes and the number of retries
+before it. `dateno perf report` summarizes the store into percentiles and
+error rates per endpoint and time window, to spot API regressions and to
+choose timeouts and concurrency levels.
+
+Endpoint templates replace the id-like parts of a URL path with `{id}` and
+drop the query string, so that `/statsdb/0.1/ns/ilostat/ts/X.ABW` and its
+siblings are grouped together.
+"""
+
+from __future__ import annotations
+
+import atexit
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Optional
+from urllib.parse import urlsplit
+
+from dateno_cmd.services.http_events import ResponseEvent, add_listener
+
+
+# Records are written in batches; a batch is flushed at this size, when it
+# is older than FLUSH_SECONDS, and at process exit.
+FLUSH_RECORDS = 200
+FLUSH_SECONDS = 5.0
+
+# Path segments whose next segment is an object id.
+_COLLECTION_SEGMENTS = frozenset(
+    {
+        "catalog",
+        "catalogs",
+        "dataset",
+        "datasets",
+        "entries",
+        "entry",
+        "indicator",
+        "indicators",
+        "namespace",
+        "namespaces",
+        "ns",
+        "raw",
+        "table",
+        "tables",
+        "timeseries",
+        "ts",
+    }
+)
+_VERSION_RE = re.compile(r"^v?\d+(\.\d+)*$")
+_WORD_RE = re.compile(r"^[a-z][a-z_]*$")
+
+
+def default_latency_history_path() -> Path:
+    base = os.environ.get("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+    return Path(base) / "dateno_cmd" / "latency_history.sqlite"
+
+
+def endpoint_template(url: str) -> str:
+    """URL path with ids replaced by `{id}`, e.g. `/statsdb/0.1/ns/{id}`."""
+    parts = [p for p in urlsplit(url).path.split("/") if p]
+    template = []
+    for i, part in enumerate(parts):
+        after_collection = i > 0 and parts[i - 1] in _COLLECTION_SEGMENTS
+        if _VERSION_RE.match(part) or (_WORD_RE.match(part) and not after_collection):
+            template.append(part)
+        else:
+            template.append("{id}")
+    return "/" + "/".join(template)
+
+
+def parse_duration(value: str) -> float:
+    """Seconds in a duration like `90s`, `15m`, `6h`, `7d` or `2w`."""
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([smhdw]?)\s*", value or "")
+    if not match:
+        raise ValueError(f"Invalid duration: {value!r} (use e.g. 30m, 6h, 7d)")
+    number, unit = float(match.group(1)), match.group(2) or "s"
+    return number * {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 7 * 86400}[unit]
+
+
+def percentile(sorted_values: list[float], q: float) -> Optional[float]:
+    """Nearest-rank percentile of an ascending list (None if empty)."""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(q / 100.0 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+@dataclass(frozen=True)
+class LatencyRecord:
+    at: float
+    method: str
+    endpoint: str
+    status: int
+    elapsed_ms: Optional[int]
+    bytes: Optional[int]
+    retries: int = 0
+
+
+class LatencyHistory:
+    """SQLite store of request latency records; safe to share between threads."""
+
+    def __init__(self, path: Optional[str | Path] = None) -> None:
+        self.path = Path(path).expanduser() if path else default_latency_history_path()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS requests ("
+                " at REAL NOT NULL,"
+                " method TEXT NOT NULL,"
+                " endpoint TEXT NOT NULL,"
+                " status INTEGER NOT NULL,"
+                " elapsed_ms INTEGER,"
+                " bytes INTEGER,"
+                " retries INTEGER NOT NULL DEFAULT 0)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS requests_at ON requests (at)")
+            self._conn = conn
+        return self._conn
+
+    def add(self, records: Iterable[LatencyRecord]) -> int:
+        rows = [
+            (r.at, r.method, r.endpoint, r.status, r.elapsed_ms, r.bytes, r.retries)
+            for r in records
+        ]
+        if not rows:
+            return 0
+        with self._lock:
+            db = self._db()
+            with db:
+                db.executemany("INSERT INTO requests VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+        return len(rows)
+
+    def records(
+        self,
+        since: Optional[float] = None,
+        endpoint: Optional[str] = None,
+    ) -> list[LatencyRecord]:
+        """Records at or after `since`, optionally for endpoints containing `endpoint`."""
+        sql = "SELECT at, method, endpoint, status, elapsed_ms, bytes, retries FROM requests"
+        where, params = [], []
+        if since is not None:
+            where.append("at >= ?")
+            params.append(since)
+        if endpoint:
+            where.append("instr(endpoint, ?) > 0")
+            params.append(endpoint)
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        with self._lock:
+            rows = self._db().execute(sql + " ORDER BY at", params).fetchall()
+        return [LatencyRecord(*row) for row in rows]
+
+    def prune(self, older_than: float) -> int:
+        """Delete records older than `older_than` seconds; returns the count."""
+        with self._lock:
+            db = self._db()
+            with db:
+                cur = db.execute("DELETE FROM requests WHERE at < ?", (time.time() - older_than,))
+        return cur.rowcount
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+def summarize(
+    records: Iterable[LatencyRecord],
+    window: Optional[float] = None,
+) -> list[dict[str, Any]]:
+    """
+    Per (endpoint, window) rows with request and error counts, error rate,
+    p50/p95/p99 latency in ms, mean bytes and retries. Windows start at
+    multiples of `window` seconds (UTC); without one all records are a single
+    window. A response with status >= 400 counts as an error.
+    """
+    groups: dict[tuple[str, str, float], list[LatencyRecord]] = {}
+    for record in records:
+        start = math.floor(record.at / window) * window if window else 0.0
+        groups.setdefault((record.method, record.endpoint, start), []).append(record)
+
+    rows = []
+    for (method, endpoint, start), group in sorted(
+        groups.items(), key=lambda item: (item[0][1], item[0][0], item[0][2])
+    ):
+        elapsed = sorted(r.elapsed_ms for r in group if r.elapsed_ms is not None)
+        sizes = [r.bytes for r in group if r.bytes is not None]
+        errors = sum(1 for r in group if r.status >= 400)
+        row: dict[str, Any] = {"endpoint": f"{method} {endpoint}"}
+        if window:
+            row["window"] = time.strftime("%Y-%m-%d %H:%M", time.gmtime(start))
+        row.update(
+            {
+                "requests": len(group),
+                "errors": errors,
+                "error_rate": round(errors / len(group), 4),
+                "p50_ms": percentile(elapsed, 50),
+                "p95_ms": percentile(elapsed, 95),
+                "p99_ms": percentile(elapsed, 99),
+                "mean_bytes": round(sum(sizes) / len(sizes)) if sizes else None,
+                "retries": sum(r.retries for r in group),
+            }
+        )
+        rows.append(row)
+    return rows
+
+
+class LatencyRecorder:
+    """http_events listener buffering records into a LatencyHistory."""
+
+    def __init__(self, history: LatencyHistory) -> None:
+        self.history = history
+        self._pending: list[LatencyRecord] = []
+        self._oldest: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def __call__(self, event: ResponseEvent) -> None:
+        if event.source != "network":
+            return
+        now = time.time()
+        record = LatencyRecord(
+            at=now,
+            method=event.method,
+            endpoint=endpoint_template(event.url),
+            status=event.status_code,
+            elapsed_ms=round(event.elapsed * 1000) if event.elapsed is not None else None,
+            bytes=event.bytes,
+            retries=event.retries,
+        )
+        with self._lock:
+            self._pending.append(record)
+            if self._oldest is None:
+                self._oldest = now
+            due = len(self._pending) >= FLUSH_RECORDS or now - self._oldest >= FLUSH_SECONDS
+        if due:
+            self.flush()
+
+    def flush(self) -> None:
+        with self._lock:
+            pending, self._pending, self._oldest = self._pending, [], None
+        try:
+            self.history.add(pending)
+        except sqlite3.Error:
+            # The history is diagnostic; never fail a command over it.
+            pass
+
+
+_recorder: Optional[LatencyRecorder] = None
+_recorder_lock = threading.Lock()
+
+
+def install_recorder(path: Optional[str | Path] = None) -> LatencyRecorder:
+    """Start recording this process's responses (once; later calls are no-ops)."""
+    global _recorder
+    with _recorder_lock:
+        if _recorder is None:
+            _recorder = LatencyRecorder(LatencyHistory(path))
+            add_listener(_recorder)
+            atexit.register(_recorder.flush)
+        return _recorder
@@ -0,0 +1,95 @@
+"""
+Export manifest for `stats export-all`.
+
+A small SQLite file next to the exported series records, per series id,
+whether it was completed, failed or skipped, so a rerun only fetches what is
+missing (failed series are retried).
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+
+STATUS_COMPLETED = "completed"
+STATUS_FAILED = "failed"
+STATUS_SKIPPED = "skipped"
+
+MANIFEST_FILENAME = "manifest.sqlite"
+
+
+class ExportManifest:
+    """Thread-safe record of per-series export outcomes."""
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path).expanduser()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS series ("
+                " ts_id TEXT PRIMARY KEY,"
+                " status TEXT NOT NULL,"
+                " path TEXT,"
+                " size INTEGER,"
+                " error TEXT,"
+                " updated_at REAL NOT NULL)"
+            )
+            self._conn = conn
+        return self._conn
+
+    def finished_ids(self) -> set[str]:
+        """Ids that need no further work (completed or skipped)."""
+        with self._lock:
+            rows = self._db().execute(
+                "SELECT ts_id FROM series WHERE status IN (?, ?)",
+                (STATUS_COMPLETED, STATUS_SKIPPED),
+            ).fetchall()
+        return {r[0] for r in rows}
+
+    def record(
+        self,
+        ts_id: str,
+        status: str,
+        path: Optional[str] = None,
+        size: Optional[int] = None,
+        error: Optional[str] = None,
+    ) -> None:
+        with self._lock:
+            db = self._db()
+            db.execute(
+                "INSERT OR REPLACE INTO series (ts_id, status, path, size, error, updated_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (ts_id, status, path, size, error, time.time()),
+            )
+            db.commit()
+
+    def counts(self) -> dict[str, int]:
+        with self._lock:
+            rows = self._db().execute(
+                "SELECT status, COUNT(*) FROM series GROUP BY status"
+            ).fetchall()
+        return {status: count for status, count in rows}
+
+    def failures(self) -> dict[str, str]:
+        with self._lock:
+            rows = self._db().execute(
+                "SELECT ts_id, error FROM series WHERE status = ? ORDER BY ts_id",
+                (STATUS_FAILED,),
+            ).fetchall()
+        return {ts_id: error or "" for ts_id, error in rows}
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
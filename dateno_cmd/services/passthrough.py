@@ -0,0 +1,100 @@
+"""
+Raw response passthrough for the Dateno CLI.
+
+When a capture is active, the transport reads the body of a successful
+response and aborts the SDK call with ResponseCaptured, so no Pydantic models
+are built and nothing is re-encoded. Error responses go through the SDK as
+usual and are reported by the normal error path.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import logging
+from collections.abc import Callable
+from typing import Any
+
+import httpx
+
+
+_capture_active: contextvars.ContextVar[bool] = contextvars.ContextVar(
+    "dateno_cmd_capture_active", default=False
+)
+
+_passthrough_logger = logging.getLogger("dateno_cmd.http")
+
+
+class ResponseCaptured(Exception):
+    """Carries the raw body of a captured response out of the SDK call."""
+
+    def __init__(self, content: bytes, content_type: str | None = None) -> None:
+        super().__init__("response captured")
+        self.content = content
+        self.content_type = content_type
+
+
+def _should_capture(response: httpx.Response) -> bool:
+    return _capture_active.get() and 200 <= response.status_code < 300
+
+
+def _captured(response: httpx.Response) -> ResponseCaptured:
+    _passthrough_logger.debug(
+        "http_passthrough status=%s bytes=%s", response.status_code, len(response.content)
+    )
+    return ResponseCaptured(response.content, response.headers.get("content-type"))
+
+
+class PassthroughTransport(httpx.BaseTransport):
+    """Sync transport wrapper that hands successful bodies to capture_body()."""
+
+    def __init__(self, inner: httpx.BaseTransport) -> None:
+        self._inner = inner
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        response = self._inner.handle_request(request)
+        if not _should_capture(response):
+            return response
+        try:
+            response.read()
+        finally:
+            response.close()
+        raise _captured(response)
+
+    def close(self) -> None:
+        self._inner.close()
+
+
+class AsyncPassthroughTransport(httpx.AsyncBaseTransport):
+    """Async counterpart of PassthroughTransport."""
+
+    def __init__(self, inner: httpx.AsyncBaseTransport) -> None:
+        self._inner = inner
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        response = await self._inner.handle_async_request(request)
+        if not _should_capture(response):
+            return response
+        try:
+            await response.aread()
+        finally:
+            await response.aclose()
+        raise _captured(response)
+
+    async def aclose(self) -> None:
+        await self._inner.aclose()
+
+
+def capture_body(call: Callable[[], Any]) -> Any:
+    """
+    Run an SDK call with capture enabled.
+
+    Returns the raw response bytes, or the call's own result when the
+    transport is not installed (e.g. a custom SDK client).
+    """
+    token = _capture_active.set(True)
+    try:
+        return call()
+    except ResponseCaptured as captured:
+        return captured.content
+    finally:
+        _capture_active.reset(token)
@@ -0,0 +1,283 @@
+"""
+Client-side rate limiting for the Dateno CLI.
+
+One RateLimiter per process paces every request of the sync and async
+clients (all worker threads, bulk tasks and, in `dateno serve`, every
+forwarded command): a token bucket bounds requests per second and a slot
+counter bounds requests in flight. The limiter adapts to the server:
+
+- 429 (and 503 with Retry-After) pauses all requests for Retry-After and
+  halves the rate; without a configured rate, limiting starts at half the
+  rate observed in the last second.
+- X-RateLimit-Remaining / X-RateLimit-Reset spread the remaining quota over
+  the rest of the window, and pause when it is used up.
+- While responses are good the rate grows back towards --rps.
+
+SDK retries go through the same transport, so they wait for the bucket
+instead of adding to a burst.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import collections
+import email.utils
+import logging
+import threading
+import time
+from collections.abc import Callable
+from typing import Optional
+
+import httpx
+
+
+MIN_RATE = 0.5  # requests per second
+RECOVERY_RPS_PER_SECOND = 1.0
+ACQUIRE_POLL_SECONDS = 0.01
+# X-RateLimit-Reset values above this are epoch timestamps, not deltas.
+_EPOCH_THRESHOLD = 10 * 365 * 24 * 3600
+
+_rate_logger = logging.getLogger("dateno_cmd.http")
+
+_limiters: dict[tuple[Optional[float], Optional[int]], "RateLimiter"] = {}
+_limiters_lock = threading.Lock()
+
+
+def parse_retry_after(value: Optional[str], now: Optional[float] = None) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta seconds or HTTP date)."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when is None:
+        return None
+    return max(0.0, when.timestamp() - (time.time() if now is None else now))
+
+
+def _header_number(headers: httpx.Headers, *names: str) -> Optional[float]:
+    for name in names:
+        value = headers.get(name)
+        if value is None:
+            continue
+        try:
+            return float(value.split(",")[0].strip())
+        except ValueError:
+            continue
+    return None
+
+
+class RateLimiter:
+    """Thread-safe adaptive token bucket with an in-flight request cap."""
+
+    def __init__(self, rps: Optional[float] = None, max_concurrency: Optional[int] = None) -> None:
+        self.ceiling = rps if rps and rps > 0 else None
+        self.max_concurrency = max_concurrency if max_concurrency and max_concurrency > 0 else None
+        self.rate = self.ceiling
+        self._lock = threading.Lock()
+        self._next_slot = 0.0  # monotonic time the next request may start
+        self._blocked_until = 0.0
+        self._in_flight = 0
+        self._last_adjust = time.monotonic()
+        self._last_cut = float("-inf")
+        self._recent: collections.deque[float] = collections.deque(maxlen=1024)
+
+    # -- pacing -----------------------------------------------------------
+
+    def _reserve(self) -> float:
+        """Reserve the next start time; returns the seconds to wait for it."""
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._blocked_until)
+            if self.rate is not None:
+                start = max(start, self._next_slot)
+                self._next_slot = start + 1.0 / self.rate
+            self._recent.append(start)
+            return start - now
+
+    def _try_enter(self) -> bool:
+        with self._lock:
+            if self.max_concurrency is not None and self._in_flight >= self.max_concurrency:
+                return False
+            self._in_flight += 1
+            return True
+
+    def release(self) -> None:
+        with self._lock:
+            self._in_flight = max(0, self._in_flight - 1)
+
+    def acquire(self) -> None:
+        while not self._try_enter():
+            time.sleep(ACQUIRE_POLL_SECONDS)
+        delay = self._reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self) -> None:
+        while not self._try_enter():
+            await asyncio.sleep(ACQUIRE_POLL_SECONDS)
+        delay = self._reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    # -- adaptation -------------------------------------------------------
+
+    def _observed_rate(self, now: float) -> float:
+        return float(sum(1 for t in self._recent if now - 1.0 <= t <= now))
+
+    def observe(self, status_code: int, headers: httpx.Headers) -> None:
+        """Adapt pacing to a response's status and rate-limit headers."""
+        with self._lock:
+            now = time.monotonic()
+            retry_after = parse_retry_after(headers.get("retry-after"))
+            if status_code == 429 or (status_code == 503 and retry_after is not None):
+                # A burst of 429s from requests already in flight counts once.
+                if now - self._last_cut >= 1.0:
+                    base = self.rate
+                    if base is None:
+                        base = max(self._observed_rate(now), 2 * MIN_RATE)
+                    self.rate = max(MIN_RATE, base / 2)
+                    self._last_cut = now
+                self._last_adjust = now
+                if retry_after is not None:
+                    self._blocked_until = max(self._blocked_until, now + retry_after)
+                _rate_logger.debug(
+                    "rate_limit status=%s rate=%.2f retry_after=%s",
+                    status_code,
+                    self.rate,
+                    retry_after,
+                )
+                return
+
+            remaining = _header_number(headers, "x-ratelimit-remaining", "ratelimit-remaining")
+            reset = _header_number(headers, "x-ratelimit-reset", "ratelimit-reset")
+            if reset is not None and reset > _EPOCH_THRESHOLD:
+                reset = max(0.0, reset - time.time())
+            if remaining is not None and reset is not None:
+                if remaining <= 0:
+                    self._blocked_until = max(self._blocked_until, now + reset)
+                elif reset > 0:
+                    quota_rate = max(MIN_RATE, remaining / reset)
+                    if self.rate is None or quota_rate < self.rate:
+                        self.rate = quota_rate
+                        self._last_adjust = now
+                        return
+
+            if status_code < 500 and self.rate is not None:
+                # Additive recovery towards the configured ceiling.
+                grown = self.rate + RECOVERY_RPS_PER_SECOND * (now - self._last_adjust)
+                self.rate = grown if self.ceiling is None else min(self.ceiling, grown)
+                self._last_adjust = now
+
+
+def get_rate_limiter(rps: Optional[float], max_concurrency: Optional[int]) -> RateLimiter:
+    """The process-wide limiter for a configuration (kept across SDK rebuilds)."""
+    key = (rps, max_concurrency)
+    with _limiters_lock:
+        limiter = _limiters.get(key)
+        if limiter is None:
+            limiter = _limiters[key] = RateLimiter(rps, max_concurrency)
+        return limiter
+
+
+class _ReleasingStream(httpx.SyncByteStream):
+    def __init__(self, inner: httpx.SyncByteStream, release: Callable[[], None]) -> None:
+        self._inner = inner
+        self._release = release
+
+    def __iter__(self):
+        yield from self._inner
+
+    def close(self) -> None:
+        try:
+            self._inner.close()
+        finally:
+            self._release()
+
+
+class _AsyncReleasingStream(httpx.AsyncByteStream):
+    def __init__(self, inner: httpx.AsyncByteStream, release: Callable[[], None]) -> None:
+        self._inner = inner
+        self._release = release
+
+    async def __aiter__(self):
+        async for chunk in self._inner:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._inner.aclose()
+        finally:
+            self._release()
+
+
+def _once(fn: Callable[[], None]) -> Callable[[], None]:
+    done = threading.Event()
+
+    def _call() -> None:
+        if not done.is_set():
+            done.set()
+            fn()
+
+    return _call
+
+
+class RateLimitTransport(httpx.BaseTransport):
+    """Sync transport wrapper pacing requests through a RateLimiter."""
+
+    def __init__(self, inner: httpx.BaseTransport, limiter: RateLimiter) -> None:
+        self._inner = inner
+        self._limiter = limiter
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        self._limiter.acquire()
+        release = _once(self._limiter.release)
+        try:
+            response = self._inner.handle_request(request)
+        except BaseException:
+            release()
+            raise
+        self._limiter.observe(response.status_code, response.headers)
+        # The slot is held until the body has been read (or the response closed).
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=response.headers,
+            stream=_ReleasingStream(response.stream, release),
+            extensions=response.extensions,
+        )
+
+    def close(self) -> None:
+        self._inner.close()
+
+
+class AsyncRateLimitTransport(httpx.AsyncBaseTransport):
+    """Async counterpart of RateLimitTransport."""
+
+    def __init__(self, inner: httpx.AsyncBaseTransport, limiter: RateLimiter) -> None:
+        self._inner = inner
+        self._limiter = limiter
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await self._limiter.acquire_async()
+        release = _once(self._limiter.release)
+        try:
+            response = await self._inner.handle_async_request(request)
+        except BaseException:
+            release()
+            raise
+        self._limiter.observe(response.status_code, response.headers)
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=response.headers,
+            stream=_AsyncReleasingStream(response.stream, release),
+            extensions=response.extensions,
+        )
+
+    async def aclose(self) -> None:
+        await self._inner.aclose()
@@ -0,0 +1,295 @@
+"""
+Offline full-text index of harvested search hits.
+
+`dateno mirror build` stores `_source` documents in a SQLite database with an
+FTS5 index over title, description and all other text, plus an indexed
+facet table for country, catalog type and source uid. `search query --local`
+runs against it and returns the same response shape as the API
+(`hits.total.value`, `hits.hits[]._source`, `aggregations`), so every output
+mode works unchanged.
+
+Filters use the API's `field=value` form. Facet fields are answered from
+the index; any other field is matched against the stored documents.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import sqlite3
+import threading
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any, Optional
+
+from dateno_cmd.utils.errors import UserInputError
+from dateno_cmd.utils.search import extract_doc_from_item, hit_id
+
+
+# Facet name -> document path (lists are flattened).
+FACET_FIELDS: dict[str, str] = {
+    "country": "source.countries.name",
+    "catalog_type": "source.catalog_type",
+    "source.uid": "source.uid",
+}
+
+# Filter field spellings that resolve to a facet.
+FACET_ALIASES: dict[str, str] = {
+    "country": "country",
+    "source.countries.name": "country",
+    "source.countries": "country",
+    "catalog_type": "catalog_type",
+    "source.catalog_type": "catalog_type",
+    "source.uid": "source.uid",
+}
+
+TITLE_PATHS = ("dataset.title", "title")
+DESCRIPTION_PATHS = ("dataset.description", "description")
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+_FILTER_RE = re.compile(r"^\s*([^=:]+?)\s*[=:]\s*(.+?)\s*$")
+
+
+def default_search_mirror_path() -> Path:
+    base = os.environ.get("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+    return Path(base) / "dateno_cmd" / "search_mirror.sqlite"
+
+
+def path_values(doc: Any, path: str) -> list[Any]:
+    """Values at a dotted path, descending into lists at any step."""
+    values = [doc]
+    for key in path.split("."):
+        step: list[Any] = []
+        for value in values:
+            for v in value if isinstance(value, list) else [value]:
+                if isinstance(v, dict) and v.get(key) is not None:
+                    step.append(v[key])
+        values = step
+    flat: list[Any] = []
+    for value in values:
+        flat.extend(value if isinstance(value, list) else [value])
+    return [v for v in flat if v is not None and not isinstance(v, (dict, list))]
+
+
+def _first_text(doc: Any, paths: Iterable[str]) -> str:
+    for path in paths:
+        values = path_values(doc, path)
+        if values:
+            return " ".join(str(v) for v in values)
+    return ""
+
+
+def _all_text(value: Any, out: list[str]) -> None:
+    if isinstance(value, str):
+        out.append(value)
+    elif isinstance(value, dict):
+        for v in value.values():
+            _all_text(v, out)
+    elif isinstance(value, list):
+        for v in value:
+            _all_text(v, out)
+
+
+def parse_filter(expr: str) -> tuple[str, str]:
+    match = _FILTER_RE.match(expr)
+    if match is None:
+        raise UserInputError(f"Unsupported filter for --local: {expr!r} (use field=value)")
+    field, value = match.groups()
+    return field.strip(), value.strip().strip("\"'")
+
+
+def fts_query(query: str) -> Optional[str]:
+    """All words of the query as quoted FTS5 terms; None matches everything."""
+    tokens = _TOKEN_RE.findall(query or "")
+    if not tokens:
+        return None
+    return " ".join('"' + t.replace('"', '""') + '"' for t in tokens)
+
+
+class SearchMirror:
+    """SQLite/FTS5 store of search documents."""
+
+    def __init__(self, path: Optional[str | Path] = None) -> None:
+        self.path = Path(path).expanduser() if path else default_search_mirror_path()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS docs ("
+                " rowid INTEGER PRIMARY KEY,"
+                " id TEXT NOT NULL UNIQUE,"
+                " doc TEXT NOT NULL)"
+            )
+            try:
+                conn.execute(
+                    "CREATE VIRTUAL TABLE IF NOT EXISTS docs_fts"
+                    " USING fts5(title, description, body)"
+                )
+            except sqlite3.OperationalError as e:
+                conn.close()
+                raise UserInputError(f"SQLite FTS5 is not available: {e}") from e
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS facets ("
+                " doc_rowid INTEGER NOT NULL,"
+                " field TEXT NOT NULL,"
+                " value TEXT NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS facets_lookup ON facets (field, value)")
+            conn.execute("CREATE INDEX IF NOT EXISTS facets_doc ON facets (doc_rowid)")
+            self._conn = conn
+        return self._conn
+
+    def add(self, items: Iterable[Any]) -> int:
+        """Insert or replace hits (or bare documents); returns the number stored."""
+        stored = 0
+        with self._lock:
+            db = self._db()
+            for item in items:
+                entry_id = hit_id(item)
+                if entry_id is None:
+                    continue
+                doc = extract_doc_from_item(item)
+                row = db.execute("SELECT rowid FROM docs WHERE id = ?", (entry_id,)).fetchone()
+                if row is not None:
+                    db.execute("DELETE FROM docs_fts WHERE rowid = ?", (row[0],))
+                    db.execute("DELETE FROM facets WHERE doc_rowid = ?", (row[0],))
+                    db.execute(
+                        "UPDATE docs SET doc = ? WHERE rowid = ?",
+                        (json.dumps(doc, ensure_ascii=False, default=str), row[0]),
+                    )
+                    rowid = row[0]
+                else:
+                    rowid = db.execute(
+                        "INSERT INTO docs (id, doc) VALUES (?, ?)",
+                        (entry_id, json.dumps(doc, ensure_ascii=False, default=str)),
+                    ).lastrowid
+                text: list[str] = []
+                _all_text(doc, text)
+                db.execute(
+                    "INSERT INTO docs_fts (rowid, title, description, body) VALUES (?, ?, ?, ?)",
+                    (
+                        rowid,
+                        _first_text(doc, TITLE_PATHS),
+                        _first_text(doc, DESCRIPTION_PATHS),
+                        " ".join(text),
+                    ),
+                )
+                db.executemany(
+                    "INSERT INTO facets (doc_rowid, field, value) VALUES (?, ?, ?)",
+                    [
+                        (rowid, facet, str(value))
+                        for facet, path in FACET_FIELDS.items()
+                        for value in dict.fromkeys(path_values(doc, path))
+                    ],
+                )
+                stored += 1
+            db.commit()
+        return stored
+
+    def count(self) -> int:
+        with self._lock:
+            return self._db().execute("SELECT COUNT(*) FROM docs").fetchone()[0]
+
+    def search(
+        self,
+        query: str,
+        filters: Optional[list[str]] = None,
+        limit: int = 10,
+        offset: int = 0,
+        facets: bool = False,
+    ) -> dict[str, Any]:
+        """
+        Run a query and return an API-shaped response dict.
+
+        Without document-level filters, paging, totals and facet counts are
+        computed in SQL; otherwise matches are filtered in Python first.
+        """
+        source = ["FROM docs d"]
+        where: list[str] = []
+        params: list[Any] = []
+        match = fts_query(query)
+        if match is not None:
+            source.append("JOIN docs_fts f ON f.rowid = d.rowid")
+            where.append("f.docs_fts MATCH ?")
+            params.append(match)
+
+        doc_filters: list[tuple[str, str]] = []
+        for expr in filters or []:
+            field, value = parse_filter(expr)
+            facet = FACET_ALIASES.get(field)
+            if facet is None:
+                doc_filters.append((field, value))
+                continue
+            where.append("d.rowid IN (SELECT doc_rowid FROM facets WHERE field = ? AND value = ?)")
+            params.extend([facet, value])
+
+        if where:
+            source.append("WHERE " + " AND ".join(where))
+        from_where = " ".join(source)
+        order = "ORDER BY f.rank" if match is not None else "ORDER BY d.rowid"
+        limit = max(limit, 0)
+
+        with self._lock:
+            db = self._db()
+            if not doc_filters:
+                total = db.execute(f"SELECT COUNT(*) {from_where}", params).fetchone()[0]
+                rows = db.execute(
+                    f"SELECT d.id, d.doc {from_where} {order} LIMIT ? OFFSET ?",
+                    [*params, limit, offset],
+                ).fetchall()
+                page = [(entry_id, json.loads(raw)) for entry_id, raw in rows]
+                scope = (f"SELECT d.rowid {from_where}", params)
+            else:
+                matched: list[tuple[int, str, Any]] = []
+                for rowid, entry_id, raw in db.execute(
+                    f"SELECT d.rowid, d.id, d.doc {from_where} {order}", params
+                ):
+                    doc = json.loads(raw)
+                    if all(
+                        any(str(v) == value for v in path_values(doc, field))
+                        for field, value in doc_filters
+                    ):
+                        matched.append((rowid, entry_id, doc))
+                total = len(matched)
+                page = [(entry_id, doc) for _, entry_id, doc in matched[offset : offset + limit]]
+                scope = (
+                    "SELECT value FROM json_each(?)",
+                    [json.dumps([rowid for rowid, _, _ in matched])],
+                )
+            aggregations = self._aggregations(db, *scope) if facets else None
+
+        response: dict[str, Any] = {
+            "hits": {
+                "total": {"value": total, "relation": "eq"},
+                "hits": [{"_id": entry_id, "_source": doc} for entry_id, doc in page],
+            }
+        }
+        if aggregations is not None:
+            response["aggregations"] = aggregations
+        return response
+
+    def _aggregations(
+        self, db: sqlite3.Connection, scope_sql: str, scope_params: list[Any]
+    ) -> dict[str, Any]:
+        rows = db.execute(
+            "SELECT field, value, COUNT(*) AS n FROM facets"
+            f" WHERE doc_rowid IN ({scope_sql})"
+            " GROUP BY field, value ORDER BY field, n DESC, value",
+            scope_params,
+        ).fetchall()
+        aggs: dict[str, Any] = {facet: {"buckets": []} for facet in FACET_FIELDS}
+        for field, value, n in rows:
+            aggs[field]["buckets"].append({"key": value, "doc_count": n})
+        return aggs
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
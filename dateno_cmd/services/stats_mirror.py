@@ -0,0 +1,257 @@
+"""
+Local SQLite mirror of statsdb metadata.
+
+`dateno stats sync` crawls namespaces and, per namespace, its tables,
+indicators and timeseries into this store; the `stats` read commands answer
+from it with `--local`. Records are stored as the listing endpoints return
+them, keyed on (kind, namespace, id), together with a content digest.
+
+A namespace whose own listing record has not changed since its last complete
+crawl is skipped on the next sync (unless a full sync is requested); within
+a crawled namespace only changed rows are rewritten and rows no longer
+listed are removed.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Optional
+
+
+KIND_NAMESPACE = "ns"
+KIND_TABLE = "table"
+KIND_INDICATOR = "indicator"
+KIND_TIMESERIES = "ts"
+CHILD_KINDS = (KIND_TABLE, KIND_INDICATOR, KIND_TIMESERIES)
+
+# Keys a listed record may carry its id under, by kind.
+ID_KEYS: dict[str, tuple[str, ...]] = {
+    KIND_NAMESPACE: ("ns_id", "id", "_id", "name", "code"),
+    KIND_TABLE: ("table_id", "id", "_id", "code"),
+    KIND_INDICATOR: ("ind_id", "indicator_id", "id", "_id", "code"),
+    KIND_TIMESERIES: ("ts_id", "id", "_id", "code"),
+}
+
+
+def default_mirror_path() -> Path:
+    base = os.environ.get("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+    return Path(base) / "dateno_cmd" / "stats_mirror.sqlite"
+
+
+def record_id(kind: str, item: Any) -> Optional[str]:
+    if not isinstance(item, dict):
+        return None
+    for key in ID_KEYS[kind]:
+        value = item.get(key)
+        if value not in (None, ""):
+            return str(value)
+    return None
+
+
+def record_digest(item: Any) -> str:
+    payload = json.dumps(item, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class SyncStats:
+    namespaces: int = 0
+    crawled: list[str] = field(default_factory=list)
+    unchanged: list[str] = field(default_factory=list)
+    written: int = 0
+    deleted: int = 0
+
+
+class StatsMirror:
+    """SQLite store of statsdb listing records; safe to share between threads."""
+
+    def __init__(self, path: Optional[str | Path] = None) -> None:
+        self.path = Path(path).expanduser() if path else default_mirror_path()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS records ("
+                " kind TEXT NOT NULL,"
+                " ns_id TEXT NOT NULL,"
+                " obj_id TEXT NOT NULL,"
+                " position INTEGER NOT NULL,"
+                " digest TEXT NOT NULL,"
+                " data TEXT NOT NULL,"
+                " synced_at REAL NOT NULL,"
+                " PRIMARY KEY (kind, ns_id, obj_id))"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS records_order ON records (kind, ns_id, position)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS crawls ("
+                " ns_id TEXT PRIMARY KEY,"
+                " ns_digest TEXT,"
+                " synced_at REAL NOT NULL)"
+            )
+            self._conn = conn
+        return self._conn
+
+    def replace_records(self, kind: str, ns_id: str, items: Iterable[Any]) -> tuple[int, int]:
+        """
+        Store a complete listing for (kind, ns_id). Unchanged rows are left
+        alone; returns (rows written, rows deleted).
+        """
+        now = time.time()
+        written = 0
+        with self._lock:
+            db = self._db()
+            existing = dict(
+                db.execute(
+                    "SELECT obj_id, digest FROM records WHERE kind = ? AND ns_id = ?",
+                    (kind, ns_id),
+                ).fetchall()
+            )
+            seen: set[str] = set()
+            for position, item in enumerate(items):
+                obj_id = record_id(kind, item)
+                if obj_id is None or obj_id in seen:
+                    continue
+                seen.add(obj_id)
+                digest = record_digest(item)
+                if existing.get(obj_id) == digest:
+                    db.execute(
+                        "UPDATE records SET position = ? WHERE kind = ? AND ns_id = ? AND obj_id = ?",
+                        (position, kind, ns_id, obj_id),
+                    )
+                    continue
+                db.execute(
+                    "INSERT OR REPLACE INTO records"
+                    " (kind, ns_id, obj_id, position, digest, data, synced_at)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        kind,
+                        ns_id,
+                        obj_id,
+                        position,
+                        digest,
+                        json.dumps(item, ensure_ascii=False, default=str),
+                        now,
+                    ),
+                )
+                written += 1
+            stale = [obj_id for obj_id in existing if obj_id not in seen]
+            db.executemany(
+                "DELETE FROM records WHERE kind = ? AND ns_id = ? AND obj_id = ?",
+                [(kind, ns_id, obj_id) for obj_id in stale],
+            )
+            db.commit()
+        return written, len(stale)
+
+    def get(self, kind: str, obj_id: str, ns_id: str = "") -> Optional[Any]:
+        with self._lock:
+            row = self._db().execute(
+                "SELECT data FROM records WHERE kind = ? AND ns_id = ? AND obj_id = ?",
+                (kind, ns_id, obj_id),
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def list(self, kind: str, ns_id: str = "", start: int = 0, limit: int = 100) -> dict[str, Any]:
+        with self._lock:
+            db = self._db()
+            total = db.execute(
+                "SELECT COUNT(*) FROM records WHERE kind = ? AND ns_id = ?", (kind, ns_id)
+            ).fetchone()[0]
+            rows = db.execute(
+                "SELECT data FROM records WHERE kind = ? AND ns_id = ?"
+                " ORDER BY position LIMIT ? OFFSET ?",
+                (kind, ns_id, limit, start),
+            ).fetchall()
+        return {"total": total, "start": start, "limit": limit, "items": [json.loads(r[0]) for r in rows]}
+
+    def crawl_digest(self, ns_id: str) -> Optional[str]:
+        with self._lock:
+            row = self._db().execute(
+                "SELECT ns_digest FROM crawls WHERE ns_id = ?", (ns_id,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def mark_crawled(self, ns_id: str, ns_digest: Optional[str]) -> None:
+        with self._lock:
+            db = self._db()
+            db.execute(
+                "INSERT OR REPLACE INTO crawls (ns_id, ns_digest, synced_at) VALUES (?, ?, ?)",
+                (ns_id, ns_digest, time.time()),
+            )
+            db.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+def sync_mirror(
+    mirror: StatsMirror,
+    list_all: Callable[[str, str], list[Any]],
+    namespaces: Optional[list[str]] = None,
+    full: bool = False,
+    workers: int = 4,
+    on_progress: Optional[Callable[[str], None]] = None,
+) -> SyncStats:
+    """
+    Refresh the mirror.
+
+    `list_all(kind, ns_id)` returns every listing record of a kind (ns_id is
+    "" for namespaces). Named namespaces (or all, if none are named) are
+    crawled `workers` at a time unless unchanged since their last crawl.
+    """
+    stats = SyncStats()
+    lock = threading.Lock()
+    ns_items = list_all(KIND_NAMESPACE, "")
+    stats.written, stats.deleted = mirror.replace_records(KIND_NAMESPACE, "", ns_items)
+
+    digests = {
+        record_id(KIND_NAMESPACE, item): record_digest(item)
+        for item in ns_items
+        if record_id(KIND_NAMESPACE, item) is not None
+    }
+    stats.namespaces = len(digests)
+
+    def _crawl(ns_id: str) -> None:
+        written = deleted = 0
+        for kind in CHILD_KINDS:
+            w, d = mirror.replace_records(kind, ns_id, list_all(kind, ns_id))
+            written += w
+            deleted += d
+        mirror.mark_crawled(ns_id, digests.get(ns_id))
+        with lock:
+            stats.written += written
+            stats.deleted += deleted
+            stats.crawled.append(ns_id)
+        if on_progress is not None:
+            on_progress(ns_id)
+
+    pending = []
+    for ns_id in namespaces or list(digests):
+        digest = digests.get(ns_id)
+        if not full and digest is not None and mirror.crawl_digest(ns_id) == digest:
+            stats.unchanged.append(ns_id)
+        else:
+            pending.append(ns_id)
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        for future in [pool.submit(_crawl, ns_id) for ns_id in pending]:
+            future.result()
+    return stats
@@ -0,0 +1,276 @@
+"""
+File-backed work queue shared by `dateno worker` processes.
+
+Harvest-style commands can enqueue their work units (search pages, entry
+gets, timeseries exports) into a SQLite file instead of running them. Any
+number of `dateno worker --queue FILE` processes, on one machine or several
+over shared storage, claim units under a time-limited lease, extend it with
+heartbeats while working, and record the result or the error. A unit whose
+lease ran out (its worker died) is handed to the next claimant; a unit that
+failed, or whose workers kept dying, is retried until it reaches its attempt
+limit.
+
+The database uses a rollback journal rather than WAL, because WAL needs
+shared memory and does not work for processes on different hosts.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Optional
+
+
+STATUS_PENDING = "pending"
+STATUS_LEASED = "leased"
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+STATUSES = (STATUS_PENDING, STATUS_LEASED, STATUS_DONE, STATUS_FAILED)
+
+DEFAULT_LEASE_SECONDS = 60.0
+DEFAULT_MAX_ATTEMPTS = 3
+BUSY_TIMEOUT_MS = 30_000
+
+
+@dataclass(frozen=True)
+class WorkUnit:
+    id: int
+    kind: str
+    payload: dict[str, Any]
+    attempts: int
+
+
+def worker_id() -> str:
+    """Lease owner name unique to this process."""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+class WorkQueue:
+    """SQLite work queue with row leases; safe to share between threads."""
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path).expanduser()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # Autocommit mode; claims open their own IMMEDIATE transaction.
+            conn = sqlite3.connect(
+                str(self.path),
+                check_same_thread=False,
+                isolation_level=None,
+                timeout=BUSY_TIMEOUT_MS / 1000,
+            )
+            conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS units ("
+                " id INTEGER PRIMARY KEY,"
+                " kind TEXT NOT NULL,"
+                " payload TEXT NOT NULL,"
+                " status TEXT NOT NULL,"
+                " owner TEXT,"
+                " lease_expires REAL,"
+                " attempts INTEGER NOT NULL DEFAULT 0,"
+                " max_attempts INTEGER NOT NULL,"
+                " result TEXT,"
+                " error TEXT,"
+                " updated_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS units_status ON units (status, id)")
+            self._conn = conn
+        return self._conn
+
+    def put(
+        self,
+        kind: str,
+        payloads: Iterable[dict[str, Any]],
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+    ) -> int:
+        """Enqueue one unit per payload; returns the number added."""
+        now = time.time()
+        rows = [
+            (kind, json.dumps(p, ensure_ascii=False, default=str), STATUS_PENDING, max_attempts, now)
+            for p in payloads
+        ]
+        with self._lock:
+            db = self._db()
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                db.executemany(
+                    "INSERT INTO units (kind, payload, status, max_attempts, updated_at)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    rows,
+                )
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+            db.execute("COMMIT")
+        return len(rows)
+
+    def claim(
+        self,
+        owner: str,
+        limit: int = 1,
+        lease_seconds: float = DEFAULT_LEASE_SECONDS,
+    ) -> list[WorkUnit]:
+        """
+        Lease up to `limit` units to `owner`. Units whose lease has expired
+        are taken over (the attempt of the lost worker counts), or marked
+        failed once they have used up their attempts.
+        """
+        now = time.time()
+        with self._lock:
+            db = self._db()
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                db.execute(
+                    "UPDATE units SET status = ?,"
+                    " error = 'lease expired after ' || attempts || ' attempts',"
+                    " owner = NULL, lease_expires = NULL, updated_at = ?"
+                    " WHERE status = ? AND lease_expires < ? AND attempts >= max_attempts",
+                    (STATUS_FAILED, now, STATUS_LEASED, now),
+                )
+                rows = db.execute(
+                    "SELECT id, kind, payload, attempts FROM units"
+                    " WHERE status = ? OR (status = ? AND lease_expires < ?)"
+                    " ORDER BY id LIMIT ?",
+                    (STATUS_PENDING, STATUS_LEASED, now, limit),
+                ).fetchall()
+                db.executemany(
+                    "UPDATE units SET status = ?, owner = ?, lease_expires = ?,"
+                    " attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                    [(STATUS_LEASED, owner, now + lease_seconds, now, row[0]) for row in rows],
+                )
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+            db.execute("COMMIT")
+        return [
+            WorkUnit(id=row[0], kind=row[1], payload=json.loads(row[2]), attempts=row[3] + 1)
+            for row in rows
+        ]
+
+    def heartbeat(
+        self,
+        owner: str,
+        unit_ids: Iterable[int],
+        lease_seconds: float = DEFAULT_LEASE_SECONDS,
+    ) -> int:
+        """Extend the leases `owner` still holds; returns how many were extended."""
+        ids = list(unit_ids)
+        if not ids:
+            return 0
+        now = time.time()
+        with self._lock:
+            cur = self._db().executemany(
+                "UPDATE units SET lease_expires = ?, updated_at = ?"
+                " WHERE id = ? AND owner = ? AND status = ?",
+                [(now + lease_seconds, now, unit_id, owner, STATUS_LEASED) for unit_id in ids],
+            )
+            return cur.rowcount
+
+    def complete(self, owner: str, unit_id: int, result: Any = None) -> bool:
+        """
+        Record a unit's result. Returns False if the lease was lost to
+        another worker, in which case the result is discarded.
+        """
+        with self._lock:
+            cur = self._db().execute(
+                "UPDATE units SET status = ?, result = ?, error = NULL, lease_expires = NULL,"
+                " updated_at = ? WHERE id = ? AND owner = ? AND status = ?",
+                (
+                    STATUS_DONE,
+                    None if result is None else json.dumps(result, ensure_ascii=False, default=str),
+                    time.time(),
+                    unit_id,
+                    owner,
+                    STATUS_LEASED,
+                ),
+            )
+            return cur.rowcount == 1
+
+    def fail(self, owner: str, unit_id: int, error: str) -> bool:
+        """Record a failure; the unit is requeued until it runs out of attempts."""
+        with self._lock:
+            cur = self._db().execute(
+                "UPDATE units SET"
+                " status = CASE WHEN attempts >= max_attempts THEN ? ELSE ? END,"
+                " error = ?, owner = NULL, lease_expires = NULL, updated_at = ?"
+                " WHERE id = ? AND owner = ? AND status = ?",
+                (STATUS_FAILED, STATUS_PENDING, error, time.time(), unit_id, owner, STATUS_LEASED),
+            )
+            return cur.rowcount == 1
+
+    def retry_failed(self) -> int:
+        """Requeue failed units with a fresh attempt budget."""
+        with self._lock:
+            cur = self._db().execute(
+                "UPDATE units SET status = ?, attempts = 0, updated_at = ? WHERE status = ?",
+                (STATUS_PENDING, time.time(), STATUS_FAILED),
+            )
+            return cur.rowcount
+
+    def counts(self) -> dict[str, int]:
+        """
+        Units per status; expired leases are reported as pending, or as
+        failed when they have no attempts left.
+        """
+        now = time.time()
+        with self._lock:
+            rows = self._db().execute(
+                "SELECT CASE WHEN status = ? AND lease_expires < ? THEN"
+                " CASE WHEN attempts >= max_attempts THEN ? ELSE ? END"
+                " ELSE status END AS s,"
+                " COUNT(*) FROM units GROUP BY s",
+                (STATUS_LEASED, now, STATUS_FAILED, STATUS_PENDING),
+            ).fetchall()
+        counts = dict.fromkeys(STATUSES, 0)
+        counts.update(dict(rows))
+        return counts
+
+    def has_open_units(self) -> bool:
+        counts = self.counts()
+        return counts[STATUS_PENDING] + counts[STATUS_LEASED] > 0
+
+    def results(self, kind: Optional[str] = None, batch: int = 500) -> Iterator[tuple[str, Any]]:
+        """(kind, result) of finished units with a result, in enqueue order."""
+        sql = "SELECT id, kind, result FROM units WHERE status = ? AND result IS NOT NULL AND id > ?"
+        params: list[Any] = [STATUS_DONE]
+        if kind is not None:
+            sql += " AND kind = ?"
+        last = 0
+        while True:
+            with self._lock:
+                rows = self._db().execute(
+                    sql + " ORDER BY id LIMIT ?",
+                    [*params, last, *([kind] if kind is not None else []), batch],
+                ).fetchall()
+            if not rows:
+                return
+            for unit_id, unit_kind, raw in rows:
+                last = unit_id
+                yield unit_kind, json.loads(raw)
+
+    def failures(self) -> list[tuple[int, str, dict[str, Any], Optional[str]]]:
+        with self._lock:
+            rows = self._db().execute(
+                "SELECT id, kind, payload, error FROM units WHERE status = ? ORDER BY id",
+                (STATUS_FAILED,),
+            ).fetchall()
+        return [(row[0], row[1], json.loads(row[2]), row[3]) for row in rows]
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
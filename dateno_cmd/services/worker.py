@@ -0,0 +1,177 @@
+"""
+Work unit kinds and the `dateno worker` loop.
+
+Each kind has a handler taking the SDK and the unit payload and returning a
+JSON-serializable result (stored in the queue) or None. Payload builders
+live next to the handlers so producers and workers agree on the fields.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from dateno_cmd.services.work_queue import (
+    DEFAULT_LEASE_SECONDS,
+    WorkQueue,
+    WorkUnit,
+)
+from dateno_cmd.utils.download import fetch_to_file
+from dateno_cmd.utils.errors import EXIT_OK, classify_error
+from dateno_cmd.utils.search import extract_hits_list
+from dateno_cmd.utils.serialization import to_plain
+
+
+KIND_SEARCH_PAGE = "search.page"
+KIND_SEARCH_GET = "search.get"
+KIND_STATS_EXPORT = "stats.export"
+
+DEFAULT_WORKER_THREADS = 4
+DEFAULT_POLL_SECONDS = 2.0
+
+
+def search_page_payloads(
+    query: str,
+    filters: Iterable[str],
+    total: int,
+    page_size: int,
+) -> Iterator[dict[str, Any]]:
+    """One unit per offset page of a query (or harvest partition)."""
+    for offset in range(0, total, page_size):
+        yield {
+            "query": query,
+            "filters": list(filters),
+            "offset": offset,
+            "limit": min(page_size, total - offset),
+        }
+
+
+def _search_page(sdk: Any, payload: dict[str, Any]) -> list[dict]:
+    data = to_plain(
+        sdk.search_api.search_datasets(
+            q=payload["query"],
+            filters=payload.get("filters") or None,
+            limit=payload["limit"],
+            offset=payload["offset"],
+            facets=False,
+        )
+    )
+    return extract_hits_list(data)[: payload["limit"]]
+
+
+def _search_get(sdk: Any, payload: dict[str, Any]) -> Any:
+    return to_plain(sdk.search_api.get_dataset_by_entry_id(entry_id=payload["entry_id"]))
+
+
+def _stats_export(sdk: Any, payload: dict[str, Any]) -> dict[str, Any]:
+    result = fetch_to_file(
+        sdk.statistics_api.export_timeseries_file,
+        {"ns_id": payload["ns_id"], "ts_id": payload["ts_id"], "fileext": payload["fileext"]},
+        payload["path"],
+        progress=False,
+    )
+    return {"ts_id": payload["ts_id"], "path": payload["path"], "bytes": result.bytes_written}
+
+
+HANDLERS: dict[str, Callable[[Any, dict[str, Any]], Any]] = {
+    KIND_SEARCH_PAGE: _search_page,
+    KIND_SEARCH_GET: _search_get,
+    KIND_STATS_EXPORT: _stats_export,
+}
+
+
+@dataclass
+class WorkerStats:
+    completed: int = 0
+    failed: int = 0
+    lost: int = 0
+    exit_code: int = EXIT_OK
+    errors: list[str] = field(default_factory=list)
+
+
+def run_worker(
+    work_queue: WorkQueue,
+    handle: Callable[[WorkUnit], Any],
+    owner: str,
+    threads: int = DEFAULT_WORKER_THREADS,
+    lease_seconds: float = DEFAULT_LEASE_SECONDS,
+    wait_for_work: bool = False,
+    poll_seconds: float = DEFAULT_POLL_SECONDS,
+    max_units: Optional[int] = None,
+    stop: Optional[threading.Event] = None,
+) -> WorkerStats:
+    """
+    Claim and run units until the queue has no open units (or, with
+    `wait_for_work`, until `stop` is set), `threads` at a time.
+
+    Leases of running units are renewed every third of `lease_seconds`.
+    When every open unit is leased by other workers the loop polls, so it
+    picks up units whose worker died once their lease expires.
+    """
+    stats = WorkerStats()
+    stop = stop or threading.Event()
+    lock = threading.Lock()
+    running: dict[Future, WorkUnit] = {}
+    claimed = 0
+
+    def _heartbeat() -> None:
+        while not stop.wait(lease_seconds / 3):
+            with lock:
+                ids = [unit.id for unit in running.values()]
+            work_queue.heartbeat(owner, ids, lease_seconds)
+
+    def _run(unit: WorkUnit) -> None:
+        try:
+            result = handle(unit)
+        except Exception as e:
+            info = classify_error(e)
+            message = f"{info.kind}: {info.message or type(e).__name__}"
+            recorded = work_queue.fail(owner, unit.id, message)
+            with lock:
+                if recorded:
+                    stats.failed += 1
+                    stats.exit_code = max(stats.exit_code, info.code)
+                    stats.errors.append(f"unit {unit.id} ({unit.kind}): {message}")
+                else:
+                    stats.lost += 1
+            return
+        recorded = work_queue.complete(owner, unit.id, result)
+        with lock:
+            if recorded:
+                stats.completed += 1
+            else:
+                stats.lost += 1
+
+    beat = threading.Thread(target=_heartbeat, name="dateno-worker-heartbeat", daemon=True)
+    beat.start()
+    pool = ThreadPoolExecutor(max_workers=max(1, threads))
+    try:
+        while not stop.is_set():
+            free = max(1, threads) - len(running)
+            if max_units is not None:
+                free = min(free, max_units - claimed)
+            units = work_queue.claim(owner, free, lease_seconds) if free > 0 else []
+            claimed += len(units)
+            with lock:
+                for unit in units:
+                    running[pool.submit(_run, unit)] = unit
+            if running:
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                with lock:
+                    for future in done:
+                        running.pop(future)
+                        future.result()
+                continue
+            if max_units is not None and claimed >= max_units:
+                break
+            if not wait_for_work and not work_queue.has_open_units():
+                break
+            stop.wait(poll_seconds)
+    finally:
+        stop.set()
+        pool.shutdown(wait=True, cancel_futures=True)
+        beat.join()
+    return stats
@@ -36,6 +36,31 @@ class Settings(BaseSettings):
     debug: bool = Field(default=False, alias="DATENO_DEBUG")
     client_source: Optional[str] = Field(default=None, alias="DATENO_CLIENT_SOURCE")
 
+    # Local HTTP response cache for metadata endpoints
+    cache_enabled: bool = Field(default=True, alias="DATENO_CACHE")
+    cache_path: Optional[str] = Field(default=None, alias="DATENO_CACHE_PATH")
+    cache_max_bytes: int = Field(default=100 * 1024 * 1024, alias="DATENO_CACHE_MAX_BYTES")
+    cache_refresh: bool = Field(default=False, alias="DATENO_CACHE_REFRESH")
+
+    # Client-side pacing shared by all requests of a process (None: unlimited)
+    rps: Optional[float] = Field(default=None, alias="DATENO_RPS")
+    max_concurrency: Optional[int] = Field(default=None, alias="DATENO_MAX_CONCURRENCY")
+
+    # Local statsdb metadata mirror (dateno stats sync / --local)
+    stats_mirror_path: Optional[str] = Field(default=None, alias="DATENO_STATS_MIRROR_PATH")
+
+    # Offline search index (dateno mirror build / search query --local)
+    search_mirror_path: Optional[str] = Field(default=None, alias="DATENO_SEARCH_MIRROR_PATH")
+
+    # Opt-in request latency history (dateno perf report)
+    latency_history: bool = Field(default=False, alias="DATENO_LATENCY_HISTORY")
+    latency_history_path: Optional[str] = Field(default=None, alias="DATENO_LATENCY_HISTORY_PATH")
+
+    # HTTP cassettes (--record DIR / --replay DIR)
+    record_dir: Optional[str] = Field(default=None, alias="DATENO_RECORD_DIR")
+    replay_dir: Optional[str] = Field(default=None, alias="DATENO_REPLAY_DIR")
+    replay_latency: bool = Field(default=False, alias="DATENO_REPLAY_LATENCY")
+
     # Optional explicit YAML config path override (legacy support)
     config_yaml: Optional[str] = Field(default=None, alias="DATENO_CONFIG_YAML")
 
@@ -62,12 +87,17 @@ class Settings(BaseSettings):
             def _set_if_missing(field: str, value: Any) -> None:
                 if field in fields_set or value is None:
                     return
-                if field == "timeout_ms" or field == "retries":
+                if field in ("timeout_ms", "retries", "max_concurrency"):
                     try:
                         setattr(self, field, int(value))
                     except (TypeError, ValueError):
                         return
-                elif field == "debug":
+                elif field == "rps":
+                    try:
+                        setattr(self, field, float(value))
+                    except (TypeError, ValueError):
+                        return
+                elif field in ("debug", "latency_history"):
                     if isinstance(value, bool):
                         setattr(self, field, value)
                     elif isinstance(value, (int, float)):
@@ -83,6 +113,9 @@ class Settings(BaseSettings):
             _set_if_missing("retries", cfg.get("retries"))
             _set_if_missing("output_format", cfg.get("output_format"))
             _set_if_missing("debug", cfg.get("debug"))
+            _set_if_missing("rps", cfg.get("rps"))
+            _set_if_missing("max_concurrency", cfg.get("max_concurrency"))
+            _set_if_missing("latency_history", cfg.get("latency_history"))
 
         return self
 
@@ -0,0 +1,152 @@
+"""
+Adaptive (AIMD) concurrency for bulk commands.
+
+The controller is a concurrency gate whose limit follows the server: after
+every round of `limit` healthy responses the limit grows by one; a timeout,
+429 or 5xx, or a p95 latency well above the best seen so far halves it.
+Responses are observed through the SDK clients' event hooks (see
+services.http_events); request failures that never produced a response
+(timeouts, connection errors) are reported by the caller.
+
+It works as a gate for both asyncio tasks (`async with controller`) and
+threads (`with controller`).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import collections
+import threading
+import time
+from typing import Optional
+
+from dateno_cmd.services.http_events import ResponseEvent
+from dateno_cmd.utils.errors import EXIT_NETWORK, classify_error
+
+
+ADAPTIVE_START = 4
+LATENCY_WINDOW = 50
+LATENCY_TOLERANCE = 2.0
+MIN_LATENCY_SAMPLES = 10
+GATE_POLL_SECONDS = 0.01
+
+
+def _p95(samples: collections.deque[float]) -> Optional[float]:
+    if len(samples) < MIN_LATENCY_SAMPLES:
+        return None
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))]
+
+
+class AIMDController:
+    """Thread-safe AIMD concurrency limit usable as a sync or async gate."""
+
+    def __init__(
+        self,
+        maximum: int,
+        initial: int = ADAPTIVE_START,
+        minimum: int = 1,
+        decrease: float = 0.5,
+        latency_tolerance: float = LATENCY_TOLERANCE,
+    ) -> None:
+        self.maximum = max(1, maximum)
+        self.minimum = max(1, min(minimum, self.maximum))
+        self.limit = max(self.minimum, min(initial, self.maximum))
+        self.peak = self.limit
+        self.decrease = decrease
+        self.latency_tolerance = latency_tolerance
+        self.cuts = 0
+        self._in_flight = 0
+        self._healthy = 0
+        self._latencies: collections.deque[float] = collections.deque(maxlen=LATENCY_WINDOW)
+        self._best_p95: Optional[float] = None
+        self._hold_until = 0.0
+        self._cond = threading.Condition()
+
+    # -- observations -----------------------------------------------------
+
+    def observe_response(self, event: ResponseEvent) -> None:
+        if event.status_code == 429 or event.status_code >= 500:
+            self._congested()
+            return
+        with self._cond:
+            if event.elapsed is not None:
+                self._latencies.append(event.elapsed)
+            p95 = _p95(self._latencies)
+            if p95 is not None:
+                if self._best_p95 is None or p95 < self._best_p95:
+                    self._best_p95 = p95
+                elif p95 > self._best_p95 * self.latency_tolerance:
+                    self._cut_locked()
+                    return
+            self._healthy += 1
+            if self._healthy >= self.limit and self.limit < self.maximum:
+                self.limit += 1
+                self.peak = max(self.peak, self.limit)
+                self._healthy = 0
+                self._cond.notify_all()
+
+    def observe_error(self, error: Optional[BaseException]) -> None:
+        """Report a failed call; only failures without a response count here."""
+        if isinstance(error, Exception) and classify_error(error).code == EXIT_NETWORK:
+            self._congested()
+
+    def _congested(self) -> None:
+        with self._cond:
+            self._cut_locked()
+
+    def _cut_locked(self) -> None:
+        now = time.monotonic()
+        self._healthy = 0
+        # Responses to requests sent before the last cut do not cut again.
+        if now < self._hold_until:
+            return
+        self.limit = max(self.minimum, int(self.limit * self.decrease))
+        self.cuts += 1
+        self._latencies.clear()
+        p95 = self._best_p95 or 0.0
+        self._hold_until = now + max(1.0, 2 * p95)
+
+    # -- gate -------------------------------------------------------------
+
+    def _try_enter(self) -> bool:
+        with self._cond:
+            if self._in_flight >= self.limit:
+                return False
+            self._in_flight += 1
+            return True
+
+    def release(self) -> None:
+        with self._cond:
+            self._in_flight -= 1
+            self._cond.notify()
+
+    def acquire(self) -> None:
+        with self._cond:
+            while self._in_flight >= self.limit:
+                self._cond.wait(timeout=GATE_POLL_SECONDS * 10)
+            self._in_flight += 1
+
+    async def acquire_async(self) -> None:
+        while not self._try_enter():
+            await asyncio.sleep(GATE_POLL_SECONDS)
+
+    def __enter__(self) -> "AIMDController":
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.release()
+
+    async def __aenter__(self) -> "AIMDController":
+        await self.acquire_async()
+        return self
+
+    async def __aexit__(self, *exc: object) -> None:
+        self.release()
+
+    def summary(self) -> str:
+        return (
+            f"Adaptive concurrency: settled at {self.limit}"
+            f" (peak {self.peak}, max {self.maximum}, {self.cuts} cuts)"
+        )
@@ -0,0 +1,129 @@
+"""
+Asyncio execution core for multi-request commands.
+
+Requests are awaitable factories (usually the SDK's `*_async` methods, see
+resolve_async) run on one event loop under a shared semaphore. Failures are
+collected per request instead of aborting the batch; Ctrl-C cancels every
+in-flight request.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable, Iterable
+from contextlib import AbstractAsyncContextManager
+from dataclasses import dataclass
+from typing import Any, Optional, TypeVar
+
+from dateno_cmd.utils.errors import EXIT_OK, classify_error
+
+
+DEFAULT_CONCURRENCY = 8
+
+T = TypeVar("T")
+
+
+@dataclass
+class Outcome:
+    """Result of one request: `value` on success, `error` on failure."""
+
+    index: int
+    key: Hashable
+    value: Any = None
+    error: Optional[Exception] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def resolve_async(fn: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Return the `<name>_async` twin of a generated SDK method, or a coroutine
+    wrapper that runs the sync method in a worker thread.
+    """
+    owner = getattr(fn, "__self__", None)
+    name = getattr(fn, "__name__", "")
+    async_fn = getattr(owner, f"{name}_async", None) if owner is not None else None
+    if callable(async_fn):
+        return async_fn
+
+    async def _in_thread(*args: Any, **kwargs: Any) -> Any:
+        return await asyncio.to_thread(fn, *args, **kwargs)
+
+    return _in_thread
+
+
+async def gather_outcomes(
+    calls: Iterable[tuple[Hashable, Callable[[], Awaitable[Any]]]],
+    concurrency: int = DEFAULT_CONCURRENCY,
+    semaphore: Optional[AbstractAsyncContextManager[Any]] = None,
+    on_result: Optional[Callable[[Outcome], None]] = None,
+    keep_values: Optional[bool] = None,
+) -> list[Outcome]:
+    """
+    Run `(key, factory)` calls concurrently and return outcomes in input order.
+
+    At most `concurrency` calls are in flight, or as many as `semaphore`
+    allows when one is shared between batches (any async gate works, e.g.
+    an AIMDController). `calls` is consumed lazily, so only the calls in
+    flight exist as tasks. `on_result` is invoked in completion order; the
+    returned outcomes then carry only index, key and error (pass
+    `keep_values=True` to keep the values too), so a large batch does not
+    hold every result until it finishes. Exceptions are captured per call;
+    cancellation is not.
+    """
+    limit = semaphore or asyncio.Semaphore(max(1, concurrency))
+    window = max(1, concurrency)
+    if keep_values is None:
+        keep_values = on_result is None
+
+    async def _one(index: int, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Outcome:
+        async with limit:
+            try:
+                outcome = Outcome(index, key, value=await factory())
+            except Exception as e:
+                outcome = Outcome(index, key, error=e)
+        if on_result is not None:
+            on_result(outcome)
+        if not keep_values:
+            outcome.value = None
+        return outcome
+
+    outcomes: list[Outcome] = []
+    pending: set[asyncio.Future[Outcome]] = set()
+    try:
+        for index, (key, factory) in enumerate(calls):
+            pending.add(asyncio.ensure_future(_one(index, key, factory)))
+            if len(pending) >= window:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                outcomes.extend(task.result() for task in done)
+        if pending:
+            done, pending = await asyncio.wait(pending)
+            outcomes.extend(task.result() for task in done)
+    except BaseException:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        raise
+    outcomes.sort(key=lambda outcome: outcome.index)
+    return outcomes
+
+
+def worst_exit_code(outcomes: Iterable[Outcome]) -> int:
+    """Highest exit code among failed outcomes (EXIT_OK if none failed)."""
+    code = EXIT_OK
+    for outcome in outcomes:
+        if outcome.error is not None:
+            code = max(code, classify_error(outcome.error).code)
+    return code
+
+
+def run_async(main: Awaitable[T]) -> T:
+    """
+    Run a coroutine on a fresh event loop.
+
+    On Ctrl-C the pending tasks are cancelled before KeyboardInterrupt
+    propagates to the caller.
+    """
+    return asyncio.run(main)  # type: ignore[arg-type]
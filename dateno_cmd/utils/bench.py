@@ -0,0 +1,283 @@
+"""
+Workload replay for `dateno bench`.
+
+A workload is a JSON Lines file of operations, replayed in order (and
+repeated as needed) through the SDK's async client:
+
+    {"op": "search", "q": "climate", "filters": ["source.catalog_type=Geoportal"], "limit": 10}
+    {"op": "dsl", "body": {"query": {"match_all": {}}, "size": 10}}
+    {"op": "get", "id": "<entry id>"}
+    {"op": "raw", "id": "<entry id>"}
+    {"op": "catalog", "id": "<catalog id>"}
+    {"op": "ns", "ns": "ilostat"}
+    {"op": "ts", "ns": "ilostat", "ts": "<timeseries id>"}
+
+A line that is not JSON is a search query. Requests run either closed-loop
+(`concurrency` requests always in flight) or open-loop at a target request
+rate. In open loop the latency of a request is measured from its scheduled
+start, so time spent waiting for a free slot when the client or server falls
+behind is counted instead of hidden.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import json
+import time
+from collections.abc import Awaitable, Callable, Iterable, Iterator
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from dateno_cmd.services.latency_history import percentile
+from dateno_cmd.utils.aio import resolve_async
+from dateno_cmd.utils.errors import UserInputError, classify_error
+from dateno_cmd.utils.sdk import call_sdk_flexible
+
+
+# Upper bounds (ms) of the latency histogram buckets; the last is open.
+HISTOGRAM_BOUNDS_MS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+# op -> required argument names
+OPERATIONS: dict[str, tuple[str, ...]] = {
+    "search": ("q",),
+    "dsl": ("body",),
+    "get": ("id",),
+    "raw": ("id",),
+    "catalog": ("id",),
+    "ns": ("ns",),
+    "ts": ("ns", "ts"),
+}
+
+
+@dataclass(frozen=True)
+class WorkItem:
+    op: str
+    args: dict[str, Any]
+
+
+@dataclass(frozen=True)
+class Sample:
+    op: str
+    seconds: float
+    error: Optional[Exception] = None
+
+
+@dataclass
+class BenchResult:
+    samples: list[Sample] = field(default_factory=list)
+    wall_seconds: float = 0.0
+
+
+def parse_workload(lines: Iterable[str]) -> list[WorkItem]:
+    """Parse workload lines; blank lines and `#` comments are skipped."""
+    items = []
+    for number, line in enumerate(lines, start=1):
+        text = line.strip()
+        if not text or text.startswith("#"):
+            continue
+        try:
+            entry = json.loads(text)
+        except json.JSONDecodeError:
+            items.append(WorkItem("search", {"q": text}))
+            continue
+        if not isinstance(entry, dict):
+            raise UserInputError(f"Line {number}: expected a JSON object or a search query")
+        op = entry.pop("op", "search")
+        if op not in OPERATIONS:
+            raise UserInputError(
+                f"Line {number}: unknown op {op!r} (one of {', '.join(OPERATIONS)})"
+            )
+        missing = [name for name in OPERATIONS[op] if entry.get(name) in (None, "")]
+        if missing:
+            raise UserInputError(f"Line {number}: {op} needs {', '.join(missing)}")
+        items.append(WorkItem(op, entry))
+    if not items:
+        raise UserInputError("Workload is empty")
+    return items
+
+
+def sdk_caller(sdk: Any) -> Callable[[WorkItem], Awaitable[Any]]:
+    """Map work items to async SDK calls."""
+    search = resolve_async(sdk.search_api.search_datasets)
+    dsl = resolve_async(sdk.search_api.search_datasets_dsl)
+    get = resolve_async(sdk.search_api.get_dataset_by_entry_id)
+    raw = resolve_async(sdk.raw_data_access.get_raw_entry_by_id)
+    catalog = resolve_async(sdk.data_catalogs_api.get_catalog_by_id)
+    namespace = resolve_async(sdk.statistics_api.get_namespace)
+    timeseries = resolve_async(sdk.statistics_api.get_timeseries)
+
+    def _call(item: WorkItem) -> Awaitable[Any]:
+        a = item.args
+        if item.op == "search":
+            return search(
+                q=a["q"],
+                filters=a.get("filters") or None,
+                limit=a.get("limit", 10),
+                offset=a.get("offset", 0),
+                facets=bool(a.get("facets", False)),
+            )
+        if item.op == "dsl":
+            return call_sdk_flexible(dsl, body=a["body"])
+        if item.op == "get":
+            return get(entry_id=a["id"])
+        if item.op == "raw":
+            return raw(entry_id=a["id"])
+        if item.op == "catalog":
+            return catalog(catalog_id=a["id"])
+        if item.op == "ns":
+            return namespace(ns_id=a["ns"])
+        return timeseries(ns_id=a["ns"], ts_id=a["ts"])
+
+    return _call
+
+
+def _schedule(
+    items: list[WorkItem],
+    requests: Optional[int],
+    duration: Optional[float],
+    started: float,
+    clock: Callable[[], float],
+) -> Iterator[WorkItem]:
+    """The workload, repeated, until `requests` items or `duration` seconds."""
+    source: Iterable[WorkItem] = itertools.cycle(items) if duration else items
+    if requests is not None:
+        source = itertools.islice(itertools.cycle(items), requests)
+    for item in source:
+        if duration is not None and clock() - started >= duration:
+            return
+        yield item
+
+
+async def run_workload(
+    items: list[WorkItem],
+    call: Callable[[WorkItem], Awaitable[Any]],
+    concurrency: int,
+    rps: Optional[float] = None,
+    requests: Optional[int] = None,
+    duration: Optional[float] = None,
+    clock: Callable[[], float] = time.monotonic,
+) -> BenchResult:
+    """
+    Replay `items` (once, or `requests` items, or for `duration` seconds)
+    with at most `concurrency` requests in flight, started back to back or,
+    with `rps`, at that rate. Failures are recorded, not raised.
+    """
+    result = BenchResult()
+    started = clock()
+    schedule = _schedule(items, requests, duration, started, clock)
+
+    async def _timed(item: WorkItem, since: float) -> None:
+        try:
+            await call(item)
+            error = None
+        except Exception as e:
+            error = e
+        result.samples.append(Sample(item.op, clock() - since, error))
+
+    if rps is None:
+
+        async def _worker() -> None:
+            for item in schedule:
+                await _timed(item, clock())
+
+        await asyncio.gather(*(_worker() for _ in range(max(1, concurrency))))
+    else:
+        slots = asyncio.Semaphore(max(1, concurrency))
+        tasks: list[asyncio.Task] = []
+
+        async def _paced(item: WorkItem, due: float) -> None:
+            async with slots:
+                await _timed(item, due)
+
+        for n, item in enumerate(schedule):
+            due = started + n / rps
+            delay = due - clock()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.ensure_future(_paced(item, due)))
+        await asyncio.gather(*tasks)
+
+    result.wall_seconds = clock() - started
+    return result
+
+
+def _error_key(error: Exception) -> str:
+    info = classify_error(error)
+    if info.status_code is not None:
+        return f"{info.kind} ({info.status_code})"
+    return f"{info.kind} ({type(error).__name__})"
+
+
+def _latency_stats(samples: list[Sample]) -> dict[str, Any]:
+    ms = sorted(s.seconds * 1000 for s in samples)
+    if not ms:
+        return {}
+    return {
+        "p50": round(percentile(ms, 50), 1),
+        "p90": round(percentile(ms, 90), 1),
+        "p95": round(percentile(ms, 95), 1),
+        "p99": round(percentile(ms, 99), 1),
+        "max": round(ms[-1], 1),
+        "mean": round(sum(ms) / len(ms), 1),
+    }
+
+
+def histogram(samples: list[Sample]) -> list[dict[str, Any]]:
+    """Request counts per latency bucket (`le_ms` is None for the last one)."""
+    counts = [0] * (len(HISTOGRAM_BOUNDS_MS) + 1)
+    for sample in samples:
+        ms = sample.seconds * 1000
+        index = next(
+            (i for i, bound in enumerate(HISTOGRAM_BOUNDS_MS) if ms <= bound),
+            len(HISTOGRAM_BOUNDS_MS),
+        )
+        counts[index] += 1
+    bounds: list[Optional[int]] = [*HISTOGRAM_BOUNDS_MS, None]
+    return [{"le_ms": bound, "count": count} for bound, count in zip(bounds, counts)]
+
+
+def summarize(result: BenchResult) -> dict[str, Any]:
+    """Throughput, latency (ms, successful requests) and errors by kind."""
+    ok = [s for s in result.samples if s.error is None]
+    errors: dict[str, int] = {}
+    for sample in result.samples:
+        if sample.error is not None:
+            key = _error_key(sample.error)
+            errors[key] = errors.get(key, 0) + 1
+    wall = result.wall_seconds
+    summary: dict[str, Any] = {
+        "requests": len(result.samples),
+        "ok": len(ok),
+        "errors": len(result.samples) - len(ok),
+        "seconds": round(result.wall_seconds, 3),
+        "throughput_rps": round(len(result.samples) / wall, 2) if wall else None,
+        "latency_ms": _latency_stats(ok),
+        "histogram": histogram(ok),
+    }
+    if errors:
+        summary["errors_by_kind"] = dict(sorted(errors.items(), key=lambda kv: -kv[1]))
+    per_op = {}
+    for op in dict.fromkeys(s.op for s in result.samples):
+        samples = [s for s in result.samples if s.op == op]
+        per_op[op] = {
+            "requests": len(samples),
+            "errors": sum(1 for s in samples if s.error is not None),
+            "latency_ms": _latency_stats([s for s in samples if s.error is None]),
+        }
+    summary["operations"] = per_op
+    return summary
+
+
+def format_histogram(buckets: list[dict[str, Any]], width: int = 40) -> str:
+    """Text bars for stderr."""
+    peak = max((b["count"] for b in buckets), default=0) or 1
+    lines = []
+    for b in buckets:
+        if b["le_ms"] is not None:
+            label = f"<= {b['le_ms']} ms"
+        else:
+            label = f"> {HISTOGRAM_BOUNDS_MS[-1]} ms"
+        bar = "#" * round(b["count"] / peak * width)
+        lines.append(f"{label:>12} {b['count']:>7} {bar}")
+    return "\n".join(lines)
@@ -0,0 +1,131 @@
+"""Concurrent bulk fetch helpers for id-based commands."""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Callable
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from typing import Any, ContextManager, Optional, TextIO
+
+import click
+
+from dateno_cmd.services.http_events import listening
+from dateno_cmd.utils.aimd import AIMDController
+from dateno_cmd.utils.aio import (
+    DEFAULT_CONCURRENCY,
+    Outcome,
+    gather_outcomes,
+    resolve_async,
+    run_async,
+    worst_exit_code,
+)
+from dateno_cmd.utils.errors import EXIT_OK, classify_error
+from dateno_cmd.utils.io import open_output
+from dateno_cmd.utils.serialization import to_plain
+
+
+__all__ = ["DEFAULT_CONCURRENCY", "BulkResult", "resolve_async", "run_bulk_fetch"]
+
+
+@dataclass
+class BulkResult:
+    ok: int = 0
+    failed: int = 0
+    exit_code: int = EXIT_OK
+    errors: dict[str, str] = field(default_factory=dict)
+
+
+async def _fetch_all(
+    ids: list[str],
+    fetch: Callable[[str], Any],
+    out: TextIO,
+    concurrency: int,
+    ordered: bool,
+    result: BulkResult,
+    controller: Optional[AIMDController] = None,
+) -> None:
+    done: dict[int, Optional[Any]] = {}
+    next_index = 0
+
+    def _emit(payload: Any) -> None:
+        out.write(json.dumps(payload, ensure_ascii=False, default=str))
+        out.write("\n")
+
+    def _flush_ordered() -> None:
+        nonlocal next_index
+        while next_index in done:
+            payload = done.pop(next_index)
+            if payload is not None:
+                _emit(payload)
+            next_index += 1
+
+    def _on_result(outcome: Outcome) -> None:
+        if controller is not None:
+            controller.observe_error(outcome.error)
+        if outcome.ok:
+            result.ok += 1
+            payload = to_plain(outcome.value)
+        else:
+            info = classify_error(outcome.error)
+            result.failed += 1
+            result.errors[str(outcome.key)] = (
+                f"{info.kind}: {info.message or type(outcome.error).__name__}"
+            )
+            payload = None
+        if ordered:
+            done[outcome.index] = payload
+            _flush_ordered()
+        elif payload is not None:
+            _emit(payload)
+
+    outcomes = await gather_outcomes(
+        ((entry_id, lambda eid=entry_id: fetch(eid)) for entry_id in ids),
+        concurrency=concurrency,
+        semaphore=controller,
+        on_result=_on_result,
+    )
+    result.exit_code = worst_exit_code(outcomes)
+
+
+def _observing(controller: Optional[AIMDController]) -> ContextManager[None]:
+    if controller is None:
+        return nullcontext()
+    return listening(controller.observe_response)
+
+
+def run_bulk_fetch(
+    ids: list[str],
+    fetch: Callable[[str], Any],
+    output: Optional[str],
+    concurrency: int = DEFAULT_CONCURRENCY,
+    ordered: bool = False,
+    failed_output: Optional[str] = None,
+    adaptive: bool = False,
+) -> BulkResult:
+    """
+    Fetch many ids concurrently and write results as JSON Lines.
+
+    `fetch(entry_id)` must return an awaitable. At most `concurrency` requests
+    are in flight. Records are written in completion order, or in input order
+    with `ordered=True`. Failed ids with their error go to `failed_output`
+    (tab-separated) and a summary is printed to stderr. With `adaptive` the
+    number of requests in flight is tuned by an AIMDController, up to
+    `concurrency`.
+    """
+    result = BulkResult()
+    controller = AIMDController(concurrency) if adaptive else None
+    with open_output(output) as out, _observing(controller):
+        run_async(_fetch_all(ids, fetch, out, concurrency, ordered, result, controller))
+
+    if failed_output:
+        with open_output(failed_output) as f:
+            for entry_id, message in result.errors.items():
+                f.write(f"{entry_id}\t{message}\n")
+
+    click.echo(f"Fetched {result.ok}, failed {result.failed}", err=True)
+    if controller is not None:
+        click.echo(controller.summary(), err=True)
+    if output:
+        print(f"Results saved to {output}")
+    return result
@@ -2,30 +2,100 @@
 
 from __future__ import annotations
 
-from collections.abc import Callable
-from typing import Optional
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any, Optional, TypeVar
 
 import typer
 
 from dateno_cmd.services.context import CommandContext
-from dateno_cmd.utils.errors import print_sdk_error
-from dateno_cmd.utils.io import write_or_print
+from dateno_cmd.services.passthrough import capture_body
+from dateno_cmd.utils.aio import (
+    DEFAULT_CONCURRENCY,
+    gather_outcomes,
+    resolve_async,
+    run_async,
+    worst_exit_code,
+)
+from dateno_cmd.utils.bulk import run_bulk_fetch
+from dateno_cmd.utils.errors import EXIT_INTERRUPTED, print_sdk_error
+from dateno_cmd.utils.io import read_ids, write_bytes_or_print, write_or_print
+from dateno_cmd.utils.profiling import phase
 from dateno_cmd.utils.serialization import render_output, to_plain
 
 
+T = TypeVar("T")
+
+
+def _debug_enabled(ctx: CommandContext) -> bool:
+    settings = getattr(ctx, "settings", None)
+    return bool(getattr(settings, "debug", False)) if settings is not None else False
+
+
 def call_sdk(ctx: CommandContext, call: Callable[[], object]) -> object:
     """
     Execute SDK call and raise typer.Exit on error.
     """
     try:
-        return call()
+        with phase("sdk_call"):
+            return call()
+    except typer.Exit:
+        raise
+    except Exception as e:
+        code = print_sdk_error(e, debug=_debug_enabled(ctx))
+        raise typer.Exit(code=code)
+
+
+async def call_sdk_async(ctx: CommandContext, call: Callable[[], Awaitable[T]]) -> T:
+    """
+    Await an async SDK call and raise typer.Exit on error.
+    """
+    try:
+        with phase("sdk_call"):
+            return await call()
     except typer.Exit:
         raise
     except Exception as e:
-        settings = getattr(ctx, "settings", None)
-        debug = bool(getattr(settings, "debug", False)) if settings is not None else False
-        code = print_sdk_error(e, debug=debug)
+        code = print_sdk_error(e, debug=_debug_enabled(ctx))
+        raise typer.Exit(code=code)
+
+
+def run_event_loop(main: Awaitable[T]) -> T:
+    """
+    Run a coroutine for a command; Ctrl-C cancels in-flight requests and
+    exits with code 130.
+    """
+    try:
+        return run_async(main)
+    except KeyboardInterrupt:
+        typer.echo("Interrupted", err=True)
+        raise typer.Exit(code=EXIT_INTERRUPTED)
+
+
+def run_many_and_render(
+    ctx: CommandContext,
+    calls: dict[Hashable, Callable[[], Awaitable[Any]]],
+    output: Optional[str],
+    concurrency: int = DEFAULT_CONCURRENCY,
+) -> dict[Hashable, Any]:
+    """
+    Execute async SDK calls concurrently and render `{key: result}`.
+
+    Every failure is reported on stderr with its key; successful results are
+    still written, then the command exits with the worst error code.
+    """
+    outcomes = run_event_loop(gather_outcomes(calls.items(), concurrency=concurrency))
+    results = {o.key: to_plain(o.value) for o in outcomes if o.ok}
+    debug = _debug_enabled(ctx)
+    for outcome in outcomes:
+        if not outcome.ok:
+            typer.echo(f"[{outcome.key}]", err=True)
+            print_sdk_error(outcome.error, debug=debug)
+    if results:
+        write_or_print(render_output(results, ctx.out_format), output)
+    code = worst_exit_code(outcomes)
+    if code:
         raise typer.Exit(code=code)
+    return results
 
 
 def run_and_render(
@@ -42,16 +112,43 @@ def run_and_render(
     return result
 
 
+def run_passthrough(
+    ctx: CommandContext,
+    call: Callable[[], object],
+    output: Optional[str],
+) -> None:
+    """
+    Execute SDK call and write the raw response body to file/stdout.
+    Falls back to JSON rendering if the body could not be captured.
+    """
+    result = call_sdk(ctx, lambda: capture_body(call))
+    if isinstance(result, bytes):
+        write_bytes_or_print(result, output)
+    else:
+        write_or_print(render_output(result, "json"), output)
+
+
 def run_and_render_with_mode(
     ctx: CommandContext,
     call: Callable[[], object],
     mode: str,
     output: Optional[str],
     raw_mode: str = "raw",
+    passthrough: bool = False,
 ) -> dict | None:
     """
     Execute SDK call and handle raw output. Returns a dict for further processing.
+
+    With `passthrough`, raw mode writes the HTTP response body as received
+    (JSON only), skipping model validation and re-serialization.
     """
+    if passthrough:
+        if mode != raw_mode:
+            raise typer.BadParameter(f"--passthrough requires --mode {raw_mode}")
+        if ctx.out_format != "json":
+            raise typer.BadParameter("--passthrough requires --format json")
+        run_passthrough(ctx, call, output)
+        return None
     result = call_sdk(ctx, call)
     if mode == raw_mode:
         rendered = render_output(result, ctx.out_format)
@@ -63,3 +160,46 @@ def run_and_render_with_mode(
         write_or_print(rendered, output)
         return None
     return data_dict
+
+
+def run_bulk_get(
+    ctx: CommandContext,
+    method: Callable[..., object],
+    entry_id: Optional[str],
+    ids_file: Optional[str],
+    output: Optional[str],
+    concurrency: int,
+    ordered: bool,
+    failed: Optional[str],
+    adaptive: bool = False,
+) -> None:
+    """
+    Fetch all ids from `--ids-file` concurrently through the SDK's async client.
+
+    Results are written as JSON Lines; exits with the worst error code if any
+    id failed. With `adaptive`, `concurrency` is the upper bound of an AIMD
+    controlled limit.
+    """
+    if not ids_file:
+        raise typer.BadParameter("Provide ENTRY_ID or --ids-file")
+    if entry_id:
+        raise typer.BadParameter("Use either ENTRY_ID or --ids-file, not both")
+    if concurrency <= 0:
+        raise typer.BadParameter("--concurrency must be positive")
+
+    fetch_async = resolve_async(method)
+    try:
+        result = run_bulk_fetch(
+            read_ids(ids_file),
+            lambda eid: fetch_async(entry_id=eid),
+            output,
+            concurrency=concurrency,
+            ordered=ordered,
+            failed_output=failed,
+            adaptive=adaptive,
+        )
+    except KeyboardInterrupt:
+        typer.echo("Interrupted", err=True)
+        raise typer.Exit(code=EXIT_INTERRUPTED)
+    if result.exit_code:
+        raise typer.Exit(code=result.exit_code)
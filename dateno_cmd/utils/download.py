@@ -0,0 +1,415 @@
+"""
+Streaming, resumable file downloads (stats export).
+
+The body is written in chunks to `<output>.part`. If that file already exists,
+the request is repeated with `Range: bytes=<size>-` and a 206 response is
+appended to it; a 200 response restarts from zero. The part file is renamed
+to the output (or compressed into it, see utils.io.COMPRESSION_SUFFIXES) only
+after the transfer and the optional checksum check succeed.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import inspect
+import os
+import re
+import sys
+import threading
+import time
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Optional, TextIO
+
+from dateno_cmd.utils.errors import UserInputError
+from dateno_cmd.utils.io import COMPRESSION_SUFFIXES, open_output
+
+
+CHUNK_SIZE = 1024 * 1024
+PART_SUFFIX = ".part"
+PROGRESS_INTERVAL_S = 0.5
+
+# Segmented downloads: parallel byte ranges, each at least this large.
+DEFAULT_SEGMENTS = 4
+MIN_SEGMENT_BYTES = 8 * 1024 * 1024
+
+_CONTENT_RANGE_RE = re.compile(r"bytes\s+(\d+)-\d+/(\d+|\*)")
+
+
+@dataclass
+class DownloadResult:
+    path: Path
+    bytes_written: int
+    resumed_from: int
+    elapsed_s: float
+    digest: Optional[str] = None
+
+
+def parse_checksum(value: Optional[str]) -> Optional[tuple[str, str]]:
+    """Parse `ALGO:HEX` (e.g. `sha256:ab12...`)."""
+    if not value:
+        return None
+    algo, sep, expected = value.partition(":")
+    algo = algo.strip().lower()
+    if not sep or not expected.strip():
+        raise UserInputError("Checksum must look like ALGO:HEX, e.g. sha256:ab12...")
+    if algo not in hashlib.algorithms_available:
+        raise UserInputError(f"Unsupported checksum algorithm: {algo}")
+    return algo, expected.strip().lower()
+
+
+def part_path(output: str | Path) -> Path:
+    return Path(str(output) + PART_SUFFIX)
+
+
+def accepts_http_headers(fn: Callable[..., Any]) -> bool:
+    """Generated SDK methods take extra request headers as `http_headers`."""
+    try:
+        return "http_headers" in inspect.signature(fn).parameters
+    except (TypeError, ValueError):
+        return False
+
+
+def range_headers_kwargs(fn: Callable[..., Any], offset: int) -> dict[str, Any]:
+    """
+    Keyword arguments asking the SDK method for bytes from `offset` on.
+
+    Returns {} if the method cannot send headers or nothing needs resuming.
+    """
+    if offset <= 0 or not accepts_http_headers(fn):
+        return {}
+    return {"http_headers": {"Range": f"bytes={offset}-"}}
+
+
+def _header(response: Any, name: str) -> Optional[str]:
+    headers = getattr(response, "headers", None)
+    if headers is None:
+        return None
+    return headers.get(name)
+
+
+def resume_offset(response: Any, requested: int) -> int:
+    """
+    Offset the response body starts at: `requested` for a matching 206,
+    otherwise 0 (the server sent the whole file).
+    """
+    if requested <= 0 or getattr(response, "status_code", 200) != 206:
+        return 0
+    match = _CONTENT_RANGE_RE.match(_header(response, "content-range") or "")
+    if match is None or int(match.group(1)) != requested:
+        return 0
+    return requested
+
+
+def expected_size(response: Any, offset: int) -> Optional[int]:
+    match = _CONTENT_RANGE_RE.match(_header(response, "content-range") or "")
+    if match is not None and match.group(2) != "*":
+        return int(match.group(2))
+    length = _header(response, "content-length")
+    return offset + int(length) if length and length.isdigit() else None
+
+
+def iter_body(response: Any, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """Body chunks of an httpx-like response; buffered results are a single chunk."""
+    iter_bytes = getattr(response, "iter_bytes", None)
+    if callable(iter_bytes):
+        yield from iter_bytes(chunk_size)
+        return
+    if hasattr(response, "read"):
+        response.read()
+    content = getattr(response, "content", b"")
+    if isinstance(content, bytes) and content:
+        yield content
+
+
+def _format_bytes(n: float) -> str:
+    if n < 1024:
+        return f"{int(n)} B"
+    for unit in ("KB", "MB"):
+        n /= 1024
+        if n < 1024:
+            return f"{n:.1f} {unit}"
+    return f"{n / 1024:.1f} GB"
+
+
+class Progress:
+    """Throughput line on stderr; redrawn in place on a terminal."""
+
+    def __init__(self, total: Optional[int], start: int = 0, stream: Optional[TextIO] = None) -> None:
+        self.total = total
+        self.done = start
+        self._start_bytes = start
+        self._stream = stream or sys.stderr
+        self._live = self._stream.isatty()
+        self._started = time.monotonic()
+        self._last = 0.0
+        self._lock = threading.Lock()
+
+    def update(self, n: int) -> None:
+        with self._lock:
+            self.done += n
+            now = time.monotonic()
+            if self._live and now - self._last >= PROGRESS_INTERVAL_S:
+                self._last = now
+                self._stream.write("\r" + self.line(now))
+                self._stream.flush()
+
+    def line(self, now: Optional[float] = None) -> str:
+        elapsed = max((now or time.monotonic()) - self._started, 1e-6)
+        rate = (self.done - self._start_bytes) / elapsed
+        done = _format_bytes(self.done)
+        if self.total:
+            pct = 100.0 * self.done / self.total
+            done = f"{done} / {_format_bytes(self.total)} ({pct:.0f}%)"
+        return f"{done} at {_format_bytes(rate)}/s"
+
+    def finish(self) -> None:
+        prefix = "\r" if self._live else ""
+        self._stream.write(f"{prefix}{self.line()}\n")
+        self._stream.flush()
+
+
+def _hash_file(path: Path, algo: str) -> Any:
+    h = hashlib.new(algo)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            h.update(chunk)
+    return h
+
+
+def _verify(
+    part: Path, output: Path, checksum: Optional[tuple[str, str]], digest: Optional[str]
+) -> None:
+    if checksum and digest != checksum[1]:
+        part.unlink(missing_ok=True)
+        raise UserInputError(
+            f"Checksum mismatch for {output}: expected {checksum[0]}:{checksum[1]}, got {digest}"
+        )
+
+
+def _close(response: Any) -> None:
+    close = getattr(response, "close", None)
+    if callable(close):
+        close()
+
+
+def _finalize(part: Path, output: Path) -> None:
+    if output.suffix.lower() not in COMPRESSION_SUFFIXES:
+        os.replace(part, output)
+        return
+    with open(part, "rb") as src, open_output(str(output), binary=True) as dst:
+        for chunk in iter(lambda: src.read(CHUNK_SIZE), b""):
+            dst.write(chunk)
+    part.unlink()
+
+
+def download_to_file(
+    response: Any,
+    output: str | Path,
+    requested_offset: int = 0,
+    checksum: Optional[tuple[str, str]] = None,
+    progress: bool = True,
+) -> DownloadResult:
+    """
+    Stream `response` into `<output>.part` and move it into place.
+
+    `requested_offset` is the Range start that was sent; the existing part
+    file is kept only if the server honoured it. Memory use is bounded by
+    the chunk size. On checksum mismatch the part file is removed and
+    UserInputError is raised.
+    """
+    output = Path(output)
+    part = part_path(output)
+    offset = resume_offset(response, requested_offset)
+    started = time.monotonic()
+
+    hasher = _hash_file(part, checksum[0]) if checksum and offset else None
+    if checksum and hasher is None:
+        hasher = hashlib.new(checksum[0])
+
+    meter = Progress(expected_size(response, offset), start=offset) if progress else None
+    written = 0
+    try:
+        with open(part, "ab" if offset else "wb") as f:
+            for chunk in iter_body(response):
+                f.write(chunk)
+                if hasher is not None:
+                    hasher.update(chunk)
+                written += len(chunk)
+                if meter is not None:
+                    meter.update(len(chunk))
+            f.flush()
+            os.fsync(f.fileno())
+    finally:
+        _close(response)
+        if meter is not None:
+            meter.finish()
+
+    digest = hasher.hexdigest() if hasher is not None else None
+    _verify(part, output, checksum, digest)
+    _finalize(part, output)
+    return DownloadResult(
+        path=output,
+        bytes_written=written,
+        resumed_from=offset,
+        elapsed_s=time.monotonic() - started,
+        digest=digest,
+    )
+
+
+class RangeNotSupported(Exception):
+    """A ranged request was answered with something other than that range."""
+
+
+def segment_ranges(size: int, segments: int) -> list[tuple[int, int]]:
+    """Split `size` bytes into at most `segments` inclusive (start, end) ranges."""
+    count = max(1, min(segments, size // MIN_SEGMENT_BYTES))
+    step = -(-size // count)
+    return [(start, min(start + step, size) - 1) for start in range(0, size, step)]
+
+
+def segmentable_size(response: Any) -> Optional[int]:
+    """Body size if the server accepts byte ranges and reports the length."""
+    if getattr(response, "status_code", None) != 200:
+        return None
+    if (_header(response, "accept-ranges") or "").strip().lower() != "bytes":
+        return None
+    length = _header(response, "content-length") or ""
+    return int(length) if length.isdigit() else None
+
+
+def _write_range(
+    response: Any, part: Path, start: int, end: int, meter: Optional[Progress]
+) -> None:
+    remaining = end - start + 1
+    try:
+        with open(part, "r+b") as f:
+            f.seek(start)
+            for chunk in iter_body(response):
+                chunk = chunk[:remaining]
+                f.write(chunk)
+                remaining -= len(chunk)
+                if meter is not None:
+                    meter.update(len(chunk))
+                if remaining <= 0:
+                    break
+    finally:
+        _close(response)
+    if remaining > 0:
+        raise ConnectionError(f"Range {start}-{end} ended {remaining} bytes early")
+
+
+def download_segmented(
+    method: Callable[..., Any],
+    params: dict[str, Any],
+    first_response: Any,
+    output: str | Path,
+    size: int,
+    segments: int,
+    checksum: Optional[tuple[str, str]] = None,
+    progress: bool = True,
+) -> DownloadResult:
+    """
+    Fetch `size` bytes as parallel Range requests into a preallocated part file.
+
+    The first range is read from `first_response` (a plain 200 response);
+    the others are requested concurrently through the SDK's pooled client.
+    Raises RangeNotSupported if a range request is not answered with 206.
+    """
+    output = Path(output)
+    part = part_path(output)
+    ranges = segment_ranges(size, segments)
+    started = time.monotonic()
+
+    with open(part, "wb") as f:
+        f.truncate(size)
+
+    meter = Progress(size) if progress else None
+
+    def _fetch(start: int, end: int) -> None:
+        resp = method(**params, http_headers={"Range": f"bytes={start}-{end}"})
+        resp = getattr(resp, "result", resp)
+        if resume_offset(resp, start) != start:
+            _close(resp)
+            raise RangeNotSupported(f"Server did not honour Range bytes={start}-{end}")
+        _write_range(resp, part, start, end, meter)
+
+    try:
+        with ThreadPoolExecutor(max_workers=len(ranges)) as pool:
+            futures = [pool.submit(_fetch, start, end) for start, end in ranges[1:]]
+            _write_range(first_response, part, *ranges[0], meter)
+            for future in futures:
+                future.result()
+        with open(part, "rb+") as f:
+            os.fsync(f.fileno())
+    except BaseException:
+        _close(first_response)
+        part.unlink(missing_ok=True)
+        raise
+    finally:
+        if meter is not None:
+            meter.finish()
+
+    digest = _hash_file(part, checksum[0]).hexdigest() if checksum else None
+    _verify(part, output, checksum, digest)
+    _finalize(part, output)
+    return DownloadResult(
+        path=output,
+        bytes_written=size,
+        resumed_from=0,
+        elapsed_s=time.monotonic() - started,
+        digest=digest,
+    )
+
+
+def fetch_to_file(
+    method: Callable[..., Any],
+    params: dict[str, Any],
+    output: str | Path,
+    resume: bool = True,
+    checksum: Optional[tuple[str, str]] = None,
+    progress: bool = True,
+    segments: int = 1,
+) -> DownloadResult:
+    """
+    Call a file-returning SDK method and stream its body to `output`,
+    resuming from an existing part file when possible.
+
+    With `segments > 1`, a fresh download of a large body from a server that
+    advertises `Accept-Ranges: bytes` and a Content-Length is split into
+    parallel range requests; otherwise it is a single stream.
+    """
+    part = part_path(output)
+    offset = part.stat().st_size if resume and part.exists() else 0
+    range_kwargs = range_headers_kwargs(method, offset)
+    if not range_kwargs:
+        offset = 0
+    try:
+        resp = method(**params, **range_kwargs)
+    except Exception as e:
+        # Stale or already complete part file: start over.
+        if not range_kwargs or getattr(e, "status_code", None) != 416:
+            raise
+        resp = method(**params)
+    body = getattr(resp, "result", resp)
+
+    size = segmentable_size(body) if segments > 1 and not offset else None
+    if size is not None and size >= 2 * MIN_SEGMENT_BYTES and accepts_http_headers(method):
+        try:
+            return download_segmented(
+                method, params, body, output, size, segments, checksum=checksum, progress=progress
+            )
+        except RangeNotSupported:
+            resp = method(**params)
+            body = getattr(resp, "result", resp)
+            offset = 0
+
+    return download_to_file(
+        body,
+        output,
+        requested_offset=offset,
+        checksum=checksum,
+        progress=progress,
+    )
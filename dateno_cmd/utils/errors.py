@@ -6,7 +6,6 @@ from dataclasses import dataclass
 from typing import Any
 
 import click
-import httpx
 import yaml
 
 from dateno_cmd.utils.serialization import to_plain
@@ -17,6 +16,7 @@ EXIT_INTERNAL = 1
 EXIT_USER = 2
 EXIT_NETWORK = 3
 EXIT_API = 4
+EXIT_INTERRUPTED = 130
 
 
 class UserInputError(RuntimeError):
@@ -45,6 +45,8 @@ def classify_error(e: Exception) -> ErrorInfo:
     if isinstance(e, UserInputError) or isinstance(e, click.BadParameter):
         return ErrorInfo(code=EXIT_USER, kind="User error", message=str(e))
 
+    import httpx
+
     if isinstance(e, httpx.RequestError):
         return ErrorInfo(code=EXIT_NETWORK, kind="Network error", message=str(e))
 
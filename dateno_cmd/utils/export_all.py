@@ -0,0 +1,155 @@
+"""
+Bulk export of every timeseries in a statsdb namespace.
+
+Series ids are streamed from the paged listing while up to `workers`
+downloads run on a thread pool; each outcome is written to an
+ExportManifest so a rerun skips completed series and retries failed ones.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+import threading
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import nullcontext
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Optional
+
+from dateno_cmd.services.manifest import (
+    STATUS_COMPLETED,
+    STATUS_FAILED,
+    STATUS_SKIPPED,
+    ExportManifest,
+)
+from dateno_cmd.utils.aimd import AIMDController
+from dateno_cmd.utils.errors import EXIT_OK, classify_error
+from dateno_cmd.utils.paging import iter_offset_pages
+
+
+DEFAULT_EXPORT_WORKERS = 4
+DEFAULT_LIST_PAGE_SIZE = 100
+
+# Keys a listed timeseries item may carry its id under.
+SERIES_ID_KEYS = ("ts_id", "id", "_id", "code")
+
+_UNSAFE_FILENAME_RE = re.compile(r"[^A-Za-z0-9._-]+")
+
+
+@dataclass
+class ExportAllResult:
+    completed: int = 0
+    failed: int = 0
+    skipped: int = 0
+    exit_code: int = EXIT_OK
+
+
+def series_id(item: Any) -> Optional[str]:
+    if not isinstance(item, dict):
+        return None
+    for key in SERIES_ID_KEYS:
+        value = item.get(key)
+        if value not in (None, ""):
+            return str(value)
+    return None
+
+
+def series_filename(ts_id: str, fileext: str) -> str:
+    """
+    File name for a series id, safe on any filesystem. Ids that had to be
+    rewritten get a short hash suffix so they cannot collide.
+    """
+    stem = _UNSAFE_FILENAME_RE.sub("_", ts_id).strip("._") or "series"
+    if stem != ts_id:
+        stem = f"{stem}-{hashlib.sha1(ts_id.encode('utf-8')).hexdigest()[:8]}"
+    return f"{stem}.{fileext.lstrip('.')}"
+
+
+def iter_series_ids(
+    list_page: Callable[[int, int], object],
+    page_size: int = DEFAULT_LIST_PAGE_SIZE,
+) -> Iterator[str]:
+    """Walk a start/limit listing and yield each series id once."""
+    seen: set[str] = set()
+    for page in iter_offset_pages(list_page, page_size=page_size):
+        for item in page:
+            ts_id = series_id(item)
+            if ts_id is not None and ts_id not in seen:
+                seen.add(ts_id)
+                yield ts_id
+
+
+def export_all(
+    ids: Iterable[str],
+    export_one: Callable[[str, Path], Any],
+    directory: Path,
+    fileext: str,
+    manifest: ExportManifest,
+    workers: int = DEFAULT_EXPORT_WORKERS,
+    controller: Optional[AIMDController] = None,
+) -> ExportAllResult:
+    """
+    Run `export_one(ts_id, target_path)` for every id not yet finished.
+
+    Series completed or skipped in the manifest are not fetched again; a
+    target file that already exists without a manifest entry is recorded as
+    skipped. On KeyboardInterrupt queued downloads are cancelled and running
+    ones keep their part files for the next run. With a `controller` the
+    number of downloads running at once follows it (up to `workers`).
+    """
+    result = ExportAllResult()
+    finished = manifest.finished_ids()
+    directory.mkdir(parents=True, exist_ok=True)
+    lock = threading.Lock()
+
+    def _one(ts_id: str, target: Path) -> None:
+        try:
+            with controller or nullcontext():
+                download = export_one(ts_id, target)
+        except Exception as e:
+            if controller is not None:
+                controller.observe_error(e)
+            info = classify_error(e)
+            manifest.record(
+                ts_id,
+                STATUS_FAILED,
+                path=str(target),
+                error=f"{info.kind}: {info.message or type(e).__name__}",
+            )
+            with lock:
+                result.failed += 1
+                result.exit_code = max(result.exit_code, info.code)
+            return
+        manifest.record(
+            ts_id,
+            STATUS_COMPLETED,
+            path=str(target),
+            size=getattr(download, "bytes_written", None),
+        )
+        with lock:
+            result.completed += 1
+
+    pool = ThreadPoolExecutor(max_workers=max(1, workers))
+    pending: set[Future] = set()
+    try:
+        for ts_id in ids:
+            if ts_id in finished:
+                result.skipped += 1
+                continue
+            target = directory / series_filename(ts_id, fileext)
+            if target.exists():
+                manifest.record(ts_id, STATUS_SKIPPED, path=str(target), size=target.stat().st_size)
+                result.skipped += 1
+                continue
+            pending.add(pool.submit(_one, ts_id, target))
+            # Keep the queue short so listing and downloading overlap.
+            if len(pending) >= 2 * max(1, workers):
+                _, pending = wait(pending, return_when=FIRST_COMPLETED)
+        wait(pending)
+    except BaseException:
+        pool.shutdown(wait=True, cancel_futures=True)
+        raise
+    pool.shutdown(wait=True)
+    return result
@@ -0,0 +1,276 @@
+"""
+Facet-partitioned harvesting of large search result sets.
+
+Offset paging stops at the index's result window, so a query with more hits
+than that cannot be read to the end. The planner splits the query into
+filter partitions, one facet at a time (catalog type, then country, ...),
+until every partition fits in the window; partitions are then paged
+concurrently and hits are de-duplicated by id, since multi-valued facets
+(a dataset listed under several countries) make partitions overlap.
+
+Hits without a value for the split facet, or with a value outside the
+buckets the API returned (aggregations list the top values only), fall in no
+child partition. The planner compares the children's totals with their
+parent's and records any shortfall as a remainder partition: no filter
+selects exactly those hits, so the parent query itself is paged up to the
+window and reported as truncated.
+"""
+
+from __future__ import annotations
+
+import queue
+import threading
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Executor, ThreadPoolExecutor
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from dateno_cmd.utils.aimd import AIMDController
+from dateno_cmd.utils.search import extract_total, hit_id
+
+
+DEFAULT_SPLIT_KEYS = ("source.catalog_type", "source.countries.name", "source.uid")
+DEFAULT_RESULT_WINDOW = 10_000
+DEFAULT_HARVEST_WORKERS = 4
+
+# Keys a facet value may be given under in facet and aggregation responses.
+_VALUE_KEYS = ("key", "value", "name", "id")
+_COUNT_KEYS = ("doc_count", "count", "total")
+
+
+@dataclass(frozen=True)
+class Partition:
+    filters: tuple[str, ...]
+    total: int
+    # More hits than the result window and no facet left to split on.
+    truncated: bool = False
+    # Hits of these filters not covered by the partitions split from it;
+    # paged from the unsplit filters, so only those within the window are read.
+    remainder: bool = False
+
+
+@dataclass
+class HarvestPlan:
+    total: Optional[int]
+    partitions: list[Partition] = field(default_factory=list)
+    probes: int = 0
+
+    @property
+    def truncated(self) -> list[Partition]:
+        return [p for p in self.partitions if p.truncated]
+
+
+def _bucket_value(bucket: Any) -> Optional[str]:
+    if isinstance(bucket, (str, int, float)) and not isinstance(bucket, bool):
+        return str(bucket)
+    if isinstance(bucket, dict):
+        for key in _VALUE_KEYS:
+            if bucket.get(key) not in (None, ""):
+                return str(bucket[key])
+    return None
+
+
+def _bucket_count(bucket: Any) -> Optional[int]:
+    if isinstance(bucket, dict):
+        for key in _COUNT_KEYS:
+            if isinstance(bucket.get(key), int):
+                return bucket[key]
+    return None
+
+
+def _bucket_list(data: Any) -> list[Any]:
+    if isinstance(data, list):
+        return data
+    if isinstance(data, dict):
+        for key in ("buckets", "values", "items", "data", "results"):
+            if isinstance(data.get(key), (list, dict)):
+                return _bucket_list(data[key])
+        # {"value": count, ...}
+        if data and all(isinstance(v, int) for v in data.values()):
+            return [{"key": k, "doc_count": v} for k, v in data.items()]
+    return []
+
+
+def facet_values(data: Any) -> list[str]:
+    """Values from a get_search_facet_values response, in response order."""
+    values = (_bucket_value(b) for b in _bucket_list(data))
+    return list(dict.fromkeys(v for v in values if v is not None))
+
+
+def bucket_counts(data_dict: Any, key: str) -> Optional[dict[str, int]]:
+    """
+    Per-value hit counts for facet `key` from a search response's
+    aggregations, or None if the response has no usable aggregation for it.
+    """
+    if not isinstance(data_dict, dict):
+        return None
+    aggs = data_dict.get("aggregations") or data_dict.get("facets")
+    if not isinstance(aggs, dict):
+        return None
+    agg = aggs.get(key)
+    if agg is None:
+        # Aggregations may be named after the last path component.
+        short = key.rsplit(".", 1)[-1]
+        agg = next((v for k, v in aggs.items() if k in (short, key.replace(".", "_"))), None)
+    if agg is None:
+        return None
+    counts: dict[str, int] = {}
+    for bucket in _bucket_list(agg):
+        value, count = _bucket_value(bucket), _bucket_count(bucket)
+        if value is None or count is None:
+            return None
+        counts[value] = counts.get(value, 0) + count
+    return counts
+
+
+def plan_partitions(
+    probe: Callable[[tuple[str, ...]], object],
+    values_for: Callable[[str], list[str]],
+    base_filters: Iterable[str] = (),
+    split_keys: Iterable[str] = DEFAULT_SPLIT_KEYS,
+    window: int = DEFAULT_RESULT_WINDOW,
+    executor: Optional[Executor] = None,
+) -> HarvestPlan:
+    """
+    Split a query into partitions of at most `window` hits.
+
+    `probe(filters)` runs the query with facets and returns the plain
+    response; bucket counts come from its aggregations when present, otherwise
+    the facet's values come from `values_for(key)` and each child is probed
+    for its total. Partitions are probed level by level, concurrently on
+    `executor`. Empty partitions are dropped. When the children of a split
+    partition add up to fewer hits than it has, the difference becomes a
+    truncated remainder partition with the parent's filters.
+    """
+    if window <= 0:
+        raise ValueError("window must be positive")
+    keys = list(split_keys)
+    base = tuple(base_filters)
+    plan = HarvestPlan(total=None)
+    values_cache: dict[str, list[str]] = {}
+
+    def _run(nodes: list[tuple[tuple[str, ...], int]]) -> list[object]:
+        plan.probes += len(nodes)
+        if executor is None:
+            return [probe(filters) for filters, _ in nodes]
+        return list(executor.map(lambda node: probe(node[0]), nodes))
+
+    # Split partitions: [filters, total, hits not yet found in children or
+    # None once a child's total is unknown].
+    parents: list[list[Any]] = []
+
+    # (filters, depth, known total, index of the split parent)
+    level: list[tuple[tuple[str, ...], int, Optional[int], Optional[int]]] = [(base, 0, None, None)]
+    while level:
+        needs_probe = [
+            (filters, depth)
+            for filters, depth, total, _ in level
+            if total is None or (total > window and depth < len(keys))
+        ]
+        responses = dict(zip(needs_probe, _run(needs_probe)))
+        next_level: list[tuple[tuple[str, ...], int, Optional[int], Optional[int]]] = []
+        for filters, depth, known, parent in level:
+            data = responses.get((filters, depth))
+            total = extract_total(data) if data is not None else known
+            if total is None:
+                total = known
+            if depth == 0 and filters == base:
+                plan.total = total
+            if parent is not None and parents[parent][2] is not None:
+                parents[parent][2] = None if total is None else parents[parent][2] - total
+            if total is None or total <= window:
+                if total is None or total > 0:
+                    plan.partitions.append(Partition(filters, total or 0))
+                continue
+            if depth >= len(keys):
+                plan.partitions.append(Partition(filters, total, truncated=True))
+                continue
+            key = keys[depth]
+            counts = bucket_counts(data, key)
+            if counts is None:
+                if key not in values_cache:
+                    values_cache[key] = values_for(key)
+                children: dict[str, Optional[int]] = dict.fromkeys(values_cache[key])
+            else:
+                children = dict(counts)
+            if not children:
+                # Nothing to split on at this level; try the next facet.
+                next_level.append((filters, depth + 1, total, None))
+                continue
+            parents.append([filters, total, total])
+            for value, count in children.items():
+                if count != 0:
+                    child = ((*filters, f"{key}={value}"), depth + 1, count, len(parents) - 1)
+                    next_level.append(child)
+        level = next_level
+    for filters, _, missing in parents:
+        # Negative with multi-valued facets, where children overlap.
+        if missing is not None and missing > 0:
+            plan.partitions.append(Partition(filters, missing, truncated=True, remainder=True))
+    return plan
+
+
+def harvest_pages(
+    fetch_pages: Callable[[Partition], Iterator[list[dict]]],
+    partitions: list[Partition],
+    workers: int = DEFAULT_HARVEST_WORKERS,
+    controller: Optional[AIMDController] = None,
+) -> Iterator[list[dict]]:
+    """
+    Page all partitions, `workers` at a time (or as many as `controller`
+    allows), and yield pages of hits not seen before (by id) as they
+    arrive. The first failure is re-raised after the running partitions stop.
+    """
+    pages: queue.Queue = queue.Queue(maxsize=2 * max(1, workers))
+    stop = threading.Event()
+    done = object()
+
+    def _put(item: Any) -> None:
+        while not stop.is_set():
+            try:
+                pages.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def _one(partition: Partition) -> None:
+        try:
+            with controller or nullcontext():
+                for page in fetch_pages(partition):
+                    if stop.is_set():
+                        return
+                    _put(page)
+        except BaseException as e:
+            if controller is not None:
+                controller.observe_error(e)
+            _put(e)
+        finally:
+            _put(done)
+
+    seen: set[str] = set()
+    pool = ThreadPoolExecutor(max_workers=max(1, workers))
+    try:
+        for partition in partitions:
+            pool.submit(_one, partition)
+        remaining = len(partitions)
+        while remaining:
+            item = pages.get()
+            if item is done:
+                remaining -= 1
+                continue
+            if isinstance(item, BaseException):
+                raise item
+            fresh = []
+            for hit in item:
+                entry_id = hit_id(hit)
+                if entry_id is None:
+                    fresh.append(hit)
+                elif entry_id not in seen:
+                    seen.add(entry_id)
+                    fresh.append(hit)
+            if fresh:
+                yield fresh
+    finally:
+        stop.set()
+        pool.shutdown(wait=True, cancel_futures=True)
@@ -2,27 +2,218 @@
 
 from __future__ import annotations
 
+import bz2
 import csv
+import gzip
+import io
+import json
+import os
+import sys
+import tempfile
+from collections.abc import Iterator
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Iterable, Optional
+from typing import IO, Any, BinaryIO, Iterable, Optional
 
 import typer
 
+from dateno_cmd.utils import profiling
+from dateno_cmd.utils.errors import UserInputError
+
+
+COMPRESSION_SUFFIXES = (".gz", ".bz2", ".zst")
+
+
+def data_suffix(path: str) -> str:
+    """Lowercase extension of `path` ignoring a compression suffix ("x.jsonl.gz" -> ".jsonl")."""
+    name = Path(path).name.lower()
+    for suffix in COMPRESSION_SUFFIXES:
+        if name.endswith(suffix):
+            name = name[: -len(suffix)]
+            break
+    return Path(name).suffix
+
+
+def _compressing_writer(raw: BinaryIO, suffix: str) -> BinaryIO:
+    """
+    Wrap a binary file in a compressor chosen by file extension.
+    The wrapper must not close `raw` when it is closed.
+    """
+    if suffix == ".gz":
+        return gzip.GzipFile(fileobj=raw, mode="wb")  # type: ignore[return-value]
+    if suffix == ".bz2":
+        return bz2.BZ2File(raw, mode="wb")  # type: ignore[return-value]
+    if suffix == ".zst":
+        try:
+            from compression import zstd  # type: ignore[import-not-found]
+
+            return zstd.ZstdFile(raw, mode="wb")
+        except ImportError:
+            pass
+        try:
+            import zstandard
+        except ImportError as e:
+            raise UserInputError(
+                "Writing .zst files requires the 'zstandard' package "
+                "(pip install 'dateno-cmd[zstd]')."
+            ) from e
+        return zstandard.ZstdCompressor().stream_writer(raw, closefd=False)
+    return raw
+
+
+def _read_umask() -> int:
+    # os.umask() can only be read by setting it, which races with files
+    # created by other threads; read it once, from /proc where available.
+    try:
+        with open("/proc/self/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("Umask:"):
+                    return int(line.split()[1], 8)
+    except (OSError, ValueError, IndexError):
+        pass
+    umask = os.umask(0o022)
+    os.umask(umask)
+    return umask
+
+
+_UMASK = _read_umask()
+
+
+def _apply_umask(path: str) -> None:
+    # mkstemp creates files with 0600; use the same mode as open() would.
+    os.chmod(path, 0o666 & ~_UMASK)
+
+
+@contextmanager
+def atomic_output(output: str) -> Iterator[BinaryIO]:
+    """
+    Open a binary stream that replaces `output` only after a successful write.
+
+    Data goes to a temporary file next to the target, compressed according
+    to the extension (.gz, .bz2, .zst), and is renamed over the target on
+    success. On error the temporary file is removed and the target is left
+    untouched.
+    """
+    target = Path(output).expanduser()
+    fd, tmp = tempfile.mkstemp(
+        prefix=f".{target.name}.", suffix=".tmp", dir=str(target.parent)
+    )
+    raw = os.fdopen(fd, "wb")
+    try:
+        stream = _compressing_writer(raw, target.suffix.lower())
+        yield stream
+        if stream is not raw:
+            stream.close()
+        raw.close()
+        _apply_umask(tmp)
+        os.replace(tmp, target)
+    except BaseException:
+        raw.close()
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+@contextmanager
+def open_output(output: Optional[str], binary: bool = False) -> Iterator[IO[Any]]:
+    """
+    Open output for incremental writing, or yield stdout.
+
+    Files are written atomically and compressed by extension, see
+    atomic_output(). Text streams are UTF-8 without newline translation.
+    """
+    if not output:
+        yield sys.stdout.buffer if binary else sys.stdout
+        return
+    with atomic_output(output) as stream:
+        if binary:
+            yield stream
+            return
+        text = io.TextIOWrapper(stream, encoding="utf-8", newline="")
+        try:
+            yield text
+        finally:
+            text.flush()
+            text.detach()
+
 
 def write_or_print(rendered: str, output: Optional[str]) -> None:
+    with profiling.phase("write"):
+        if output:
+            with open_output(output) as f:
+                f.write(rendered)
+        else:
+            print(rendered)
+    if output:
+        print(f"Results saved to {output}")
+
+
+def write_bytes_or_print(content: bytes, output: Optional[str]) -> None:
+    """
+    Write raw bytes to file or stdout without decoding/re-encoding.
+    """
+    with profiling.phase("write"):
+        if output:
+            with open_output(output, binary=True) as f:
+                f.write(content)
+        else:
+            sys.stdout.flush()
+            sys.stdout.buffer.write(content)
+            sys.stdout.buffer.flush()
     if output:
-        Path(output).write_text(rendered, encoding="utf-8")
         print(f"Results saved to {output}")
-    else:
-        print(rendered)
 
 
 def write_csv(headers: Iterable[str], rows: Iterable[Iterable[object]], output: str) -> None:
-    with open(output, "w", encoding="utf-8", newline="") as f:
-        writer = csv.writer(f)
+    stream_csv(headers, rows, output)
+
+
+def stream_csv(headers: Iterable[str], rows: Iterable[Iterable[object]], output: Optional[str]) -> int:
+    """
+    Write CSV rows one by one without materializing them. Returns row count.
+    """
+    count = 0
+    with open_output(output) as f:
+        # stdout is a text stream with newline translation; avoid "\r\n" there.
+        writer = csv.writer(f) if output else csv.writer(f, lineterminator="\n")
         writer.writerow(list(headers))
-        writer.writerows(list(rows))
-    print(f"Results saved to {output}")
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    profiling.count("rows", count)
+    if output:
+        print(f"Results saved to {output}")
+    return count
+
+
+def stream_jsonl(records: Iterable[object], output: Optional[str]) -> int:
+    """
+    Write records as JSON Lines one by one. Returns record count.
+    """
+    count = 0
+    with open_output(output) as f:
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=False, default=str))
+            f.write("\n")
+            count += 1
+    profiling.count("rows", count)
+    if output:
+        print(f"Results saved to {output}")
+    return count
+
+
+def read_ids(source: str) -> list[str]:
+    """
+    Read ids one per line from a file, or from stdin when source is '-'.
+    Blank lines and lines starting with '#' are skipped.
+    """
+    if source == "-":
+        lines = sys.stdin.read().splitlines()
+    else:
+        p = Path(source).expanduser()
+        if not p.exists():
+            raise typer.BadParameter(f"Ids file not found: {p}")
+        lines = p.read_text(encoding="utf-8").splitlines()
+    return [line.strip() for line in lines if line.strip() and not line.lstrip().startswith("#")]
 
 
 def load_json_arg(value: str) -> object:
@@ -0,0 +1,260 @@
+"""Auto-pagination helpers for list/search endpoints."""
+
+from __future__ import annotations
+
+import copy
+from collections.abc import Callable, Iterator
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from typing import Any, Optional
+
+from dateno_cmd.utils.search import extract_hits_list, extract_total
+
+
+DEFAULT_PIT_KEEP_ALIVE = "1m"
+
+
+class PagingError(RuntimeError):
+    """Raised when a paged response cannot be continued."""
+
+
+def _iter_prefetched(
+    fetch: Callable[[Any], object],
+    first_request: Any,
+    next_request: Callable[[object, list[dict]], Any],
+    prefetch: bool,
+) -> Iterator[list[dict]]:
+    """
+    Drive a paging loop, fetching the next page on a worker thread while the
+    caller processes the current one.
+
+    `next_request(data_dict, hits)` returns the request for the following page
+    or None to stop. It is called before the current page is yielded.
+    """
+    executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+    pending: Optional[Future] = None
+
+    def _submit(request: Any) -> Future:
+        if executor is not None:
+            return executor.submit(fetch, request)
+        fut: Future = Future()
+        fut.set_result(fetch(request))
+        return fut
+
+    try:
+        if first_request is None:
+            return
+        pending = _submit(first_request)
+        while pending is not None:
+            data_dict = pending.result()
+            pending = None
+            hits = extract_hits_list(data_dict)
+            try:
+                request = next_request(data_dict, hits)
+            except Exception:
+                # Hand out what was fetched before reporting the failure.
+                if hits:
+                    yield hits
+                raise
+            if request is not None:
+                pending = _submit(request)
+            if hits:
+                yield hits
+    finally:
+        if pending is not None:
+            pending.cancel()
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+def iter_offset_pages(
+    fetch: Callable[[int, int], object],
+    offset: int = 0,
+    page_size: int = 10,
+    max_results: Optional[int] = None,
+    prefetch: bool = True,
+) -> Iterator[list[dict]]:
+    """
+    Iterate over hit pages of an offset/limit endpoint.
+
+    `fetch(offset, limit)` must return a plain dict response. While the caller
+    processes the current page, the next one is fetched on a worker thread, so
+    request latency overlaps with rendering/writing. Stops on a short page,
+    on the reported total or once `max_results` hits were yielded.
+    """
+    if page_size <= 0:
+        raise ValueError("page_size must be positive")
+
+    state = {"offset": offset, "yielded": 0, "limit": 0}
+
+    def _limit() -> int:
+        if max_results is None:
+            return page_size
+        return min(page_size, max_results - state["yielded"])
+
+    def _request() -> tuple[int, int] | None:
+        limit = _limit()
+        if limit <= 0:
+            return None
+        state["limit"] = limit
+        return state["offset"], limit
+
+    def _next(data_dict: object, hits: list[dict]) -> tuple[int, int] | None:
+        limit = state["limit"]
+        del hits[limit:]
+        state["yielded"] += len(hits)
+        state["offset"] += len(hits)
+        if not hits or len(hits) < limit:
+            return None
+        total = extract_total(data_dict)
+        if total is not None and state["offset"] >= total:
+            return None
+        return _request()
+
+    return _iter_prefetched(
+        lambda req: fetch(*req),
+        _request(),
+        _next,
+        prefetch,
+    )
+
+
+def fetch_offset_pages_concurrently(
+    fetch: Callable[[int, int], object],
+    page_size: int,
+    executor: Executor,
+) -> list[dict]:
+    """
+    Fetch every hit of an offset/limit endpoint, in order.
+
+    The first page tells the total; the remaining pages are then requested
+    concurrently on `executor`. Without a total it falls back to sequential
+    prefetched paging.
+    """
+    if page_size <= 0:
+        raise ValueError("page_size must be positive")
+    first = fetch(0, page_size)
+    hits = extract_hits_list(first)[:page_size]
+    total = extract_total(first)
+    if len(hits) < page_size:
+        return hits
+    if total is None:
+        for page in iter_offset_pages(fetch, offset=len(hits), page_size=page_size):
+            hits.extend(page)
+        return hits
+    futures = [
+        executor.submit(fetch, offset, page_size)
+        for offset in range(page_size, total, page_size)
+    ]
+    try:
+        for future in futures:
+            hits.extend(extract_hits_list(future.result())[:page_size])
+    finally:
+        for future in futures:
+            future.cancel()
+    return hits
+
+
+def prepare_search_after_body(
+    body: dict, page_size: int, tiebreaker: Optional[str] = None
+) -> dict:
+    """
+    Make a DSL body suitable for search_after paging.
+
+    Drops `from`, sets `size` and makes sure the sort is total. With a
+    point-in-time (`pit`) the backend adds the implicit `_shard_doc`
+    tiebreaker; otherwise `tiebreaker` must name a unique sort field
+    (`_id` is not sortable on Elasticsearch 8 by default), unless the
+    body's sort already ends with `_shard_doc`.
+    """
+    prepared = copy.deepcopy(body)
+    prepared.pop("from", None)
+    prepared.pop("search_after", None)
+    prepared["size"] = page_size
+
+    sort = prepared.get("sort")
+    if sort is None:
+        sort = [{"_score": "desc"}]
+    elif not isinstance(sort, list):
+        sort = [sort]
+
+    def _sort_key(entry: Any) -> str:
+        if isinstance(entry, dict) and entry:
+            return str(next(iter(entry)))
+        return str(entry)
+
+    sort_keys = [_sort_key(e) for e in sort]
+    if tiebreaker:
+        if tiebreaker not in sort_keys:
+            sort = [*sort, {tiebreaker: "asc"}]
+    elif "pit" not in prepared and "_shard_doc" not in sort_keys:
+        raise ValueError(
+            "search_after paging needs a stable sort: add a 'pit' clause to the "
+            "body or name a unique sort field as tiebreaker"
+        )
+    prepared["sort"] = sort
+
+    pit = prepared.get("pit")
+    if isinstance(pit, dict):
+        pit.setdefault("keep_alive", DEFAULT_PIT_KEEP_ALIVE)
+    return prepared
+
+
+def iter_search_after_pages(
+    fetch: Callable[[dict], object],
+    body: dict,
+    page_size: int = 100,
+    max_results: Optional[int] = None,
+    prefetch: bool = True,
+    tiebreaker: Optional[str] = None,
+) -> Iterator[list[dict]]:
+    """
+    Iterate over hit pages of a DSL search using `search_after` cursors.
+
+    Each request reuses the sort values of the previous page's last hit, so
+    the cost per page does not grow with depth and the backend's offset
+    window does not apply. If responses carry a `pit_id`, it is forwarded to
+    the next request to keep the point-in-time alive. A full page whose last
+    hit has no `sort` values raises PagingError instead of silently stopping.
+    """
+    if page_size <= 0:
+        raise ValueError("page_size must be positive")
+
+    base = prepare_search_after_body(body, page_size, tiebreaker)
+    state = {"yielded": 0, "size": page_size}
+
+    def _size() -> int:
+        if max_results is None:
+            return page_size
+        return min(page_size, max_results - state["yielded"])
+
+    def _first() -> dict | None:
+        size = _size()
+        if size <= 0:
+            return None
+        state["size"] = size
+        return {**base, "size": size}
+
+    def _next(data_dict: object, hits: list[dict]) -> dict | None:
+        size = state["size"]
+        del hits[size:]
+        state["yielded"] += len(hits)
+        if not hits or len(hits) < size:
+            return None
+        size = _size()
+        if size <= 0:
+            return None
+        last = hits[-1]
+        cursor = last.get("sort") if isinstance(last, dict) else None
+        if not isinstance(cursor, list) or not cursor:
+            raise PagingError(
+                f"Cannot continue paging after {state['yielded']} hits: "
+                "the last hit has no 'sort' values"
+            )
+        state["size"] = size
+        request = {**base, "size": size, "search_after": cursor}
+        pit_id = data_dict.get("pit_id") if isinstance(data_dict, dict) else None
+        if pit_id and isinstance(base.get("pit"), dict):
+            request["pit"] = {**base["pit"], "id": pit_id}
+        return request
+
+    return _iter_prefetched(fetch, _first(), _next, prefetch)
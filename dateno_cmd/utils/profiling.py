@@ -0,0 +1,128 @@
+"""
+Per-phase timing profile for a command (`dateno --profile ...`).
+
+Instrumented code wraps its work in `phase(name)` and bumps counters with
+`count(name, n)`; both are no-ops unless a profile was started, so the hooks
+can stay in hot paths. Phase times are summed across threads, so phases run
+by concurrent workers can add up to more than the wall-clock total.
+
+Phases recorded by the CLI:
+  startup     interpreter start of the CLI module to the command callback
+  settings    settings/YAML loading
+  sdk_init    SDK and HTTP client construction
+  sdk_call    SDK calls (HTTP round trips plus response model validation)
+  http        request sent to response body read, from the HTTP client hooks
+  to_plain    model -> plain Python conversion
+  render      YAML/JSON/table rendering
+  write       writing rendered output
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any, Optional
+
+
+class Profile:
+    """Accumulated phase timings and counters; safe to share between threads."""
+
+    def __init__(self, started: Optional[float] = None) -> None:
+        self.started = time.monotonic() if started is None else started
+        self.phases: dict[str, list[float]] = {}
+        self.counters: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def add_time(self, name: str, seconds: float, calls: int = 1) -> None:
+        with self._lock:
+            entry = self.phases.setdefault(name, [0.0, 0])
+            entry[0] += seconds
+            entry[1] += calls
+
+    def count(self, name: str, n: int = 1) -> None:
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def report(self, command: Optional[list[str]] = None) -> dict[str, Any]:
+        with self._lock:
+            phases = {
+                name: {"seconds": round(seconds, 6), "calls": calls}
+                for name, (seconds, calls) in self.phases.items()
+            }
+            counters = dict(self.counters)
+        report: dict[str, Any] = {
+            "total_seconds": round(time.monotonic() - self.started, 6),
+            "phases": phases,
+            "counters": counters,
+        }
+        if command is not None:
+            report["command"] = command
+        if "sdk_call" in phases and "http" in phases:
+            # What the SDK spends outside the network: JSON decoding and
+            # model validation.
+            report["derived"] = {
+                "sdk_validation_seconds": round(
+                    max(0.0, phases["sdk_call"]["seconds"] - phases["http"]["seconds"]), 6
+                )
+            }
+        return report
+
+
+_active: Optional[Profile] = None
+
+
+def start(started: Optional[float] = None) -> Profile:
+    global _active
+    _active = Profile(started)
+    return _active
+
+
+def stop() -> Optional[Profile]:
+    global _active
+    profile, _active = _active, None
+    return profile
+
+
+def active() -> Optional[Profile]:
+    return _active
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    profile = _active
+    if profile is None:
+        yield
+        return
+    t0 = time.monotonic()
+    try:
+        yield
+    finally:
+        profile.add_time(name, time.monotonic() - t0)
+
+
+def count(name: str, n: int = 1) -> None:
+    profile = _active
+    if profile is not None:
+        profile.count(name, n)
+
+
+def format_report(report: dict[str, Any]) -> str:
+    """Human-readable report for stderr."""
+    lines = [f"profile: total {report['total_seconds']:.3f}s"]
+    for name, entry in report["phases"].items():
+        lines.append(f"  {name:<16} {entry['seconds']:>9.3f}s  x{entry['calls']}")
+    for name, seconds in report.get("derived", {}).items():
+        label = name.removesuffix("_seconds")
+        lines.append(f"  {label:<16} {seconds:>9.3f}s  (sdk_call - http)")
+    for name, value in report["counters"].items():
+        lines.append(f"  {name:<16} {value:>10}")
+    return "\n".join(lines)
+
+
+def write_report(report: dict[str, Any], path: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+        f.write("\n")
@@ -0,0 +1,116 @@
+"""
+Field projection for tabular (results mode) output.
+
+Header paths are compiled once into direct getters instead of flattening
+every document. Supported path syntax:
+  - dotted keys: `dataset.title`
+  - list index: `source.topics[0]`, negative indexes count from the end
+  - list wildcard: `source.topics[*]`, `dataset.resources[*].url`
+
+Values collected through a wildcard are joined with `joiner` into one cell.
+Missing paths and null values yield an empty string.
+"""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from typing import Any
+
+from dateno_cmd.utils.search import extract_doc_from_item
+
+
+DEFAULT_JOINER = "; "
+
+_MISSING = object()
+_STEP_RE = re.compile(r"([^.\[\]]+)|\[(\*|-?\d+)\]")
+
+
+def parse_headers(headers: str) -> list[str]:
+    """Split a comma-separated --headers value."""
+    return [h.strip() for h in headers.split(",") if h.strip()]
+
+
+def _parse_path(path: str) -> list[tuple[str, Any]]:
+    steps: list[tuple[str, Any]] = []
+    pos = 0
+    for m in _STEP_RE.finditer(path):
+        gap = path[pos : m.start()]
+        if gap.strip(".") or ".." in gap:
+            raise ValueError(f"Invalid field path: {path!r}")
+        key, index = m.groups()
+        if key is not None:
+            steps.append(("key", key))
+        elif index == "*":
+            steps.append(("all", None))
+        else:
+            steps.append(("index", int(index)))
+        pos = m.end()
+    if not steps or path[pos:].strip("."):
+        raise ValueError(f"Invalid field path: {path!r}")
+    return steps
+
+
+def _compile(path: str, joiner: str) -> Callable[[Any], Any]:
+    steps = _parse_path(path)
+    fan_out = any(kind == "all" for kind, _ in steps)
+
+    def _walk(value: Any, i: int, out: list[Any]) -> Any:
+        while i < len(steps):
+            kind, arg = steps[i]
+            if kind == "key":
+                if not isinstance(value, dict):
+                    return _MISSING
+                value = value.get(arg, _MISSING)
+            elif kind == "index":
+                if not isinstance(value, list) or not -len(value) <= arg < len(value):
+                    return _MISSING
+                value = value[arg]
+            else:
+                if not isinstance(value, list):
+                    return _MISSING
+                for item in value:
+                    _walk(item, i + 1, out)
+                return _MISSING
+            if value is _MISSING:
+                return _MISSING
+            i += 1
+        out.append(value)
+        return value
+
+    if not fan_out:
+
+        def _get(doc: Any) -> Any:
+            value = _walk(doc, 0, [])
+            return "" if value is _MISSING or value is None else value
+
+        return _get
+
+    def _get_all(doc: Any) -> Any:
+        out: list[Any] = []
+        _walk(doc, 0, out)
+        return joiner.join(str(v) for v in out if v is not None)
+
+    return _get_all
+
+
+class Projection:
+    """Compiled list of header paths applied to documents."""
+
+    def __init__(self, headers: Sequence[str], joiner: str = DEFAULT_JOINER) -> None:
+        self.headers = list(headers)
+        self._getters = [_compile(h, joiner) for h in self.headers]
+
+    def row(self, doc: Any) -> list[Any]:
+        return [get(doc) for get in self._getters]
+
+    def record(self, doc: Any) -> dict[str, Any]:
+        return dict(zip(self.headers, self.row(doc)))
+
+
+def iter_hit_rows(projection: Projection, items: Iterable[Any]) -> Iterator[list[Any]]:
+    """Project search hits (dicts) into rows, skipping malformed items."""
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        yield projection.row(extract_doc_from_item(item))
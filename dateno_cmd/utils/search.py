@@ -2,9 +2,24 @@
 
 from __future__ import annotations
 
+import inspect
+import logging
+import re
+from collections.abc import Callable
 from typing import Any
 
 
+# Keyword names an SDK search method may use for source field filtering.
+SOURCE_INCLUDE_PARAMS = (
+    "source_includes",
+    "include_fields",
+    "includes",
+    "source_fields",
+)
+
+_search_logger = logging.getLogger("dateno_cmd.search")
+
+
 def extract_hits_list(data_dict: Any) -> list[dict]:
     """
     Extract list of hits from various SDK response shapes.
@@ -42,7 +57,7 @@ def extract_hits_list(data_dict: Any) -> list[dict]:
 
 def extract_doc_from_item(item: dict) -> dict:
     """
-    Turn an item from hits/data into a flat document dict suitable for FlatDict.
+    Turn an item from hits/data into a document dict suitable for field projection.
     """
     if "_source" in item and isinstance(item["_source"], dict):
         return item["_source"]
@@ -54,3 +69,86 @@ def extract_doc_from_item(item: dict) -> dict:
         return item
 
     return item
+
+
+def hit_id(item: Any) -> str | None:
+    """
+    Id of a hit (`_id`) or of its document (`_id`/`id`), as a string.
+    """
+    if not isinstance(item, dict):
+        return None
+    for source in (item, extract_doc_from_item(item)):
+        for key in ("_id", "id"):
+            if source.get(key) not in (None, ""):
+                return str(source[key])
+    return None
+
+
+def extract_total(data_dict: Any) -> int | None:
+    """
+    Extract total hits number from various SDK response shapes.
+    Returns None if the response does not report a total.
+    """
+    if not isinstance(data_dict, dict):
+        return None
+
+    total: Any = None
+    hits = data_dict.get("hits")
+    if isinstance(hits, dict):
+        total = hits.get("total")
+        if isinstance(total, dict):
+            total = total.get("value")
+    if total is None:
+        for key in ("total", "estimated_total", "total_hits"):
+            if data_dict.get(key) is not None:
+                total = data_dict[key]
+                break
+
+    try:
+        return int(total) if total is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def source_includes(headers: list[str]) -> list[str]:
+    """
+    Turn projection header paths into `_source` include paths.
+    List indexes and wildcards are dropped: `a.b[*].c` -> `a.b.c`.
+    """
+    includes: list[str] = []
+    for header in headers:
+        path = re.sub(r"\[(\*|-?\d+)\]", "", header).strip(".")
+        if path and path not in includes:
+            includes.append(path)
+    return includes
+
+
+def with_source_includes(body: dict, includes: list[str]) -> dict:
+    """
+    Return a DSL body restricted to `includes`, unless the body already
+    sets `_source` itself.
+    """
+    if not includes or "_source" in body:
+        return body
+    _search_logger.debug("source_filter includes=%s", ",".join(includes))
+    return {**body, "_source": {"includes": includes}}
+
+
+def source_include_kwargs(fn: Callable[..., Any], includes: list[str]) -> dict[str, Any]:
+    """
+    Build keyword arguments restricting returned fields for an SDK method.
+
+    Generated SDK signatures differ between versions, so the supported
+    parameter name is looked up; returns {} if the method has none.
+    """
+    if not includes:
+        return {}
+    try:
+        params = inspect.signature(fn).parameters
+    except (TypeError, ValueError):
+        return {}
+    for name in SOURCE_INCLUDE_PARAMS:
+        if name in params:
+            _search_logger.debug("source_filter %s=%s", name, ",".join(includes))
+            return {name: includes}
+    return {}
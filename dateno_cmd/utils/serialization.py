@@ -7,30 +7,37 @@ from typing import Any
 
 import yaml
 
+from dateno_cmd.utils.profiling import phase
+
 
 def to_plain(obj: Any) -> Any:
     """
     Convert SDK/Pydantic models to plain Python types suitable for JSON/YAML.
     Prevents YAML from emitting !!python/object tags.
     """
+    with phase("to_plain"):
+        return _to_plain(obj)
+
+
+def _to_plain(obj: Any) -> Any:
     if obj is None:
         return None
 
     # Pydantic v2
     model_dump = getattr(obj, "model_dump", None)
     if callable(model_dump):
-        return to_plain(model_dump(mode="python", exclude_none=True))
+        return _to_plain(model_dump(mode="python", exclude_none=True))
 
     # Pydantic v1 fallback
     dict_method = getattr(obj, "dict", None)
     if callable(dict_method):
-        return to_plain(dict_method(exclude_none=True))
+        return _to_plain(dict_method(exclude_none=True))
 
     if isinstance(obj, dict):
-        return {str(k): to_plain(v) for k, v in obj.items()}
+        return {str(k): _to_plain(v) for k, v in obj.items()}
 
     if isinstance(obj, (list, tuple, set)):
-        return [to_plain(x) for x in obj]
+        return [_to_plain(x) for x in obj]
 
     if isinstance(obj, (str, int, float, bool)):
         return obj
@@ -42,7 +49,8 @@ def render_output(data: Any, out_format: str) -> str:
     fmt = (out_format or "yaml").strip().lower()
     payload = to_plain(data)
 
-    if fmt == "json":
-        return json.dumps(payload, indent=4, ensure_ascii=False, default=str)
+    with phase("render"):
+        if fmt == "json":
+            return json.dumps(payload, indent=4, ensure_ascii=False, default=str)
 
-    return yaml.safe_dump(payload, sort_keys=False, allow_unicode=True)
+        return yaml.safe_dump(payload, sort_keys=False, allow_unicode=True)
@@ -18,3 +18,10 @@ def test_cli_version():
     result = runner.invoke(app, ["--version"])
     assert result.exit_code == 0
     assert __version__ in result.output
+
+
+def test_cli_cache_stats(monkeypatch, tmp_path):
+    monkeypatch.setenv("DATENO_CACHE_PATH", str(tmp_path / "cache.sqlite"))
+    result = runner.invoke(app, ["cache", "stats", "--format", "json"])
+    assert result.exit_code == 0
+    assert '"entries": 0' in result.output
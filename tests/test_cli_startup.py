@@ -0,0 +1,51 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from typer.testing import CliRunner
+
+from dateno_cmd.cli import LAZY_COMMAND_GROUPS, app
+
+
+ROOT = Path(__file__).resolve().parents[1]
+HEAVY_MODULES = ("httpx", "dateno.sdk", "pydantic_settings", "yaml", "tabulate")
+IMPORT_BUDGET_MS = int(os.getenv("DATENO_IMPORT_BUDGET_MS", "500"))
+
+runner = CliRunner()
+
+
+def _python(*args: str) -> subprocess.CompletedProcess:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(p for p in (str(ROOT), env.get("PYTHONPATH")) if p)
+    return subprocess.run(
+        [sys.executable, *args], capture_output=True, text=True, cwd=str(ROOT), env=env
+    )
+
+
+def test_cli_import_does_not_load_heavy_modules():
+    code = (
+        "import sys, dateno_cmd.cli; "
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    result = _python("-c", code)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == ""
+
+
+def test_cli_import_time_budget():
+    result = _python("-X", "importtime", "-c", "import dateno_cmd.cli")
+    assert result.returncode == 0, result.stderr
+    cumulative_us = None
+    for line in result.stderr.splitlines():
+        parts = [p.strip() for p in line.split("|")]
+        if len(parts) == 3 and parts[2] == "dateno_cmd.cli":
+            cumulative_us = int(parts[1])
+    assert cumulative_us is not None
+    assert cumulative_us / 1000 < IMPORT_BUDGET_MS
+
+
+def test_cli_lazy_groups_resolve():
+    for name in LAZY_COMMAND_GROUPS:
+        result = runner.invoke(app, [name, "--help"])
+        assert result.exit_code == 0, name
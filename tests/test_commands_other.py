@@ -66,3 +66,94 @@ def test_stats_export_writes_file(tmp_path, monkeypatch):
         output=str(out),
     )
     assert out.read_bytes() == b"data"
+
+
+def test_raw_get_ids_file_writes_jsonl(tmp_path, monkeypatch):
+    class RawAPI:
+        def get_raw_entry_by_id(self, entry_id):
+            return {"id": entry_id}
+
+        async def get_raw_entry_by_id_async(self, entry_id):
+            return {"id": entry_id}
+
+    sdk = SimpleNamespace(raw_data_access=RawAPI())
+    monkeypatch.setattr(raw_cmd, "build_context", lambda *_args, **_kwargs: _ctx_with_sdk(sdk))
+
+    ids = tmp_path / "ids.txt"
+    ids.write_text("a\n\n# comment\nb\n", encoding="utf-8")
+    out = tmp_path / "out.jsonl"
+    raw_cmd.raw_get(None, ids_file=str(ids), output=str(out), ordered=True)
+    assert out.read_text(encoding="utf-8").splitlines() == ['{"id": "a"}', '{"id": "b"}']
+
+
+def test_stats_export_resumes_part_file_with_range(tmp_path, monkeypatch):
+    seen = {}
+
+    class Resp:
+        status_code = 206
+        headers = {"content-range": "bytes 3-5/6"}
+
+        def iter_bytes(self, chunk_size):
+            yield b"def"
+
+    class StatsAPI:
+        def export_timeseries_file(self, ns_id, ts_id, fileext, http_headers=None):
+            seen["headers"] = http_headers
+            return Resp()
+
+    sdk = SimpleNamespace(statistics_api=StatsAPI())
+    monkeypatch.setattr(stats_cmd, "build_context", lambda *_args, **_kwargs: _ctx_with_sdk(sdk))
+
+    out = tmp_path / "export.csv"
+    (tmp_path / "export.csv.part").write_bytes(b"abc")
+    stats_cmd.stats_export_timeseries("ns", "ts", fileext="csv", output=str(out), progress=False)
+    assert seen["headers"] == {"Range": "bytes=3-"}
+    assert out.read_bytes() == b"abcdef"
+
+
+def test_stats_export_all_downloads_listed_series(tmp_path, monkeypatch):
+    class Resp:
+        def __init__(self, body):
+            self.content = body
+
+    class StatsAPI:
+        def list_timeseries(self, ns_id, start, limit):
+            items = [{"ts_id": "s1"}, {"ts_id": "s2"}]
+            return {"items": items[start : start + limit]}
+
+        def export_timeseries_file(self, ns_id, ts_id, fileext):
+            return Resp(ts_id.encode())
+
+    sdk = SimpleNamespace(statistics_api=StatsAPI())
+    monkeypatch.setattr(stats_cmd, "build_context", lambda *_args, **_kwargs: _ctx_with_sdk(sdk))
+
+    stats_cmd.stats_export_namespace("ns", fileext="csv", dir=str(tmp_path), workers=2, page_size=1)
+    assert (tmp_path / "s1.csv").read_bytes() == b"s1"
+    assert (tmp_path / "s2.csv").read_bytes() == b"s2"
+    assert (tmp_path / "manifest.sqlite").exists()
+
+
+def test_stats_sync_and_local_lookup(tmp_path, monkeypatch, capsys):
+    class StatsAPI:
+        def list_namespaces(self, start, limit):
+            return {"items": [{"id": "ilo"}][start : start + limit], "total": 1}
+
+        def list_namespace_tables(self, ns_id, start, limit):
+            return {"items": [], "total": 0}
+
+        def list_indicators(self, ns_id, start, limit):
+            return {"items": [], "total": 0}
+
+        def list_timeseries(self, ns_id, start, limit):
+            items = [{"ts_id": "s1", "name": "One"}, {"ts_id": "s2"}]
+            return {"items": items[start : start + limit], "total": 2}
+
+    settings = SimpleNamespace(stats_mirror_path=str(tmp_path / "m.sqlite"))
+    ctx = SimpleNamespace(sdk=SimpleNamespace(statistics_api=StatsAPI()), out_format="json", settings=settings)
+    monkeypatch.setattr(stats_cmd, "build_context", lambda *_args, **_kwargs: ctx)
+    monkeypatch.setattr(stats_cmd, "build_local_context", lambda *_args, **_kwargs: ctx)
+
+    stats_cmd.stats_sync(["ilo"], page_size=1)
+    out = tmp_path / "ts.json"
+    stats_cmd.stats_get_timeseries("ilo", "s1", output=str(out), local=True)
+    assert '"name": "One"' in out.read_text(encoding="utf-8")
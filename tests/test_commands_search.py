@@ -1,5 +1,8 @@
 from types import SimpleNamespace
 
+import pytest
+import typer
+
 from dateno_cmd.commands import search as search_cmd
 
 
@@ -68,3 +71,158 @@ def test_search_similar_results_writes_csv(tmp_path, monkeypatch):
     content = out.read_text(encoding="utf-8").splitlines()
     assert content[0] == "id"
     assert content[1] == "x"
+
+
+def test_search_query_all_streams_pages(tmp_path, monkeypatch):
+    calls = []
+
+    def search_datasets(**kwargs):
+        calls.append((kwargs["offset"], kwargs["limit"]))
+        start = kwargs["offset"]
+        ids = range(start, min(start + kwargs["limit"], 5))
+        return {"hits": {"total": {"value": 5}, "hits": [{"_source": {"id": str(i)}} for i in ids]}}
+
+    sdk = SimpleNamespace(search_api=SimpleNamespace(search_datasets=search_datasets))
+    ctx = SimpleNamespace(sdk=sdk, out_format="yaml")
+    monkeypatch.setattr(search_cmd, "build_context", lambda *_args, **_kwargs: ctx)
+
+    out = tmp_path / "out.csv"
+    search_cmd.search_query(
+        query="env",
+        mode="results",
+        headers="id",
+        output=str(out),
+        limit=2,
+        all=True,
+    )
+    assert out.read_text(encoding="utf-8").splitlines() == ["id", "0", "1", "2", "3", "4"]
+    assert calls == [(0, 2), (2, 2), (4, 2)]
+
+
+def test_search_dsl_all_uses_search_after(capsys, monkeypatch):
+    bodies = []
+
+    def search_datasets_dsl(body):
+        bodies.append(body)
+        after = body.get("search_after")
+        if after == [2]:
+            return {"hits": {"hits": []}}
+        if after == [1]:
+            return {"hits": {"hits": [{"_id": "b", "_source": {"id": "b"}, "sort": [2]}]}}
+        return {"hits": {"hits": [{"_id": "a", "_source": {"id": "a"}, "sort": [1]}]}}
+
+    sdk = SimpleNamespace(search_api=SimpleNamespace(search_datasets_dsl=search_datasets_dsl))
+    ctx = SimpleNamespace(sdk=sdk, out_format="yaml")
+    monkeypatch.setattr(search_cmd, "build_context", lambda *_args, **_kwargs: ctx)
+
+    search_cmd.search_dsl(
+        body='{"query":{"match_all":{}},"size":1}',
+        mode="results",
+        headers="id",
+        all=True,
+        tiebreaker="id",
+    )
+    assert capsys.readouterr().out.splitlines() == ["id", "a", "b"]
+    assert bodies[1]["search_after"] == [1]
+
+
+def test_search_query_all_rejects_non_positive_limit(monkeypatch):
+    ctx = _make_ctx({})
+    monkeypatch.setattr(search_cmd, "build_context", lambda *_args, **_kwargs: ctx)
+
+    with pytest.raises(typer.BadParameter):
+        search_cmd.search_query(query="env", mode="results", limit=0, all=True)
+
+
+def test_search_dsl_all_rejects_bad_size(monkeypatch):
+    ctx = _make_ctx({})
+    monkeypatch.setattr(search_cmd, "build_context", lambda *_args, **_kwargs: ctx)
+
+    with pytest.raises(typer.BadParameter):
+        search_cmd.search_dsl(body='{"size":"abc"}', mode="raw", all=True, tiebreaker="id")
+
+
+def test_search_dsl_results_requests_only_header_fields(monkeypatch):
+    bodies = []
+
+    def search_datasets_dsl(body):
+        bodies.append(body)
+        return {"hits": {"hits": [{"_source": {"id": "a"}}]}}
+
+    sdk = SimpleNamespace(search_api=SimpleNamespace(search_datasets_dsl=search_datasets_dsl))
+    ctx = SimpleNamespace(sdk=sdk, out_format="yaml")
+    monkeypatch.setattr(search_cmd, "build_context", lambda *_args, **_kwargs: ctx)
+
+    search_cmd.search_dsl(body='{"query":{}}', mode="results", headers="id,source.topics[*]")
+    assert bodies[0]["_source"] == {"includes": ["id", "source.topics"]}
+
+
+def test_search_query_local_uses_mirror(tmp_path, monkeypatch):
+    from types import SimpleNamespace
+
+    from dateno_cmd.commands import mirror as mirror_cmd
+
+    hits = tmp_path / "hits.jsonl"
+    hits.write_text(
+        '{"_id": "a", "_source": {"id": "a", "dataset": {"title": "Rainfall Kenya"}}}\n'
+        '{"_id": "b", "_source": {"id": "b", "dataset": {"title": "Trade"}}}\n',
+        encoding="utf-8",
+    )
+    settings = SimpleNamespace(search_mirror_path=str(tmp_path / "m.sqlite"), output_format="yaml")
+    monkeypatch.setattr(mirror_cmd, "load_settings_with_overrides", lambda: settings)
+    mirror_cmd.mirror_build(query=None, input=str(hits))
+
+    ctx = SimpleNamespace(settings=settings, out_format="yaml", sdk=None)
+    monkeypatch.setattr(search_cmd, "build_local_context", lambda *_args, **_kwargs: ctx)
+    out = tmp_path / "out.csv"
+    search_cmd.search_query(query="rainfall", headers="id,dataset.title", output=str(out), facets=False, local=True)
+    assert out.read_text(encoding="utf-8").splitlines() == ["id,dataset.title", "a,Rainfall Kenya"]
+
+
+def test_search_query_local_rejects_passthrough(monkeypatch):
+    with pytest.raises(typer.BadParameter):
+        search_cmd.search_query(query="x", mode="raw", passthrough=True, local=True)
+
+
+def test_search_harvest_streams_deduped_partitions(tmp_path, monkeypatch):
+    from types import SimpleNamespace
+
+    docs = [{"_id": str(i), "_source": {"id": str(i), "kind": "a" if i < 3 else "b"}} for i in range(5)]
+
+    class Api:
+        def search_datasets(self, q, filters=None, limit=10, offset=0, facets=False):
+            hits = [d for d in docs if not filters or f"kind={d['_source']['kind']}" in filters]
+            return {"hits": {"total": {"value": len(hits)}, "hits": hits[offset : offset + limit]}}
+
+        def get_search_facet_values(self, key):
+            return ["a", "b"]
+
+    ctx = SimpleNamespace(sdk=SimpleNamespace(search_api=Api()), out_format="yaml", settings=None)
+    monkeypatch.setattr(search_cmd, "build_context", lambda *_args, **_kwargs: ctx)
+    out = tmp_path / "hits.csv"
+    search_cmd.search_harvest(query="x", split_by="kind", window=3, limit=2, headers="id", output=str(out))
+    assert sorted(out.read_text(encoding="utf-8").splitlines()[1:]) == ["0", "1", "2", "3", "4"]
+
+
+def test_search_get_enqueue_worker_and_results(tmp_path, monkeypatch):
+    from types import SimpleNamespace
+
+    from dateno_cmd.commands import queue as queue_cmd
+    from dateno_cmd.commands import worker as worker_cmd
+
+    ids = tmp_path / "ids.txt"
+    ids.write_text("a\nb\n", encoding="utf-8")
+    q = str(tmp_path / "q.db")
+    search_cmd.search_get(entry_id=None, ids_file=str(ids), enqueue=q)
+
+    class Api:
+        def get_dataset_by_entry_id(self, entry_id):
+            return {"id": entry_id}
+
+    ctx = SimpleNamespace(sdk=SimpleNamespace(search_api=Api()))
+    monkeypatch.setattr(worker_cmd, "build_context", lambda *_args, **_kwargs: ctx)
+    worker_cmd.worker(queue=q, threads=2)
+
+    out = tmp_path / "out.jsonl"
+    queue_cmd.queue_results(queue=q, output=str(out))
+    assert out.read_text(encoding="utf-8").splitlines() == ['{"id": "a"}', '{"id": "b"}']
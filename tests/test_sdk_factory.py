@@ -0,0 +1,20 @@
+from dateno_cmd import sdk_factory
+from dateno_cmd.services.fake_api import FakeAPI
+from dateno_cmd.settings import Settings
+
+
+def test_get_sdk_closes_clients_of_replaced_instance():
+    fake = FakeAPI()
+    settings = Settings(DATENO_APIKEY="k1", DATENO_CACHE=False)
+    with sdk_factory.use_transports(fake.transport(), fake.async_transport()):
+        first = sdk_factory.get_sdk(settings)
+        assert sdk_factory.get_sdk(settings) is first
+        client, async_client = sdk_factory._sdk_clients
+
+        second = sdk_factory.get_sdk(settings.model_copy(update={"apikey": "k2"}))
+        assert second is not first
+        assert client.is_closed and async_client.is_closed
+        assert not sdk_factory._sdk_clients[0].is_closed
+        latest = sdk_factory._sdk_clients
+    assert sdk_factory._sdk_instance is None
+    assert latest[0].is_closed and latest[1].is_closed
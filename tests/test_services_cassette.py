@@ -0,0 +1,149 @@
+import asyncio
+import json
+import time
+
+import httpx
+import pytest
+
+from dateno_cmd import sdk_factory
+from dateno_cmd.services.cassette import (
+    INTERACTIONS_FILE,
+    AsyncReplayTransport,
+    Cassette,
+    RecordingTransport,
+    ReplayTransport,
+)
+from dateno_cmd.settings import Settings
+from dateno_cmd.utils.errors import UserInputError
+
+
+URL = "https://api.example/search/0.2/query"
+
+
+def _counting_transport(delay=0.0):
+    calls = {"n": 0}
+
+    def _handler(request):
+        calls["n"] += 1
+        time.sleep(delay)
+        return httpx.Response(200, json={"n": calls["n"]}, headers={"Content-Encoding": "identity"})
+
+    return httpx.MockTransport(_handler), calls
+
+
+def test_record_then_replay_in_order_with_key_masked(tmp_path):
+    inner, calls = _counting_transport()
+    cassette = Cassette(tmp_path)
+    with httpx.Client(transport=RecordingTransport(inner, cassette)) as client:
+        for _ in range(2):
+            assert client.get(URL, params={"q": "x", "apikey": "secret"}).status_code == 200
+        client.post(URL, json={"query": {}})
+
+    index = (tmp_path / INTERACTIONS_FILE).read_text()
+    assert "secret" not in index and "apikey=%2A%2A%2A" in index
+    entries = [json.loads(line) for line in index.splitlines()]
+    assert [e["method"] for e in entries] == ["GET", "GET", "POST"]
+    assert all(e["total"] >= e["elapsed"] >= 0 for e in entries)
+
+    replay = Cassette(tmp_path)
+    with httpx.Client(transport=ReplayTransport(replay)) as client:
+        # Any key replays; repeated requests follow the recorded order.
+        answers = [
+            client.get(URL, params={"q": "x", "apikey": "other"}).json()["n"] for _ in range(3)
+        ]
+        assert client.post(URL, json={"query": {}}).json() == {"n": 3}
+        with pytest.raises(httpx.ConnectError, match="No recorded response"):
+            client.get(URL, params={"q": "unseen"})
+    assert answers == [1, 2, 2]
+    assert calls["n"] == 3
+
+
+def test_recording_streams_encoded_body_through(tmp_path):
+    import gzip
+    import os
+
+    body = gzip.compress(b'{"rows": "' + os.urandom(50_000).hex().encode() + b'"}')
+
+    class Chunks(httpx.SyncByteStream):
+        def __iter__(self):
+            for i in range(0, len(body), 8192):
+                yield body[i : i + 8192]
+
+    inner = httpx.MockTransport(
+        lambda request: httpx.Response(200, headers={"Content-Encoding": "gzip"}, stream=Chunks())
+    )
+    cassette = Cassette(tmp_path)
+    with httpx.Client(transport=RecordingTransport(inner, cassette)) as client:
+        with client.stream("GET", URL) as response:
+            chunks = response.iter_raw()
+            assert len(next(chunks)) == 8192
+            # Nothing is recorded before the body has been read.
+            assert not (tmp_path / INTERACTIONS_FILE).exists()
+            rest = b"".join(chunks)
+        assert len(rest) + 8192 == len(body)
+
+    (line,) = (tmp_path / INTERACTIONS_FILE).read_text().splitlines()
+    entry = json.loads(line)
+    assert (tmp_path / "bodies" / entry["body"]).read_bytes() == body
+    with httpx.Client(transport=ReplayTransport(Cassette(tmp_path))) as client:
+        assert len(client.get(URL).json()["rows"]) == 100_000
+
+
+def test_replay_with_recorded_latency(tmp_path):
+    inner, _ = _counting_transport(delay=0.05)
+    cassette = Cassette(tmp_path)
+    with httpx.Client(transport=RecordingTransport(inner, cassette)) as client:
+        client.get(URL)
+
+    async def _replay(latency):
+        transport = AsyncReplayTransport(Cassette(tmp_path), latency=latency)
+        async with httpx.AsyncClient(transport=transport) as client:
+            t0 = time.monotonic()
+            response = await client.get(URL)
+            return response, time.monotonic() - t0
+
+    fast_response, fast = asyncio.run(_replay(False))
+    _, slow = asyncio.run(_replay(True))
+    assert fast_response.json() == {"n": 1}
+    assert fast_response.headers["x-dateno-replay"] == "hit"
+    assert fast < 0.05 <= slow
+
+
+def test_sdk_clients_replay_without_api_key(tmp_path):
+    inner, _ = _counting_transport()
+    with sdk_factory.use_transports(inner, inner):
+        client, _ = sdk_factory._build_http_clients(
+            apikey="k",
+            timeout_ms=1000,
+            debug=False,
+            client_source=None,
+            cassette=sdk_factory.build_cassette(Settings(DATENO_RECORD_DIR=str(tmp_path))),
+        )
+        client.get(URL)
+
+    settings = Settings(DATENO_REPLAY_DIR=str(tmp_path), DATENO_CACHE=True)
+    assert sdk_factory.build_response_cache(settings) is None
+    client, _ = sdk_factory._build_http_clients(
+        apikey="replay",
+        timeout_ms=1000,
+        debug=False,
+        client_source=None,
+        cassette=sdk_factory.build_cassette(settings),
+        replay=True,
+    )
+    assert client.get(URL).json() == {"n": 1}
+
+    with pytest.raises(UserInputError, match="No recorded cassette"):
+        sdk_factory.build_cassette(Settings(DATENO_REPLAY_DIR=str(tmp_path / "none")))
+
+
+def test_cli_rejects_record_with_replay(tmp_path):
+    from typer.testing import CliRunner
+
+    from dateno_cmd.cli import app
+
+    result = CliRunner().invoke(
+        app, ["--record", str(tmp_path), "--replay", str(tmp_path), "config", "show"]
+    )
+    assert result.exit_code == 2
+    assert "either --record or --replay" in result.output
@@ -0,0 +1,64 @@
+import io
+import threading
+
+from dateno_cmd import __version__
+from dateno_cmd.services import daemon
+
+
+def _start(tmp_path):
+    path = tmp_path / "d.sock"
+    server = daemon.create_server(path)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return path, server
+
+
+def test_forward_without_daemon_returns_none(tmp_path):
+    assert daemon.forward(["--version"], socket_path=tmp_path / "missing.sock") is None
+
+
+def test_forward_streams_stdout_and_exit_code(tmp_path):
+    path, server = _start(tmp_path)
+    try:
+        out, err = io.BytesIO(), io.BytesIO()
+        code = daemon.forward(["--version"], socket_path=path, stdout=out, stderr=err)
+        assert code == 0
+        assert out.getvalue().decode().strip() == __version__
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_forward_reports_usage_errors(tmp_path):
+    path, server = _start(tmp_path)
+    try:
+        out, err = io.BytesIO(), io.BytesIO()
+        code = daemon.forward(["no-such-command"], socket_path=path, stdout=out, stderr=err)
+        assert code == 2
+        assert b"No such command" in err.getvalue()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_create_server_refuses_live_socket(tmp_path):
+    path, server = _start(tmp_path)
+    try:
+        try:
+            daemon.create_server(path)
+        except RuntimeError as e:
+            assert "already running" in str(e)
+        else:
+            raise AssertionError("expected RuntimeError")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_socket_is_owner_only(tmp_path):
+    path, server = _start(tmp_path)
+    try:
+        assert path.stat().st_mode & 0o077 == 0
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,68 @@
+import asyncio
+import time
+
+import httpx
+
+from dateno_cmd import sdk_factory
+from dateno_cmd.services.fake_api import FakeAPI, FakeAPIConfig
+from dateno_cmd.utils.search import extract_hits_list, extract_total
+
+
+BASE = "https://fake.example"
+
+
+def _client(fake: FakeAPI) -> httpx.Client:
+    return httpx.Client(base_url=BASE, transport=fake.transport())
+
+
+def test_search_pages_and_entries():
+    fake = FakeAPI(FakeAPIConfig(total_hits=25, doc_bytes=10))
+    with _client(fake) as client:
+        page = client.get("/search/0.2/query", params={"q": "x", "limit": 10, "offset": 20}).json()
+        entry = client.get("/search/0.2/entry/ds-0000007").json()
+    assert extract_total(page) == 25
+    assert [h["_id"] for h in extract_hits_list(page)] == [f"ds-{n:07d}" for n in range(20, 25)]
+    assert entry["_source"]["dataset"]["title"] == "Dataset 7"
+    assert fake.requests == {"search_query": 1, "search_entry": 1}
+
+
+def test_statsdb_listing_and_ranged_export():
+    fake = FakeAPI(FakeAPIConfig(listing_size=3, export_bytes=1000))
+    with _client(fake) as client:
+        listing = client.get("/statsdb/0.1/ns/ilo/ts", params={"start": 1, "limit": 10}).json()
+        full = client.get("/statsdb/0.1/ns/ilo/ts/TS_1/export/csv")
+        part = client.get("/statsdb/0.1/ns/ilo/ts/TS_1/export/csv", headers={"Range": "bytes=990-"})
+        missing = client.get("/nowhere")
+    assert listing["total"] == 3
+    assert [i["ts_id"] for i in listing["items"]] == ["TS_00001", "TS_00002"]
+    assert len(full.content) == 1000
+    assert part.status_code == 206 and part.content == full.content[990:]
+    assert missing.status_code == 404
+
+
+def test_error_injection_and_latency():
+    fake = FakeAPI(FakeAPIConfig(error_rate=1.0, error_status=429, latency=0.05))
+    with _client(fake) as client:
+        t0 = time.monotonic()
+        response = client.get("/catalogs")
+        elapsed = time.monotonic() - t0
+    assert response.status_code == 429 and response.headers["Retry-After"] == "0"
+    assert elapsed >= 0.05
+
+    async def _get() -> int:
+        async with httpx.AsyncClient(base_url=BASE, transport=fake.async_transport()) as client:
+            return (await client.get("/healthz")).status_code
+
+    assert asyncio.run(_get()) == 429
+
+
+def test_use_transports_routes_sdk_clients_to_fake():
+    fake = FakeAPI()
+    with sdk_factory.use_transports(fake.transport(), fake.async_transport()):
+        client, async_client = sdk_factory._build_http_clients(
+            apikey="k", timeout_ms=1000, debug=False, client_source=None
+        )
+        assert client.get(f"{BASE}/healthz").json() == {"status": "ok"}
+        asyncio.run(async_client.get(f"{BASE}/healthz"))
+    assert sdk_factory._base_transports is None
+    assert fake.requests["health"] == 2
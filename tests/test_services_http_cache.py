@@ -0,0 +1,85 @@
+import asyncio
+
+import httpx
+
+from dateno_cmd.services.http_cache import (
+    AsyncCachingTransport,
+    CachedResponse,
+    CachingTransport,
+    ResponseCache,
+    cache_key,
+)
+
+
+def _counting_transport(calls):
+    def handler(request):
+        calls.append(str(request.url))
+        return httpx.Response(200, json={"n": len(calls)})
+
+    return httpx.MockTransport(handler)
+
+
+def test_caching_transport_serves_repeated_metadata(tmp_path):
+    calls = []
+    cache = ResponseCache(tmp_path / "c.sqlite")
+    client = httpx.Client(transport=CachingTransport(_counting_transport(calls), cache))
+
+    url = "https://api.example/search/0.2/list_facets?apikey=secret"
+    assert client.get(url).json() == {"n": 1}
+    second = client.get(url)
+    assert second.json() == {"n": 1}
+    assert second.headers["x-dateno-cache"] == "hit"
+    assert len(calls) == 1
+
+    client.get("https://api.example/search/0.2/query?q=x")
+    client.get("https://api.example/search/0.2/query?q=x")
+    assert len(calls) == 3
+
+
+def test_caching_transport_refresh_bypasses_lookup(tmp_path):
+    calls = []
+    cache = ResponseCache(tmp_path / "c.sqlite")
+    url = "https://api.example/search/0.2/list_facets"
+    httpx.Client(transport=CachingTransport(_counting_transport(calls), cache)).get(url)
+    fresh = httpx.Client(transport=CachingTransport(_counting_transport(calls), cache, refresh=True))
+    assert fresh.get(url).json() == {"n": 2}
+
+
+def test_cache_key_separates_api_keys():
+    a = httpx.Request("GET", "https://api.example/x?apikey=one")
+    b = httpx.Request("GET", "https://api.example/x?apikey=two")
+    assert cache_key(a) != cache_key(b)
+    assert cache_key(a) == cache_key(httpx.Request("GET", "https://api.example/x?apikey=one"))
+    bearer = [
+        httpx.Request("GET", "https://api.example/x", headers={"Authorization": f"Bearer {k}"})
+        for k in ("one", "two")
+    ]
+    assert cache_key(bearer[0]) != cache_key(bearer[1])
+
+
+def test_response_cache_lru_eviction(tmp_path):
+    cache = ResponseCache(tmp_path / "c.sqlite", max_bytes=10)
+    for key in ("a", "b", "c"):
+        cache.put(key, key, CachedResponse(200, [], b"12345"), ttl=60)
+    assert cache.get("a") is None
+    assert cache.get("c") is not None
+    assert cache.stats()["size_bytes"] == 10
+    assert cache.clear() == 2
+
+
+def test_async_caching_transport(tmp_path):
+    calls = []
+    cache = ResponseCache(tmp_path / "c.sqlite")
+
+    async def handler(request):
+        calls.append(1)
+        return httpx.Response(200, json={"ok": True})
+
+    async def run():
+        transport = AsyncCachingTransport(httpx.MockTransport(handler), cache)
+        async with httpx.AsyncClient(transport=transport) as client:
+            await client.get("https://api.example/statsdb/ns")
+            await client.get("https://api.example/statsdb/ns")
+
+    asyncio.run(run())
+    assert len(calls) == 1
@@ -0,0 +1,125 @@
+import httpx
+import pytest
+
+from dateno_cmd import sdk_factory
+from dateno_cmd.services.http_events import ResponseEvent, listening
+from dateno_cmd.services.latency_history import (
+    LatencyHistory,
+    LatencyRecord,
+    LatencyRecorder,
+    endpoint_template,
+    parse_duration,
+    percentile,
+    summarize,
+)
+
+
+def test_endpoint_template_replaces_ids_and_drops_query():
+    assert endpoint_template("https://api.example/search/0.2/query?q=x&apikey=***") == (
+        "/search/0.2/query"
+    )
+    assert endpoint_template("https://api.example/statsdb/0.1/ns/ilostat/ts/CCF_X.ABW") == (
+        "/statsdb/0.1/ns/{id}/ts/{id}"
+    )
+    assert endpoint_template("https://api.example/raw/0.1/entry/9f3a-77") == (
+        "/raw/0.1/entry/{id}"
+    )
+
+
+def test_parse_duration_and_percentile():
+    assert parse_duration("90") == 90
+    assert parse_duration("6h") == 6 * 3600
+    assert parse_duration("7d") == 7 * 86400
+    with pytest.raises(ValueError):
+        parse_duration("soon")
+    values = list(range(1, 101))
+    assert percentile(values, 50) == 50
+    assert percentile(values, 99) == 99
+    assert percentile([], 95) is None
+
+
+def test_summarize_groups_by_endpoint_and_window():
+    records = [
+        LatencyRecord(3600 * 10 + i, "GET", "/search/0.2/query", 200, 10 * (i + 1), 100, 0)
+        for i in range(10)
+    ]
+    records.append(LatencyRecord(3600 * 11, "GET", "/search/0.2/query", 503, 900, None, 2))
+    records.append(LatencyRecord(3600 * 10, "GET", "/statsdb/ns", 200, 5, 50, 0))
+
+    rows = summarize(records)
+    query = next(r for r in rows if r["endpoint"] == "GET /search/0.2/query")
+    assert query["requests"] == 11 and query["errors"] == 1
+    assert query["p50_ms"] == 60 and query["p99_ms"] == 900
+    assert query["retries"] == 2 and query["mean_bytes"] == 100
+
+    hourly = summarize(records, window=3600)
+    query_rows = [r for r in hourly if r["endpoint"] == "GET /search/0.2/query"]
+    assert [r["requests"] for r in query_rows] == [10, 1]
+    assert query_rows[1]["error_rate"] == 1.0
+
+
+def test_recorder_stores_client_responses_with_retries(tmp_path):
+    history = LatencyHistory(tmp_path / "latency.sqlite")
+    recorder = LatencyRecorder(history)
+    statuses = iter([503, 200])
+    transport = httpx.MockTransport(
+        lambda request: httpx.Response(next(statuses), content=b"{}")
+    )
+    hooks = sdk_factory._event_hooks(debug=False)
+    with listening(recorder), httpx.Client(transport=transport, event_hooks=hooks) as client:
+        request = client.build_request("GET", "https://api.example/statsdb/0.1/ns/ilostat")
+        client.send(request)
+        client.send(request)
+    recorder.flush()
+
+    records = history.records()
+    assert [(r.endpoint, r.status, r.retries) for r in records] == [
+        ("/statsdb/0.1/ns/{id}", 503, 0),
+        ("/statsdb/0.1/ns/{id}", 200, 1),
+    ]
+    assert all(r.elapsed_ms is not None and r.bytes == 2 for r in records)
+    assert history.records(endpoint="/search/") == []
+    assert history.prune(older_than=3600) == 0
+    history.close()
+
+
+def test_recorder_skips_cache_hits_and_replays(tmp_path):
+    history = LatencyHistory(tmp_path / "latency.sqlite")
+    recorder = LatencyRecorder(history)
+    headers = iter([{"x-dateno-cache": "hit"}, {"x-dateno-replay": "hit"}, {}])
+    transport = httpx.MockTransport(
+        lambda request: httpx.Response(200, headers=next(headers), content=b"{}")
+    )
+    hooks = sdk_factory._event_hooks(debug=False)
+    with listening(recorder), httpx.Client(transport=transport, event_hooks=hooks) as client:
+        for _ in range(3):
+            client.get("https://api.example/statsdb/0.1/ns/ilostat")
+    recorder.flush()
+
+    assert len(history.records()) == 1
+    history.close()
+
+
+def test_perf_report_renders_recorded_history(tmp_path, monkeypatch):
+    from typer.testing import CliRunner
+
+    from dateno_cmd.cli import app
+
+    path = tmp_path / "latency.sqlite"
+    monkeypatch.setenv("DATENO_LATENCY_HISTORY_PATH", str(path))
+    history = LatencyHistory(path)
+    recorder = LatencyRecorder(history)
+    recorder(ResponseEvent("GET", "https://api.example/search/0.2/query?q=x", 200, 0.25, 10))
+    recorder.flush()
+    history.close()
+
+    result = CliRunner().invoke(app, ["perf", "report", "--since", "1h", "--format", "json"])
+    assert result.exit_code == 0, result.output
+    assert '"p95_ms": 250' in result.output
+
+    result = CliRunner().invoke(app, ["perf", "report", "--window", "1h"])
+    assert result.exit_code == 0, result.output
+    assert "GET /search/0.2/query" in result.output
+
+    result = CliRunner().invoke(app, ["perf", "report", "--since", "later"])
+    assert result.exit_code == 2
@@ -0,0 +1,34 @@
+import httpx
+import pytest
+
+from dateno_cmd.services.passthrough import PassthroughTransport, capture_body
+
+
+def _client(status=200, body=b'{"hits": {"hits": []}}'):
+    handler = lambda request: httpx.Response(status, content=body)
+    return httpx.Client(transport=PassthroughTransport(httpx.MockTransport(handler)))
+
+
+def test_capture_body_returns_raw_bytes():
+    client = _client()
+
+    def call():
+        client.get("https://api.example/search")
+        raise AssertionError("SDK parsing must not run")
+
+    assert capture_body(call) == b'{"hits": {"hits": []}}'
+
+
+def test_capture_inactive_passes_response_through():
+    assert _client().get("https://api.example/search").json() == {"hits": {"hits": []}}
+
+
+def test_capture_leaves_error_responses_to_sdk():
+    client = _client(status=404, body=b"missing")
+
+    def call():
+        response = client.get("https://api.example/search")
+        raise RuntimeError(response.status_code)
+
+    with pytest.raises(RuntimeError):
+        capture_body(call)
@@ -0,0 +1,92 @@
+import asyncio
+import threading
+import time
+
+import httpx
+
+from dateno_cmd.services.rate_limit import (
+    AsyncRateLimitTransport,
+    RateLimiter,
+    RateLimitTransport,
+    parse_retry_after,
+)
+
+
+def test_token_bucket_paces_requests():
+    limiter = RateLimiter(rps=50)
+    client = httpx.Client(transport=RateLimitTransport(httpx.MockTransport(lambda r: httpx.Response(200)), limiter))
+    start = time.monotonic()
+    for _ in range(6):
+        client.get("https://api.example/x")
+    assert time.monotonic() - start >= 5 / 50 * 0.9
+
+
+def test_429_retry_after_pauses_and_halves_rate():
+    limiter = RateLimiter(rps=100)
+    limiter.observe(429, httpx.Headers({"Retry-After": "0.2"}))
+    assert limiter.rate == 50
+    start = time.monotonic()
+    limiter.acquire()
+    limiter.release()
+    assert time.monotonic() - start >= 0.15
+
+
+def test_429_without_configured_rate_starts_limiting():
+    limiter = RateLimiter()
+    assert limiter.rate is None
+    limiter.observe(429, httpx.Headers())
+    assert limiter.rate is not None and limiter.rate >= 0.5
+    # Successes grow the rate back; there is no ceiling to stop at.
+    before = limiter.rate
+    time.sleep(0.02)
+    limiter.observe(200, httpx.Headers())
+    assert limiter.rate > before
+
+
+def test_ratelimit_headers_spread_remaining_quota():
+    limiter = RateLimiter(rps=100)
+    limiter.observe(200, httpx.Headers({"X-RateLimit-Remaining": "10", "X-RateLimit-Reset": "5"}))
+    assert limiter.rate == 2
+    limiter.observe(200, httpx.Headers({"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "0.1"}))
+    start = time.monotonic()
+    limiter.acquire()
+    assert time.monotonic() - start >= 0.05
+
+
+def test_max_concurrency_holds_slot_until_body_is_read():
+    limiter = RateLimiter(max_concurrency=1)
+    client = httpx.Client(
+        transport=RateLimitTransport(httpx.MockTransport(lambda r: httpx.Response(200, content=b"x")), limiter)
+    )
+    with client.stream("GET", "https://api.example/x"):
+        blocked = threading.Event()
+
+        def _second():
+            client.get("https://api.example/y")
+            blocked.set()
+
+        t = threading.Thread(target=_second)
+        t.start()
+        assert not blocked.wait(0.1)
+    assert blocked.wait(2)
+    t.join()
+
+
+def test_async_transport_shares_limiter():
+    limiter = RateLimiter(rps=1000)
+
+    async def _main():
+        async with httpx.AsyncClient(
+            transport=AsyncRateLimitTransport(httpx.MockTransport(lambda r: httpx.Response(429)), limiter)
+        ) as client:
+            await client.get("https://api.example/x")
+
+    asyncio.run(_main())
+    assert limiter.rate == 500
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("3") == 3
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(None) is None
@@ -0,0 +1,58 @@
+import pytest
+
+from dateno_cmd.services.search_mirror import SearchMirror, fts_query, parse_filter, path_values
+from dateno_cmd.utils.errors import UserInputError
+
+
+def _hit(entry_id, title, country, catalog_type="Open data portal"):
+    return {
+        "_id": entry_id,
+        "_source": {
+            "id": entry_id,
+            "dataset": {"title": title},
+            "source": {"uid": f"cdi{entry_id}", "catalog_type": catalog_type, "countries": [{"name": country}]},
+        },
+    }
+
+
+@pytest.fixture
+def mirror(tmp_path):
+    m = SearchMirror(tmp_path / "search.sqlite")
+    m.add([_hit("1", "Water quality", "Kenya"), _hit("2", "Air quality", "France"), _hit("3", "Budget", "Kenya")])
+    yield m
+    m.close()
+
+
+def test_search_ranks_text_and_pages(mirror):
+    data = mirror.search("quality", limit=1)
+    assert data["hits"]["total"]["value"] == 2
+    assert len(data["hits"]["hits"]) == 1
+    assert mirror.search("quality", limit=1, offset=1)["hits"]["hits"][0]["_id"] != data["hits"]["hits"][0]["_id"]
+
+
+def test_search_facet_filters_and_aggregations(mirror):
+    data = mirror.search("", filters=["source.countries.name=Kenya"], facets=True)
+    assert {h["_id"] for h in data["hits"]["hits"]} == {"1", "3"}
+    assert data["aggregations"]["country"]["buckets"] == [{"key": "Kenya", "doc_count": 2}]
+
+
+def test_search_document_filters(mirror):
+    data = mirror.search("", filters=['dataset.title="Budget"'], facets=True)
+    assert [h["_id"] for h in data["hits"]["hits"]] == ["3"]
+    assert data["aggregations"]["source.uid"]["buckets"] == [{"key": "cdi3", "doc_count": 1}]
+
+
+def test_add_replaces_existing_documents(mirror):
+    mirror.add([_hit("1", "Forest cover", "Kenya")])
+    assert mirror.count() == 3
+    assert mirror.search("water")["hits"]["total"]["value"] == 0
+    assert mirror.search("forest")["hits"]["hits"][0]["_id"] == "1"
+
+
+def test_helpers():
+    assert fts_query('co2 "emissions"') == '"co2" "emissions"'
+    assert fts_query("  ") is None
+    assert parse_filter("source.catalog_type = 'Open data portal'") == ("source.catalog_type", "Open data portal")
+    with pytest.raises(UserInputError):
+        parse_filter("nonsense")
+    assert path_values({"a": [{"b": 1}, {"b": [2, 3]}]}, "a.b") == [1, 2, 3]
@@ -0,0 +1,49 @@
+from dateno_cmd.services.stats_mirror import (
+    KIND_NAMESPACE,
+    KIND_TIMESERIES,
+    StatsMirror,
+    sync_mirror,
+)
+
+
+def _lister(data, calls):
+    def list_all(kind, ns_id):
+        calls.append((kind, ns_id))
+        return data.get((kind, ns_id), [])
+
+    return list_all
+
+
+def test_sync_mirror_crawls_then_skips_unchanged(tmp_path):
+    mirror = StatsMirror(tmp_path / "m.sqlite")
+    data = {
+        ("ns", ""): [{"id": "ilo", "updated": 1}, {"id": "wb", "updated": 1}],
+        ("ts", "ilo"): [{"ts_id": "a"}, {"ts_id": "b"}],
+    }
+    calls = []
+    stats = sync_mirror(mirror, _lister(data, calls), workers=2)
+    assert sorted(stats.crawled) == ["ilo", "wb"]
+    assert mirror.get(KIND_TIMESERIES, "b", ns_id="ilo") == {"ts_id": "b"}
+    assert mirror.list(KIND_NAMESPACE)["total"] == 2
+
+    data[("ns", "")][1] = {"id": "wb", "updated": 2}
+    data[("ts", "ilo")] = [{"ts_id": "a", "v": 2}]
+    calls.clear()
+    stats = sync_mirror(mirror, _lister(data, calls))
+    assert stats.crawled == ["wb"] and stats.unchanged == ["ilo"]
+    assert ("ts", "ilo") not in calls
+
+    stats = sync_mirror(mirror, _lister(data, calls), namespaces=["ilo"], full=True)
+    assert stats.crawled == ["ilo"]
+    assert mirror.get(KIND_TIMESERIES, "b", ns_id="ilo") is None
+    assert mirror.list(KIND_TIMESERIES, ns_id="ilo")["items"] == [{"ts_id": "a", "v": 2}]
+    mirror.close()
+
+
+def test_replace_records_only_writes_changes(tmp_path):
+    mirror = StatsMirror(tmp_path / "m.sqlite")
+    assert mirror.replace_records("table", "ns", [{"id": "t1"}, {"id": "t2"}]) == (2, 0)
+    assert mirror.replace_records("table", "ns", [{"id": "t2"}, {"id": "t1", "x": 1}]) == (1, 0)
+    assert [r["id"] for r in mirror.list("table", "ns")["items"]] == ["t2", "t1"]
+    assert mirror.list("table", "ns", start=1, limit=1)["items"] == [{"id": "t1", "x": 1}]
+    mirror.close()
@@ -0,0 +1,101 @@
+import threading
+import time
+
+from dateno_cmd.services.work_queue import (
+    STATUS_DONE,
+    STATUS_FAILED,
+    STATUS_LEASED,
+    STATUS_PENDING,
+    WorkQueue,
+)
+from dateno_cmd.services.worker import run_worker
+
+
+def test_claim_is_exclusive_between_connections(tmp_path):
+    path = tmp_path / "q.db"
+    a, b = WorkQueue(path), WorkQueue(path)
+    a.put("k", [{"n": i} for i in range(3)])
+    first = a.claim("w1", limit=2)
+    second = b.claim("w2", limit=2)
+    assert [u.payload["n"] for u in first] == [0, 1]
+    assert [u.payload["n"] for u in second] == [2]
+    assert b.claim("w2") == []
+    assert a.counts()[STATUS_LEASED] == 3
+    a.close()
+    b.close()
+
+
+def test_expired_lease_is_taken_over_and_old_owner_cannot_complete(tmp_path):
+    q = WorkQueue(tmp_path / "q.db")
+    q.put("k", [{"n": 1}])
+    (unit,) = q.claim("dead", lease_seconds=0.01)
+    time.sleep(0.02)
+    assert q.counts()[STATUS_PENDING] == 1
+    (again,) = q.claim("alive")
+    assert again.id == unit.id and again.attempts == 2
+    assert q.complete("dead", unit.id, "late") is False
+    assert q.complete("alive", unit.id, {"ok": True}) is True
+    assert list(q.results()) == [("k", {"ok": True})]
+    q.close()
+
+
+def test_expired_lease_without_attempts_left_fails(tmp_path):
+    q = WorkQueue(tmp_path / "q.db")
+    q.put("k", [{"n": 1}], max_attempts=2)
+    for owner in ("crash1", "crash2"):
+        (unit,) = q.claim(owner, lease_seconds=0.01)
+        time.sleep(0.02)
+    assert unit.attempts == 2
+    assert q.counts()[STATUS_FAILED] == 1
+    assert q.claim("w") == []
+    assert q.counts()[STATUS_FAILED] == 1
+    assert not q.has_open_units()
+    q.close()
+
+
+def test_heartbeat_keeps_lease(tmp_path):
+    q = WorkQueue(tmp_path / "q.db")
+    q.put("k", [{}])
+    (unit,) = q.claim("w", lease_seconds=0.05)
+    time.sleep(0.03)
+    assert q.heartbeat("w", [unit.id], lease_seconds=10) == 1
+    time.sleep(0.03)
+    assert q.claim("other") == []
+    q.close()
+
+
+def test_failures_are_retried_until_attempts_run_out(tmp_path):
+    q = WorkQueue(tmp_path / "q.db")
+    q.put("k", [{}], max_attempts=2)
+    (unit,) = q.claim("w")
+    q.fail("w", unit.id, "api: boom")
+    assert q.counts()[STATUS_PENDING] == 1
+    (unit,) = q.claim("w")
+    q.fail("w", unit.id, "api: boom")
+    assert q.counts()[STATUS_FAILED] == 1
+    assert q.failures()[0][3] == "api: boom"
+    assert q.retry_failed() == 1
+    assert q.claim("w")[0].attempts == 1
+    q.close()
+
+
+def test_run_worker_drains_queue_with_threads(tmp_path):
+    q = WorkQueue(tmp_path / "q.db")
+    q.put("square", [{"n": i} for i in range(20)])
+    q.put("bad", [{}], max_attempts=1)
+    seen = set()
+    lock = threading.Lock()
+
+    def _handle(unit):
+        if unit.kind == "bad":
+            raise ValueError("no")
+        with lock:
+            seen.add(threading.get_ident())
+        return unit.payload["n"] ** 2
+
+    stats = run_worker(q, _handle, "w", threads=4, lease_seconds=5, poll_seconds=0.01)
+    assert (stats.completed, stats.failed) == (20, 1)
+    assert stats.exit_code != 0
+    assert sorted(r for _, r in q.results("square")) == sorted(i * i for i in range(20))
+    assert q.counts()[STATUS_DONE] == 20
+    q.close()
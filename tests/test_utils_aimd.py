@@ -0,0 +1,94 @@
+import asyncio
+import time
+
+import httpx
+
+from dateno_cmd import sdk_factory
+from dateno_cmd.services.http_events import ResponseEvent, listening
+from dateno_cmd.utils.aimd import AIMDController
+
+
+def _event(status=200, elapsed=0.01):
+    return ResponseEvent("GET", "https://api.example/x", status, elapsed, None)
+
+
+def test_limit_grows_by_one_per_healthy_round():
+    c = AIMDController(maximum=10, initial=2)
+    for _ in range(2):
+        c.observe_response(_event())
+    assert c.limit == 3
+    for _ in range(3):
+        c.observe_response(_event())
+    assert c.limit == 4
+
+
+def test_errors_cut_limit_once_per_hold_window():
+    c = AIMDController(maximum=32, initial=16)
+    c.observe_response(_event(429))
+    c.observe_response(_event(503))
+    assert c.limit == 8 and c.cuts == 1
+    c._hold_until = 0
+    c.observe_error(httpx.ReadTimeout("slow"))
+    assert c.limit == 4
+    c._hold_until = 0
+    c.observe_error(ValueError("not congestion"))
+    assert c.limit == 4
+
+
+def test_latency_rise_cuts_limit():
+    c = AIMDController(maximum=64, initial=20)
+    for _ in range(20):
+        c.observe_response(_event(elapsed=0.01))
+    limit = c.limit
+    for _ in range(50):
+        c.observe_response(_event(elapsed=0.5))
+    assert c.limit < limit
+    assert c.cuts >= 1
+
+
+def test_gate_bounds_async_tasks():
+    c = AIMDController(maximum=8, initial=2)
+    peak = 0
+    running = 0
+
+    async def _task():
+        nonlocal peak, running
+        async with c:
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+    async def _main():
+        await asyncio.gather(*(_task() for _ in range(10)))
+
+    asyncio.run(_main())
+    assert peak == 2
+
+
+def test_sdk_hooks_publish_elapsed_before_body_is_read():
+    request = httpx.Request("GET", "https://api.example/x?apikey=secret")
+    sdk_factory._stamp_request(request)
+    time.sleep(0.01)
+    response = httpx.Response(200, headers={"content-length": "3"}, request=request, stream=httpx.ByteStream(b"abc"))
+    events = []
+    with listening(events.append):
+        sdk_factory._publish_response(response)
+    sdk_factory._log_response(response)
+    (event,) = events
+    assert event.elapsed >= 0.01 and event.bytes == 3
+    assert "secret" not in event.url
+
+
+def test_async_client_hooks_are_awaitable():
+    hooks = sdk_factory._async_hooks(sdk_factory._event_hooks(debug=True))
+    seen = []
+
+    async def _main():
+        transport = httpx.MockTransport(lambda r: httpx.Response(200))
+        async with httpx.AsyncClient(transport=transport, event_hooks=hooks) as client:
+            with listening(seen.append):
+                await client.get("https://api.example/x")
+
+    asyncio.run(_main())
+    assert [e.status_code for e in seen] == [200]
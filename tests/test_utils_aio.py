@@ -0,0 +1,97 @@
+import asyncio
+
+import pytest
+
+from dateno_cmd.utils.aio import gather_outcomes, run_async, worst_exit_code
+from dateno_cmd.utils.errors import EXIT_OK, EXIT_USER, UserInputError
+
+
+def test_gather_outcomes_limits_concurrency_and_keeps_order():
+    state = {"active": 0, "peak": 0}
+
+    def make(value, delay):
+        async def call():
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+            await asyncio.sleep(delay)
+            state["active"] -= 1
+            return value
+
+        return call
+
+    calls = [("a", make(1, 0.02)), ("b", make(2, 0)), ("c", make(3, 0.01))]
+    completed = []
+    outcomes = run_async(
+        gather_outcomes(
+            calls, concurrency=2, on_result=lambda o: completed.append(o.key), keep_values=True
+        )
+    )
+
+    assert [o.value for o in outcomes] == [1, 2, 3]
+    assert state["peak"] == 2
+    assert completed[0] == "b"
+
+
+def test_gather_outcomes_aggregates_errors():
+    async def ok():
+        return "x"
+
+    async def bad():
+        raise UserInputError("nope")
+
+    outcomes = run_async(gather_outcomes([("ok", ok), ("bad", bad)]))
+    assert outcomes[0].ok and not outcomes[1].ok
+    assert isinstance(outcomes[1].error, UserInputError)
+    assert worst_exit_code(outcomes) == EXIT_USER
+    assert worst_exit_code(outcomes[:1]) == EXIT_OK
+
+
+def test_gather_outcomes_cancels_pending_on_cancel():
+    cancelled = []
+
+    async def slow():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    async def main():
+        task = asyncio.ensure_future(gather_outcomes([(i, slow) for i in range(3)]))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    run_async(main())
+    assert len(cancelled) == 3
+
+
+def test_gather_outcomes_streams_without_retaining_values():
+    state = {"created": 0, "active": 0, "peak": 0}
+
+    def calls():
+        for i in range(50):
+            state["created"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+
+            async def call(i=i):
+                state["active"] += 1
+                await asyncio.sleep(0)
+                state["active"] -= 1
+                return {"payload": "x" * 1000, "n": i}
+
+            yield i, call
+
+    seen = []
+
+    def on_result(outcome):
+        # Tasks are created as slots free up, not all up front.
+        assert state["created"] - len(seen) <= 4
+        seen.append(outcome.value["n"])
+
+    outcomes = run_async(gather_outcomes(calls(), concurrency=4, on_result=on_result))
+    assert sorted(seen) == list(range(50))
+    assert [o.index for o in outcomes] == list(range(50))
+    assert all(o.value is None and o.ok for o in outcomes)
+    assert state["peak"] <= 4
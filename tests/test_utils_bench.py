@@ -0,0 +1,89 @@
+import asyncio
+
+import httpx
+import pytest
+
+from dateno_cmd.utils.bench import (
+    Sample,
+    WorkItem,
+    histogram,
+    parse_workload,
+    run_workload,
+    summarize,
+)
+from dateno_cmd.utils.errors import UserInputError
+
+
+def test_parse_workload_ops_and_plain_queries():
+    items = parse_workload(
+        [
+            "# comment",
+            "climate change",
+            '{"op": "get", "id": "abc"}',
+            '{"op": "ts", "ns": "ilo", "ts": "X"}',
+            "",
+        ]
+    )
+    assert items == [
+        WorkItem("search", {"q": "climate change"}),
+        WorkItem("get", {"id": "abc"}),
+        WorkItem("ts", {"ns": "ilo", "ts": "X"}),
+    ]
+    with pytest.raises(UserInputError, match="Line 1: ts needs ts"):
+        parse_workload(['{"op": "ts", "ns": "ilo"}'])
+    with pytest.raises(UserInputError, match="unknown op"):
+        parse_workload(['{"op": "delete"}'])
+    with pytest.raises(UserInputError, match="empty"):
+        parse_workload(["# nothing"])
+
+
+def _recording_call(delay=0.0, fail_ids=()):
+    state = {"in_flight": 0, "peak": 0, "calls": []}
+
+    async def _call(item):
+        state["calls"].append(item.args.get("id"))
+        state["in_flight"] += 1
+        state["peak"] = max(state["peak"], state["in_flight"])
+        try:
+            await asyncio.sleep(delay)
+            if item.args.get("id") in fail_ids:
+                raise httpx.ConnectError("refused")
+        finally:
+            state["in_flight"] -= 1
+
+    return _call, state
+
+
+def test_closed_loop_repeats_workload_at_concurrency():
+    items = [WorkItem("get", {"id": str(n)}) for n in range(3)]
+    call, state = _recording_call(delay=0.01)
+    result = asyncio.run(run_workload(items, call, concurrency=4, requests=10))
+    assert len(result.samples) == 10
+    assert state["calls"][:4] == ["0", "1", "2", "0"]
+    assert state["peak"] == 4
+
+
+def test_open_loop_paces_requests_and_measures_from_schedule():
+    items = [WorkItem("get", {"id": "x"})]
+    call, state = _recording_call(delay=0.0)
+    result = asyncio.run(run_workload(items, call, concurrency=2, rps=100, requests=10))
+    assert len(result.samples) == 10
+    # 10 requests at 100/s take at least 90 ms to start.
+    assert result.wall_seconds >= 0.09
+
+
+def test_summary_counts_errors_by_kind_per_op():
+    items = [WorkItem("get", {"id": "ok"}), WorkItem("raw", {"id": "bad"})]
+    call, _ = _recording_call(fail_ids=("bad",))
+    summary = summarize(asyncio.run(run_workload(items, call, concurrency=1, requests=4)))
+    assert summary["requests"] == 4 and summary["ok"] == 2 and summary["errors"] == 2
+    assert summary["errors_by_kind"] == {"Network error (ConnectError)": 2}
+    assert summary["operations"]["raw"]["errors"] == 2
+    assert summary["latency_ms"]["p50"] >= 0
+    assert sum(b["count"] for b in summary["histogram"]) == 2
+
+
+def test_histogram_buckets():
+    buckets = histogram([Sample("get", 0.005), Sample("get", 0.2), Sample("get", 30.0)])
+    counts = {b["le_ms"]: b["count"] for b in buckets}
+    assert counts[10] == 1 and counts[250] == 1 and counts[None] == 1
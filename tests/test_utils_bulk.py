@@ -0,0 +1,53 @@
+import asyncio
+import json
+
+from dateno_cmd.utils.bulk import resolve_async, run_bulk_fetch
+from dateno_cmd.utils.errors import EXIT_USER, UserInputError
+
+
+def test_run_bulk_fetch_ordered_with_failures(tmp_path):
+    async def fetch(entry_id):
+        if entry_id == "bad":
+            raise UserInputError("nope")
+        await asyncio.sleep(0.01 if entry_id == "a" else 0)
+        return {"id": entry_id}
+
+    out = tmp_path / "out.jsonl"
+    failed = tmp_path / "failed.txt"
+    result = run_bulk_fetch(
+        ["a", "bad", "c"], fetch, str(out), concurrency=2, ordered=True, failed_output=str(failed)
+    )
+    lines = [json.loads(x) for x in out.read_text(encoding="utf-8").splitlines()]
+    assert lines == [{"id": "a"}, {"id": "c"}]
+    assert result.ok == 2 and result.failed == 1
+    assert result.exit_code == EXIT_USER
+    assert failed.read_text(encoding="utf-8").startswith("bad\t")
+
+
+def test_resolve_async_prefers_async_twin():
+    class Api:
+        def get(self, entry_id):
+            return "sync"
+
+        async def get_async(self, entry_id):
+            return "async"
+
+    assert asyncio.run(resolve_async(Api().get)(entry_id="x")) == "async"
+
+
+def test_resolve_async_runs_sync_in_thread():
+    assert asyncio.run(resolve_async(lambda entry_id: entry_id)(entry_id="x")) == "x"
+
+
+def test_run_bulk_fetch_adaptive_backs_off_on_timeouts(tmp_path, capsys):
+    import httpx
+
+    async def fetch(entry_id):
+        if entry_id == "slow":
+            raise httpx.ReadTimeout("timed out")
+        return {"id": entry_id}
+
+    ids = ["slow"] + [str(i) for i in range(20)]
+    result = run_bulk_fetch(ids, fetch, str(tmp_path / "out.jsonl"), concurrency=16, adaptive=True)
+    assert result.ok == 20 and result.failed == 1
+    assert "Adaptive concurrency: settled at" in capsys.readouterr().err
@@ -51,3 +51,55 @@ def test_run_and_render_with_mode_dict():
     ctx = SimpleNamespace(out_format="yaml")
     result = cmd.run_and_render_with_mode(ctx, lambda: {"a": 1}, "results", None)
     assert result == {"a": 1}
+
+
+def test_run_and_render_with_mode_passthrough(monkeypatch):
+    ctx = SimpleNamespace(out_format="json")
+    calls = {}
+
+    monkeypatch.setattr(cmd, "capture_body", lambda call: b'{"raw": true}')
+    monkeypatch.setattr(cmd, "write_bytes_or_print", lambda content, output: calls.update({"bytes": content}))
+
+    result = cmd.run_and_render_with_mode(ctx, lambda: {"a": 1}, "raw", None, passthrough=True)
+    assert result is None
+    assert calls["bytes"] == b'{"raw": true}'
+
+
+def test_run_and_render_with_mode_passthrough_requires_json():
+    ctx = SimpleNamespace(out_format="yaml")
+    with pytest.raises(typer.BadParameter):
+        cmd.run_and_render_with_mode(ctx, lambda: {"a": 1}, "raw", None, passthrough=True)
+
+
+def test_run_many_and_render_reports_failures_and_keeps_results(monkeypatch):
+    ctx = SimpleNamespace(out_format="json")
+    rendered = {}
+    errors = []
+
+    monkeypatch.setattr(cmd, "render_output", lambda data, fmt: data)
+    monkeypatch.setattr(cmd, "write_or_print", lambda data, output: rendered.update(data))
+    monkeypatch.setattr(cmd, "print_sdk_error", lambda e, debug=False: errors.append(e) or 4)
+
+    async def ok():
+        return {"v": 1}
+
+    async def bad():
+        raise RuntimeError("boom")
+
+    with pytest.raises(typer.Exit) as exc:
+        cmd.run_many_and_render(ctx, {"a": ok, "b": bad}, None)
+    assert exc.value.exit_code == 1
+    assert rendered == {"a": {"v": 1}}
+    assert len(errors) == 1
+
+
+def test_call_sdk_async_raises_exit(monkeypatch):
+    ctx = SimpleNamespace(out_format="json")
+    monkeypatch.setattr(cmd, "print_sdk_error", lambda e, debug=False: 3)
+
+    async def bad():
+        raise RuntimeError("boom")
+
+    with pytest.raises(typer.Exit) as exc:
+        cmd.run_async(cmd.call_sdk_async(ctx, bad))
+    assert exc.value.exit_code == 3
@@ -0,0 +1,157 @@
+import gzip
+import hashlib
+import io
+
+import pytest
+
+from dateno_cmd.utils import download
+from dateno_cmd.utils.download import (
+    Progress,
+    download_to_file,
+    parse_checksum,
+    part_path,
+    range_headers_kwargs,
+)
+from dateno_cmd.utils.errors import UserInputError
+
+
+class FakeResponse:
+    def __init__(self, body, status_code=200, headers=None):
+        self.body = body
+        self.status_code = status_code
+        self.headers = headers or {"content-length": str(len(body))}
+        self.closed = False
+
+    def iter_bytes(self, chunk_size):
+        for i in range(0, len(self.body), 3):
+            yield self.body[i : i + 3]
+
+    def close(self):
+        self.closed = True
+
+
+def test_download_streams_to_output_and_removes_part(tmp_path):
+    out = tmp_path / "ts.csv"
+    resp = FakeResponse(b"a,b\n1,2\n")
+    result = download_to_file(resp, out, progress=False)
+    assert out.read_bytes() == b"a,b\n1,2\n"
+    assert not part_path(out).exists()
+    assert resp.closed
+    assert result.bytes_written == 8 and result.resumed_from == 0
+
+
+def test_download_resumes_on_matching_206(tmp_path):
+    out = tmp_path / "ts.csv"
+    part_path(out).write_bytes(b"hello ")
+    body = b"world"
+    resp = FakeResponse(body, 206, {"content-range": "bytes 6-10/11"})
+    digest = hashlib.sha256(b"hello world").hexdigest()
+    result = download_to_file(resp, out, requested_offset=6, checksum=("sha256", digest), progress=False)
+    assert out.read_bytes() == b"hello world"
+    assert result.resumed_from == 6 and result.digest == digest
+
+
+def test_download_restarts_when_server_ignores_range(tmp_path):
+    out = tmp_path / "ts.csv"
+    part_path(out).write_bytes(b"stale")
+    download_to_file(FakeResponse(b"fresh body"), out, requested_offset=5, progress=False)
+    assert out.read_bytes() == b"fresh body"
+
+
+def test_download_checksum_mismatch_discards_part(tmp_path):
+    out = tmp_path / "ts.csv"
+    with pytest.raises(UserInputError):
+        download_to_file(FakeResponse(b"data"), out, checksum=("sha256", "00"), progress=False)
+    assert not out.exists() and not part_path(out).exists()
+
+
+def test_download_keeps_part_on_stream_error(tmp_path):
+    class Broken(FakeResponse):
+        def iter_bytes(self, chunk_size):
+            yield b"abc"
+            raise ConnectionError("reset")
+
+    out = tmp_path / "ts.csv"
+    with pytest.raises(ConnectionError):
+        download_to_file(Broken(b""), out, progress=False)
+    assert part_path(out).read_bytes() == b"abc"
+    assert not out.exists()
+
+
+def test_download_compresses_by_suffix(tmp_path):
+    out = tmp_path / "ts.csv.gz"
+    download_to_file(FakeResponse(b"x" * 100), out, progress=False)
+    assert gzip.decompress(out.read_bytes()) == b"x" * 100
+
+
+def test_parse_checksum():
+    assert parse_checksum("SHA256:AB") == ("sha256", "ab")
+    assert parse_checksum(None) is None
+    with pytest.raises(UserInputError):
+        parse_checksum("nocolon")
+    with pytest.raises(UserInputError):
+        parse_checksum("nope:12")
+
+
+def test_range_headers_kwargs_requires_http_headers_param():
+    def with_headers(ns_id, http_headers=None):
+        pass
+
+    def without(ns_id):
+        pass
+
+    assert range_headers_kwargs(with_headers, 10) == {"http_headers": {"Range": "bytes=10-"}}
+    assert range_headers_kwargs(with_headers, 0) == {}
+    assert range_headers_kwargs(without, 10) == {}
+
+
+def test_progress_line_reports_percentage():
+    stream = io.StringIO()
+    meter = Progress(total=2048, start=1024, stream=stream)
+    meter.update(1024)
+    meter.finish()
+    assert "2.0 KB / 2.0 KB (100%)" in stream.getvalue()
+
+
+def _ranged_method(body, calls, honour=True):
+    def export(ns_id, http_headers=None):
+        rng = (http_headers or {}).get("Range")
+        calls.append(rng)
+        if rng is None or not honour:
+            return FakeResponse(body, 200, {"accept-ranges": "bytes", "content-length": str(len(body))})
+        start, end = (int(x) for x in rng.split("=")[1].split("-"))
+        return FakeResponse(body[start : end + 1], 206, {"content-range": f"bytes {start}-{end}/{len(body)}"})
+
+    return export
+
+
+def test_fetch_to_file_downloads_segments_in_parallel(tmp_path, monkeypatch):
+    monkeypatch.setattr(download, "MIN_SEGMENT_BYTES", 10)
+    body = bytes(range(256)) * 2
+    calls = []
+    out = tmp_path / "big.bin"
+    digest = hashlib.sha256(body).hexdigest()
+    result = download.fetch_to_file(
+        _ranged_method(body, calls), {"ns_id": "x"}, out,
+        checksum=("sha256", digest), progress=False, segments=4,
+    )
+    assert out.read_bytes() == body
+    assert result.digest == digest
+    assert calls[0] is None and len(calls) == 4
+    assert "bytes=128-255" in calls
+
+
+def test_fetch_to_file_falls_back_when_ranges_ignored(tmp_path, monkeypatch):
+    monkeypatch.setattr(download, "MIN_SEGMENT_BYTES", 10)
+    body = b"y" * 100
+    calls = []
+    out = tmp_path / "big.bin"
+    download.fetch_to_file(_ranged_method(body, calls, honour=False), {"ns_id": "x"}, out, progress=False, segments=4)
+    assert out.read_bytes() == body
+    assert not part_path(out).exists()
+
+
+def test_segment_ranges_cover_body(monkeypatch):
+    monkeypatch.setattr(download, "MIN_SEGMENT_BYTES", 10)
+    assert download.segment_ranges(25, 4) == [(0, 12), (13, 24)]
+    assert download.segment_ranges(100, 4) == [(0, 24), (25, 49), (50, 74), (75, 99)]
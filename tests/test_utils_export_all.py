@@ -0,0 +1,64 @@
+from dateno_cmd.services.manifest import (
+    STATUS_COMPLETED,
+    STATUS_FAILED,
+    STATUS_SKIPPED,
+    ExportManifest,
+)
+from dateno_cmd.utils.errors import EXIT_USER, UserInputError
+from dateno_cmd.utils.export_all import export_all, iter_series_ids, series_filename
+
+
+def _writer(calls, fail=()):
+    def export_one(ts_id, target):
+        calls.append(ts_id)
+        if ts_id in fail:
+            raise UserInputError("bad series")
+        target.write_bytes(ts_id.encode())
+
+    return export_one
+
+
+def test_export_all_records_manifest_and_resumes(tmp_path):
+    manifest = ExportManifest(tmp_path / "m.sqlite")
+    calls = []
+    result = export_all(["a", "b", "c"], _writer(calls, fail={"b"}), tmp_path / "out", "csv", manifest, workers=2)
+
+    assert sorted(calls) == ["a", "b", "c"]
+    assert (result.completed, result.failed, result.skipped) == (2, 1, 0)
+    assert result.exit_code == EXIT_USER
+    assert manifest.counts() == {STATUS_COMPLETED: 2, STATUS_FAILED: 1}
+    assert "b" in manifest.failures()
+
+    calls.clear()
+    result = export_all(["a", "b", "c"], _writer(calls), tmp_path / "out", "csv", manifest, workers=2)
+    assert calls == ["b"]
+    assert (result.completed, result.failed, result.skipped) == (1, 0, 2)
+    manifest.close()
+
+
+def test_export_all_skips_existing_files(tmp_path):
+    out = tmp_path / "out"
+    out.mkdir()
+    (out / "a.csv").write_bytes(b"old")
+    manifest = ExportManifest(tmp_path / "m.sqlite")
+    calls = []
+    result = export_all(["a"], _writer(calls), out, "csv", manifest)
+    assert calls == [] and result.skipped == 1
+    assert manifest.counts() == {STATUS_SKIPPED: 1}
+    manifest.close()
+
+
+def test_iter_series_ids_pages_and_dedupes():
+    pages = {0: [{"ts_id": "a"}, {"id": "b"}], 2: [{"ts_id": "b"}, {"code": "c"}], 4: []}
+
+    def list_page(start, limit):
+        return {"items": pages[start]}
+
+    assert list(iter_series_ids(list_page, page_size=2)) == ["a", "b", "c"]
+
+
+def test_series_filename_is_safe_and_unique():
+    assert series_filename("CCF_XOXR.ABW", "csv") == "CCF_XOXR.ABW.csv"
+    a = series_filename("x/y", "csv")
+    b = series_filename("x_y", "csv")
+    assert "/" not in a and a != b
@@ -0,0 +1,110 @@
+import pytest
+
+from dateno_cmd.utils.harvest import (
+    Partition,
+    bucket_counts,
+    facet_values,
+    harvest_pages,
+    plan_partitions,
+)
+
+
+DOCS = [
+    {"id": str(i), "type": "portal" if i < 7 else "api", "country": ["KE", "FR"][i % 2]}
+    for i in range(10)
+]
+FIELDS = {"type": "type", "country": "country"}
+
+
+def _matching(filters):
+    docs = DOCS
+    for expr in filters:
+        key, value = expr.split("=")
+        docs = [d for d in docs if d[FIELDS[key]] == value]
+    return docs
+
+
+def _probe_with_aggs(filters):
+    docs = _matching(filters)
+    aggs = {}
+    for key, field in FIELDS.items():
+        counts = {}
+        for d in docs:
+            counts[d[field]] = counts.get(d[field], 0) + 1
+        aggs[key] = {"buckets": [{"key": k, "doc_count": n} for k, n in counts.items()]}
+    return {"hits": {"total": {"value": len(docs)}, "hits": []}, "aggregations": aggs}
+
+
+def test_plan_splits_until_partitions_fit_window():
+    plan = plan_partitions(_probe_with_aggs, lambda key: [], split_keys=["type", "country"], window=3)
+    assert plan.total == 10
+    assert {p.filters: p.total for p in plan.partitions} == {
+        ("type=portal", "country=KE"): 4,
+        ("type=portal", "country=FR"): 3,
+        ("type=api",): 3,
+    }
+    assert [p.filters for p in plan.truncated] == [("type=portal", "country=KE")]
+
+
+def test_plan_without_aggregations_probes_facet_values():
+    calls = []
+
+    def _probe(filters):
+        calls.append(filters)
+        return {"hits": {"total": {"value": len(_matching(filters))}}}
+
+    values = {"type": ["portal", "api", "unused"]}
+    plan = plan_partitions(_probe, values.__getitem__, base_filters=[], split_keys=["type"], window=7)
+    assert {p.filters: p.total for p in plan.partitions} == {("type=portal",): 7, ("type=api",): 3}
+    assert plan.probes == len(calls) == 4
+
+
+def test_plan_adds_remainder_when_buckets_miss_hits():
+    def _probe(filters):
+        data = _probe_with_aggs(filters)
+        if not filters:
+            # 2 hits without a type, as if outside the top buckets.
+            data["hits"]["total"]["value"] = 12
+        return data
+
+    plan = plan_partitions(_probe, lambda key: [], split_keys=["type"], window=7)
+    assert plan.total == 12
+    assert {p.filters: p.total for p in plan.partitions} == {
+        ("type=portal",): 7,
+        ("type=api",): 3,
+        (): 2,
+    }
+    assert plan.truncated == [Partition((), 2, truncated=True, remainder=True)]
+
+
+def test_plan_whole_query_fits_window():
+    plan = plan_partitions(_probe_with_aggs, lambda key: [], base_filters=["type=api"], window=100)
+    assert plan.partitions == [Partition(("type=api",), 3)]
+    assert plan.probes == 1
+
+
+def test_harvest_pages_dedupes_across_partitions():
+    pages = {
+        ("a",): [[{"_id": "1"}, {"_id": "2"}], [{"_id": "3"}]],
+        ("b",): [[{"_id": "2"}, {"_id": "4"}]],
+    }
+    parts = [Partition(("a",), 3), Partition(("b",), 2)]
+    got = [h["_id"] for page in harvest_pages(lambda p: iter(pages[p.filters]), parts, workers=2) for h in page]
+    assert sorted(got) == ["1", "2", "3", "4"]
+
+
+def test_harvest_pages_reraises_partition_failure():
+    def _fetch(part):
+        if part.filters == ("bad",):
+            raise RuntimeError("boom")
+        return iter([[{"_id": "1"}]])
+
+    with pytest.raises(RuntimeError, match="boom"):
+        list(harvest_pages(_fetch, [Partition(("ok",), 1), Partition(("bad",), 1)], workers=2))
+
+
+def test_facet_value_shapes():
+    assert facet_values(["a", "b", "a"]) == ["a", "b"]
+    assert facet_values({"values": [{"value": "x", "count": 3}, {"name": "y"}]}) == ["x", "y"]
+    assert bucket_counts({"aggregations": {"catalog_type": {"buckets": [{"key": "a", "doc_count": 2}]}}}, "source.catalog_type") == {"a": 2}
+    assert bucket_counts({"hits": {}}, "source.catalog_type") is None
@@ -1,9 +1,18 @@
+import bz2
+import gzip
 import json
 
 import pytest
 import typer
 
-from dateno_cmd.utils.io import load_json_arg, write_csv, write_or_print
+from dateno_cmd.utils.io import (
+    data_suffix,
+    load_json_arg,
+    stream_csv,
+    stream_jsonl,
+    write_csv,
+    write_or_print,
+)
 
 
 def test_write_or_print_stdout(capsys):
@@ -26,6 +35,19 @@ def test_write_csv(tmp_path):
     assert content[1] == "1,2"
 
 
+def test_stream_csv_from_generator(tmp_path):
+    out = tmp_path / "out.csv"
+    count = stream_csv(["a"], ([i] for i in range(3)), str(out))
+    assert count == 3
+    assert out.read_text(encoding="utf-8").splitlines() == ["a", "0", "1", "2"]
+
+
+def test_stream_jsonl_stdout(capsys):
+    stream_jsonl(iter([{"a": 1}, {"a": 2}]), None)
+    lines = capsys.readouterr().out.splitlines()
+    assert [json.loads(x) for x in lines] == [{"a": 1}, {"a": 2}]
+
+
 def test_load_json_arg_inline():
     value = load_json_arg('{"a": 1}')
     assert value == {"a": 1}
@@ -41,3 +63,55 @@ def test_load_json_arg_file(tmp_path):
 def test_load_json_arg_invalid():
     with pytest.raises(typer.BadParameter):
         load_json_arg("{bad json")
+
+
+def test_stream_csv_stdout_uses_lf(capsys):
+    stream_csv(["id"], [["1"]], None)
+    assert capsys.readouterr().out == "id\n1\n"
+
+
+def test_write_csv_gzip(tmp_path):
+    out = tmp_path / "out.csv.gz"
+    write_csv(["a"], [[1]], str(out))
+    assert gzip.decompress(out.read_bytes()).decode("utf-8") == "a\r\n1\r\n"
+
+
+def test_stream_jsonl_bz2(tmp_path):
+    out = tmp_path / "out.jsonl.bz2"
+    stream_jsonl([{"a": 1}], str(out))
+    assert bz2.decompress(out.read_bytes()) == b'{"a": 1}\n'
+
+
+def test_atomic_output_applies_umask_without_changing_it(tmp_path, monkeypatch):
+    import os
+
+    from dateno_cmd.utils import io as io_utils
+
+    calls = []
+    monkeypatch.setattr(io_utils, "_UMASK", 0o027)
+    monkeypatch.setattr(os, "umask", lambda mask: calls.append(mask) or 0o022)
+    out = tmp_path / "out.csv"
+    write_csv(["a"], [[1]], str(out))
+    assert out.stat().st_mode & 0o777 == 0o640
+    assert calls == []
+
+
+def test_data_suffix_ignores_compression():
+    assert data_suffix("/tmp/hits.jsonl.gz") == ".jsonl"
+    assert data_suffix("hits.JSONL.zst") == ".jsonl"
+    assert data_suffix("hits.csv") == ".csv"
+    assert data_suffix("hits.gz") == ""
+
+
+def test_stream_csv_failure_keeps_previous_file(tmp_path):
+    out = tmp_path / "out.csv"
+    out.write_text("old", encoding="utf-8")
+
+    def rows():
+        yield [1]
+        raise RuntimeError("crash")
+
+    with pytest.raises(RuntimeError):
+        stream_csv(["a"], rows(), str(out))
+    assert out.read_text(encoding="utf-8") == "old"
+    assert [p.name for p in tmp_path.iterdir()] == ["out.csv"]
@@ -0,0 +1,104 @@
+import pytest
+
+from dateno_cmd.utils.paging import (
+    PagingError,
+    iter_offset_pages,
+    iter_search_after_pages,
+    prepare_search_after_body,
+)
+
+
+def _fake_fetch(total, calls):
+    def fetch(offset, limit):
+        calls.append((offset, limit))
+        ids = range(offset, min(offset + limit, total))
+        return {"hits": {"total": {"value": total}, "hits": [{"_source": {"id": i}} for i in ids]}}
+
+    return fetch
+
+
+def test_iter_offset_pages_fetches_until_total():
+    calls = []
+    pages = list(iter_offset_pages(_fake_fetch(25, calls), page_size=10))
+    assert [len(p) for p in pages] == [10, 10, 5]
+    assert calls == [(0, 10), (10, 10), (20, 10)]
+
+
+def test_iter_offset_pages_respects_max_results():
+    calls = []
+    pages = list(iter_offset_pages(_fake_fetch(100, calls), offset=5, page_size=10, max_results=15))
+    hits = [h["_source"]["id"] for p in pages for h in p]
+    assert hits == list(range(5, 20))
+    assert calls == [(5, 10), (15, 5)]
+
+
+def test_iter_offset_pages_without_prefetch_stops_on_short_page():
+    def fetch(offset, limit):
+        return {"hits": [{"id": 1}]} if offset == 0 else {"hits": []}
+
+    pages = list(iter_offset_pages(fetch, page_size=10, prefetch=False))
+    assert pages == [[{"id": 1}]]
+
+
+def test_prepare_search_after_body_adds_tiebreaker():
+    body = {"query": {"match_all": {}}, "from": 20, "size": 5, "index": "x"}
+    prepared = prepare_search_after_body(body, 50, tiebreaker="id")
+    assert "from" not in prepared
+    assert prepared["size"] == 50
+    assert prepared["sort"] == [{"_score": "desc"}, {"id": "asc"}]
+    assert prepared["index"] == "x"
+    assert body["from"] == 20
+
+
+def test_prepare_search_after_body_requires_pit_or_tiebreaker():
+    with pytest.raises(ValueError):
+        prepare_search_after_body({"query": {}}, 10)
+    prepared = prepare_search_after_body({"query": {}, "pit": {"id": "p"}}, 10)
+    assert prepared["sort"] == [{"_score": "desc"}]
+
+
+def test_iter_search_after_pages_uses_cursor():
+    docs = [{"_id": str(i), "sort": [i]} for i in range(7)]
+    bodies = []
+
+    def fetch(body):
+        bodies.append(body)
+        after = body.get("search_after", [-1])[0]
+        page = [d for d in docs if d["sort"][0] > after][: body["size"]]
+        return {"hits": {"hits": page}, "pit_id": "p2"}
+
+    pages = list(
+        iter_search_after_pages(fetch, {"query": {}, "pit": {"id": "p1"}}, page_size=3)
+    )
+    assert [len(p) for p in pages] == [3, 3, 1]
+    assert bodies[1]["search_after"] == [2]
+    assert bodies[1]["pit"] == {"id": "p2", "keep_alive": "1m"}
+    assert "from" not in bodies[0]
+
+
+def test_iter_search_after_pages_fails_without_cursor():
+    def fetch(body):
+        return {"hits": {"hits": [{"_id": "a"}, {"_id": "b"}]}}
+
+    pages = iter_search_after_pages(fetch, {"query": {}}, page_size=2, tiebreaker="id")
+    assert len(next(pages)) == 2
+    with pytest.raises(PagingError):
+        next(pages)
+
+
+def test_fetch_offset_pages_concurrently_uses_total():
+    from concurrent.futures import ThreadPoolExecutor
+
+    from dateno_cmd.utils.paging import fetch_offset_pages_concurrently
+
+    items = [{"id": i} for i in range(7)]
+    calls = []
+
+    def fetch(offset, limit):
+        calls.append(offset)
+        return {"items": items[offset : offset + limit], "total": len(items)}
+
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        hits = fetch_offset_pages_concurrently(fetch, 3, pool)
+    assert hits == items
+    assert sorted(calls) == [0, 3, 6]
@@ -0,0 +1,72 @@
+import json
+
+from typer.testing import CliRunner
+
+from dateno_cmd.cli import app
+from dateno_cmd.utils import profiling
+
+
+def test_phases_and_counters_are_noops_without_profile():
+    profiling.stop()
+    with profiling.phase("render"):
+        pass
+    profiling.count("rows", 3)
+    assert profiling.active() is None
+
+
+def test_report_sums_phases_and_derives_validation_time():
+    prof = profiling.start(started=0.0)
+    try:
+        with profiling.phase("render"):
+            pass
+        with profiling.phase("render"):
+            pass
+        prof.add_time("sdk_call", 0.5)
+        prof.add_time("http", 0.2)
+        profiling.count("rows", 3)
+        profiling.count("rows")
+    finally:
+        assert profiling.stop() is prof
+
+    report = prof.report(command=["search", "query"])
+    assert report["phases"]["render"]["calls"] == 2
+    assert report["counters"] == {"rows": 4}
+    assert report["derived"]["sdk_validation_seconds"] == 0.3
+    assert report["command"] == ["search", "query"]
+    text = profiling.format_report(report)
+    assert "render" in text and "sdk_validation" in text and "rows" in text
+
+
+def test_http_phase_includes_body_download():
+    import time
+
+    import httpx
+
+    from dateno_cmd import sdk_factory
+
+    class SlowBody(httpx.SyncByteStream):
+        def __iter__(self):
+            yield b"{"
+            time.sleep(0.05)
+            yield b"}"
+
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, stream=SlowBody()))
+    prof = profiling.start(started=0.0)
+    try:
+        hooks = sdk_factory._event_hooks(debug=False)
+        with httpx.Client(transport=transport, event_hooks=hooks) as client:
+            assert client.get("https://api.example/x").content == b"{}"
+    finally:
+        profiling.stop()
+    assert prof.phases["http"][0] >= 0.05
+    assert prof.phases["http"][1] == 1
+
+
+def test_cli_profile_output_writes_json(tmp_path, monkeypatch):
+    monkeypatch.setenv("DATENO_APIKEY", "k")
+    out = tmp_path / "profile.json"
+    result = CliRunner().invoke(app, ["--profile-output", str(out), "config", "show"])
+    assert result.exit_code == 0, result.output
+    report = json.loads(out.read_text())
+    assert {"startup", "settings", "render", "write"} <= set(report["phases"])
+    assert profiling.active() is None
@@ -0,0 +1,35 @@
+import pytest
+
+from dateno_cmd.utils.projection import Projection, iter_hit_rows, parse_headers
+
+
+DOC = {
+    "id": "1",
+    "dataset": {"title": "T", "resources": [{"url": "a"}, {"url": "b"}, {"name": "c"}]},
+    "source": {"topics": ["x", "y"], "uid": None},
+}
+
+
+def test_projection_dotted_and_missing():
+    p = Projection(["id", "dataset.title", "source.uid", "nope.deep"])
+    assert p.row(DOC) == ["1", "T", "", ""]
+
+
+def test_projection_index_and_wildcard():
+    p = Projection(["source.topics[0]", "source.topics[-1]", "source.topics[*]", "dataset.resources[*].url"])
+    assert p.row(DOC) == ["x", "y", "x; y", "a; b"]
+
+
+def test_projection_plain_list_value_kept():
+    assert Projection(["source.topics"]).row(DOC) == [["x", "y"]]
+
+
+def test_projection_invalid_path():
+    with pytest.raises(ValueError):
+        Projection(["a..b"])
+
+
+def test_iter_hit_rows_skips_non_dicts():
+    p = Projection(parse_headers("id, dataset.title"))
+    rows = list(iter_hit_rows(p, [{"_source": DOC}, "junk"]))
+    assert rows == [["1", "T"]]
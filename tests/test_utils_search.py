@@ -1,4 +1,11 @@
-from dateno_cmd.utils.search import extract_doc_from_item, extract_hits_list
+from dateno_cmd.utils.search import (
+    extract_doc_from_item,
+    extract_hits_list,
+    extract_total,
+    source_include_kwargs,
+    source_includes,
+    with_source_includes,
+)
 
 
 def test_extract_hits_list_hits_dict():
@@ -32,3 +39,31 @@ def test_extract_doc_from_item_document():
 def test_extract_doc_from_item_dataset():
     item = {"dataset": {"title": "t"}}
     assert extract_doc_from_item(item) == item
+
+
+def test_extract_total_variants():
+    assert extract_total({"hits": {"total": {"value": 7}}}) == 7
+    assert extract_total({"hits": {"total": 3}}) == 3
+    assert extract_total({"estimated_total": "12"}) == 12
+    assert extract_total({"hits": []}) is None
+
+
+def test_source_includes_strips_list_syntax():
+    assert source_includes(["id", "source.topics[*]", "a.b[0].c", "id"]) == ["id", "source.topics", "a.b.c"]
+
+
+def test_with_source_includes_keeps_user_source():
+    body = {"query": {}, "_source": False}
+    assert with_source_includes(body, ["id"]) is body
+    assert with_source_includes({"query": {}}, ["id"])["_source"] == {"includes": ["id"]}
+
+
+def test_source_include_kwargs_uses_supported_param():
+    def search(q, source_includes=None):
+        return q
+
+    def legacy(q, **kwargs):
+        return q
+
+    assert source_include_kwargs(search, ["id"]) == {"source_includes": ["id"]}
+    assert source_include_kwargs(legacy, ["id"]) == {}